@@ -0,0 +1,85 @@
+"""
+Pluggable caches for the auth, employee and aggregate code paths
+
+CACHE_BACKEND picks where entries live:
+
+- memory: a per-worker LRU (default); workers only see their own invalidations
+- shared_memory: mmap'd files shared by every worker on the host
+- redis: a Redis-protocol server shared by every worker on every host
+
+Each cache is one namespace with its own TTL and size bound, created once at
+import time with `create_cache`.
+"""
+import hashlib
+import os
+import tempfile
+from typing import Literal, Optional
+from app.cache.base import CacheBackend, CacheStats
+from app.cache.memory import MemoryCache
+from app.cache.redis import RedisCache
+from app.config import settings
+
+CacheBackendName = Literal["memory", "shared_memory", "redis"]
+
+_caches: dict[str, CacheBackend] = {}
+
+
+def _shared_memory_dir() -> str:
+    """CACHE_SHARED_MEMORY_DIR, or a directory per database under /dev/shm (or the temp dir)"""
+    if settings.CACHE_SHARED_MEMORY_DIR:
+        return settings.CACHE_SHARED_MEMORY_DIR
+    database = hashlib.blake2b(settings.DATABASE_URL.encode(), digest_size=4).hexdigest()
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"{settings.CACHE_KEY_PREFIX}-{database}")
+
+
+def create_cache(
+    namespace: str,
+    maxsize: int,
+    ttl: float,
+    max_item_bytes: int = 512,
+    backend: Optional[CacheBackendName] = None
+) -> CacheBackend:
+    """
+    Create (and register for /metrics) the cache for one namespace
+
+    Args:
+        namespace: Unique name, used in shared-memory file names and Redis keys
+        maxsize: Max entries (slots for shared memory); 0 disables the cache
+        ttl: Default seconds an entry stays valid
+        max_item_bytes: Largest key plus serialized value the shared backends store
+        backend: Override CACHE_BACKEND
+
+    Returns:
+        The cache backend
+    """
+    backend = backend or settings.CACHE_BACKEND
+    if maxsize <= 0 or backend == "memory":
+        cache = MemoryCache(namespace, maxsize, ttl)
+    elif backend == "shared_memory":
+        # Imported here: it needs fcntl, which Windows lacks
+        from app.cache.shared_memory import SharedMemoryCache
+        # The layout is part of the file name, so workers with different settings never share a file
+        path = os.path.join(_shared_memory_dir(), f"{namespace}-{maxsize}x{max_item_bytes}.cache")
+        cache = SharedMemoryCache(namespace, path, slots=maxsize, slot_bytes=max_item_bytes, ttl=ttl)
+    elif backend == "redis":
+        cache = RedisCache(
+            namespace, settings.CACHE_REDIS_URL, ttl, max_item_bytes,
+            prefix=settings.CACHE_KEY_PREFIX, timeout=settings.CACHE_REDIS_TIMEOUT
+        )
+    else:
+        raise ValueError(f"Unknown cache backend {backend!r}")
+    _caches[namespace] = cache
+    return cache
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """Stats of every cache created so far, by namespace"""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
+
+
+def clear_caches() -> None:
+    """Empty every cache (e.g. after the database was replaced)"""
+    for cache in _caches.values():
+        cache.clear()
+
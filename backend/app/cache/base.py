@@ -0,0 +1,69 @@
+"""
+Cache backend interface shared by the in-process, shared-memory and Redis caches
+"""
+import pickle
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Counters of one cache namespace"""
+
+    backend: str
+    hits: int
+    misses: int
+    entries: Optional[int] = None  # None when the backend cannot count them cheaply
+    max_bytes: Optional[int] = None  # Memory bound, None when bounded by entry count or by the server
+
+
+class CacheBackend(ABC):
+    """
+    Key/value cache for one namespace (e.g. "users" or "employee_counts").
+
+    Keys are strings and values anything picklable. None cannot be cached:
+    `get` returns None for a miss. Entries expire after their TTL and the
+    backend evicts entries to stay within its memory bound. Cache trouble
+    (a full slot, an unreachable server) never raises: it is a miss, and a
+    lost invalidation is bounded by the TTL.
+    """
+
+    backend = "base"
+
+    def __init__(self, namespace: str, ttl: float):
+        self.namespace = namespace
+        self.ttl = ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or None if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (defaults to the cache TTL)"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key if present"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry of this namespace"""
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Hit/miss counters and size"""
+
+
+def serialize(value: Any) -> bytes:
+    """Encode a value for a cache that lives outside this process"""
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize(data: bytes) -> Any:
+    """Decode a serialized value, or None if it no longer loads (e.g. after a deploy)"""
+    try:
+        return pickle.loads(data)
+    except Exception:
+        return None
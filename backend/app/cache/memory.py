@@ -0,0 +1,37 @@
+"""
+In-process cache backend (one LRU per worker)
+"""
+from typing import Any, Optional
+from app.cache.base import CacheBackend, CacheStats
+from app.utils.cache import TTLCache
+
+
+class MemoryCache(CacheBackend):
+    """
+    Per-worker LRU bounded by entry count.
+
+    Values are kept as-is (not copied or serialized), so this is the fastest
+    backend, but each worker has its own copy and only sees its own
+    invalidations; other workers catch up when the TTL expires.
+    """
+
+    backend = "memory"
+
+    def __init__(self, namespace: str, maxsize: int, ttl: float):
+        super().__init__(namespace, ttl)
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.backend, self._cache.hits, self._cache.misses, entries=len(self._cache))
@@ -0,0 +1,205 @@
+"""
+Redis cache backend: any server speaking the Redis protocol (Redis, Valkey, KeyDB...)
+
+Speaks RESP over plain sockets, so no client library is needed. Entries live
+at `<prefix>:<namespace>:<generation>:<key>` with a PX expiry. `clear`
+increments the namespace's generation counter (`<prefix>:<namespace>:generation`)
+instead of deleting keys, so it is O(1) and tracks nothing per key; entries of
+older generations are never read again and expire on their own. The memory
+bound is the server's (maxmemory with an allkeys-lru policy); values larger
+than `max_item_bytes` are not stored. Values are pickled, so the server must
+be as trusted as the database.
+"""
+import logging
+import socket
+import threading
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import unquote, urlsplit
+from app.cache.base import CacheBackend, CacheStats, deserialize, serialize
+
+logger = logging.getLogger(__name__)
+
+# After a connection failure, treat the server as down for this long instead of paying a timeout per request
+_RETRY_AFTER_SECONDS = 5.0
+
+
+class RedisError(Exception):
+    """Error reply from the server"""
+
+
+class _Connection:
+    """One RESP connection; commands are pipelined and replies read in order"""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    @staticmethod
+    def _encode(command: tuple) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read_reply(self) -> Any:
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by the cache server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise RedisError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            return self.reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"unexpected reply from the cache server: {line[:20]!r}")
+
+    def execute(self, *commands: tuple) -> list:
+        """Send commands in one write and return their replies"""
+        self.sock.sendall(b"".join(self._encode(command) for command in commands))
+        replies, error = [], None
+        for _ in commands:
+            try:
+                replies.append(self._read_reply())
+            except RedisError as exc:
+                error = error or exc
+                replies.append(None)
+        if error is not None:
+            raise error
+        return replies
+
+    def close(self) -> None:
+        self.reader.close()
+        self.sock.close()
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by every worker on every host through a Redis-protocol server.
+
+    Connections are pooled per process (one per concurrent caller). Calls are
+    synchronous, which costs well under a millisecond on a local network; the
+    async request path makes them directly. When the server is unreachable
+    the cache behaves as empty and retries after a few seconds.
+
+    Each command is pipelined with a read of the generation counter, using
+    the generation this process saw last; if the counter moved (another
+    worker cleared the namespace), the command is repeated under the new
+    generation. So the common case stays one round trip.
+    """
+
+    backend = "redis"
+
+    def __init__(self, namespace: str, url: str, ttl: float, max_item_bytes: int,
+                 prefix: str = "hrms", timeout: float = 0.25):
+        super().__init__(namespace, ttl)
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported cache URL scheme {parts.scheme!r} (expected redis://)")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.username = unquote(parts.username) if parts.username else None
+        self.password = unquote(parts.password) if parts.password else None
+        self.timeout = timeout
+        self.max_item_bytes = max_item_bytes
+        self.key_prefix = f"{prefix}:{namespace}:"
+        self._generation_key = f"{prefix}:{namespace}:generation"
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._idle: list[_Connection] = []
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    def _connect(self) -> _Connection:
+        conn = _Connection(self.host, self.port, self.timeout)
+        setup = []
+        if self.password is not None:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                conn.execute(*setup)
+            except Exception:
+                conn.close()
+                raise
+        return conn
+
+    def _execute(self, *commands: tuple) -> Optional[list]:
+        """Replies to commands, or None if the server is unavailable"""
+        if time.monotonic() < self._down_until:
+            return None
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        try:
+            if conn is None:
+                conn = self._connect()
+            replies = conn.execute(*commands)
+        except (OSError, RedisError) as exc:
+            if conn is not None:
+                conn.close()
+            self._down_until = time.monotonic() + _RETRY_AFTER_SECONDS
+            logger.warning("Cache server %s:%s unavailable for %r: %s", self.host, self.port, self.namespace, exc)
+            return None
+        with self._lock:
+            self._idle.append(conn)
+        return replies
+
+    def _execute_current(self, command: Callable[[str], tuple]) -> Optional[Any]:
+        """
+        Reply to command(key prefix of the current generation), or None if the server is unavailable
+        """
+        for _ in range(2):
+            generation = self._generation
+            replies = self._execute(("GET", self._generation_key), command(f"{self.key_prefix}{generation}:"))
+            if replies is None:
+                return None
+            self._generation = int(replies[0] or 0)
+            if self._generation == generation:
+                break
+        return replies[1]
+
+    def get(self, key: str) -> Any:
+        data = self._execute_current(lambda prefix: ("GET", prefix + key))
+        value = deserialize(data) if data is not None else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        data = serialize(value)
+        if len(key) + len(data) > self.max_item_bytes:
+            self.delete(key)
+            return
+        expires_ms = max(1, int(ttl * 1000))
+        self._execute_current(lambda prefix: ("SET", prefix + key, data, "PX", expires_ms))
+
+    def delete(self, key: str) -> None:
+        self._execute_current(lambda prefix: ("DEL", prefix + key))
+
+    def clear(self) -> None:
+        replies = self._execute(("INCR", self._generation_key))
+        if replies:
+            self._generation = replies[0]
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.backend, self.hits, self.misses)
@@ -0,0 +1,193 @@
+"""
+Shared-memory cache backend: a fixed-size hash table in an mmap'd file
+
+Every worker on the host maps the same file, so an entry written or
+invalidated by one worker is seen by all of them. The file never grows: it
+has `slots` slots of `slot_bytes` each, and that size is the memory bound.
+Each operation holds an exclusive flock on the file for the few microseconds
+it needs, which serializes workers (and a lock serializes threads).
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from app.cache.base import CacheBackend, CacheStats, deserialize, serialize
+
+_MAGIC = b"HRMSCSH1"
+# magic, slots, slot bytes, generation, hits, misses
+_HEADER = struct.Struct("<8sIIQQQ")
+_HEADER_BYTES = 64
+_GENERATION_OFFSET = 16
+_HITS_OFFSET = 24
+_MISSES_OFFSET = 32
+_U64 = struct.Struct("<Q")
+
+# Per slot: generation, key hash, expires at (epoch seconds), last used, key length, value length
+_ENTRY = struct.Struct("<QQddHI")
+
+# Slots searched for a key, starting at hash % slots; a full window evicts its least recently used entry
+_PROBES = 8
+
+
+def _key_hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class SharedMemoryCache(CacheBackend):
+    """
+    Cache shared by the workers of one host through a memory-mapped file.
+
+    Entries larger than `slot_bytes` (header and key included) are not
+    stored. `clear` bumps a generation number in the file header instead of
+    wiping slots, so it is O(1). Hit/miss counters live in the header too
+    and cover every worker.
+    """
+
+    backend = "shared_memory"
+
+    def __init__(self, namespace: str, path: str, slots: int, slot_bytes: int, ttl: float):
+        super().__init__(namespace, ttl)
+        if slots <= 0:
+            raise ValueError("slots must be positive")
+        if slot_bytes <= _ENTRY.size:
+            raise ValueError(f"slot_bytes must be larger than {_ENTRY.size}")
+        self.path = path
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.size = _HEADER_BYTES + slots * slot_bytes
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._fd = -1
+        self._map: Optional[mmap.mmap] = None
+
+    def _open(self) -> None:
+        """Map the file in this process, creating or resetting it if its layout differs"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # A descriptor inherited across fork shares its flock with the parent, so each process opens its own
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < self.size:
+                os.ftruncate(fd, self.size)
+            mapped = mmap.mmap(fd, self.size)
+            magic, slots, slot_bytes, generation, _, _ = _HEADER.unpack_from(mapped, 0)
+            if (magic, slots, slot_bytes) != (_MAGIC, self.slots, self.slot_bytes) or generation == 0:
+                mapped[:self.size] = bytes(self.size)
+                _HEADER.pack_into(mapped, 0, _MAGIC, self.slots, self.slot_bytes, 1, 0, 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd, self._map, self._pid = fd, mapped, os.getpid()
+
+    @contextmanager
+    def _locked(self) -> Iterator[mmap.mmap]:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield self._map
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offsets(self, key_hash: int) -> Iterator[int]:
+        start = key_hash % self.slots
+        for probe in range(min(_PROBES, self.slots)):
+            yield _HEADER_BYTES + (start + probe) % self.slots * self.slot_bytes
+
+    def _find(self, mapped: mmap.mmap, generation: int, key_hash: int, key: bytes) -> Optional[int]:
+        """Offset of the slot holding key in the current generation, if any"""
+        for offset in self._offsets(key_hash):
+            slot_generation, slot_hash, _, _, key_length, _ = _ENTRY.unpack_from(mapped, offset)
+            if slot_generation == generation and slot_hash == key_hash:
+                start = offset + _ENTRY.size
+                if mapped[start:start + key_length] == key:
+                    return offset
+        return None
+
+    @staticmethod
+    def _count(mapped: mmap.mmap, offset: int) -> None:
+        _U64.pack_into(mapped, offset, _U64.unpack_from(mapped, offset)[0] + 1)
+
+    def get(self, key: str) -> Any:
+        encoded = key.encode()
+        key_hash = _key_hash(encoded)
+        now = time.time()
+        with self._locked() as mapped:
+            generation = _U64.unpack_from(mapped, _GENERATION_OFFSET)[0]
+            offset = self._find(mapped, generation, key_hash, encoded)
+            if offset is None:
+                self._count(mapped, _MISSES_OFFSET)
+                return None
+            _, _, expires_at, _, key_length, value_length = _ENTRY.unpack_from(mapped, offset)
+            if expires_at <= now:
+                _U64.pack_into(mapped, offset, 0)
+                self._count(mapped, _MISSES_OFFSET)
+                return None
+            _ENTRY.pack_into(mapped, offset, generation, key_hash, expires_at, now, key_length, value_length)
+            start = offset + _ENTRY.size + key_length
+            data = mapped[start:start + value_length]
+            self._count(mapped, _HITS_OFFSET)
+        return deserialize(data)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        encoded = key.encode()
+        key_hash = _key_hash(encoded)
+        data = serialize(value)
+        fits = _ENTRY.size + len(encoded) + len(data) <= self.slot_bytes
+        now = time.time()
+        with self._locked() as mapped:
+            generation = _U64.unpack_from(mapped, _GENERATION_OFFSET)[0]
+            target = self._find(mapped, generation, key_hash, encoded)
+            if not fits:
+                # Too large to cache; do not leave an older value behind
+                if target is not None:
+                    _U64.pack_into(mapped, target, 0)
+                return
+            if target is None:
+                least_recent = None
+                for offset in self._offsets(key_hash):
+                    slot_generation, _, expires_at, last_used, _, _ = _ENTRY.unpack_from(mapped, offset)
+                    if slot_generation != generation or expires_at <= now:
+                        target = offset
+                        break
+                    if least_recent is None or last_used < least_recent[0]:
+                        least_recent = (last_used, offset)
+                else:
+                    target = least_recent[1]
+            _ENTRY.pack_into(mapped, target, generation, key_hash, now + ttl, now, len(encoded), len(data))
+            start = target + _ENTRY.size
+            mapped[start:start + len(encoded) + len(data)] = encoded + data
+
+    def delete(self, key: str) -> None:
+        encoded = key.encode()
+        key_hash = _key_hash(encoded)
+        with self._locked() as mapped:
+            generation = _U64.unpack_from(mapped, _GENERATION_OFFSET)[0]
+            offset = self._find(mapped, generation, key_hash, encoded)
+            if offset is not None:
+                _U64.pack_into(mapped, offset, 0)
+
+    def clear(self) -> None:
+        with self._locked() as mapped:
+            self._count(mapped, _GENERATION_OFFSET)
+
+    def stats(self) -> CacheStats:
+        now = time.time()
+        with self._locked() as mapped:
+            _, _, _, generation, hits, misses = _HEADER.unpack_from(mapped, 0)
+            table = mapped[_HEADER_BYTES:self.size]
+        # Generation and expiry of every slot, counted outside the lock
+        slot = struct.Struct(f"<Q8xd{self.slot_bytes - 24}x")
+        entries = sum(
+            slot_generation == generation and expires_at > now
+            for slot_generation, expires_at in slot.iter_unpack(table)
+        )
+        return CacheStats(self.backend, hits, misses, entries=entries, max_bytes=self.size)
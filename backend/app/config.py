@@ -1,6 +1,7 @@
 """
 Application configuration settings
 """
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -10,11 +11,77 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./hrms.db"
     DATABASE_ECHO: bool = False  # Set to True for SQL query logging
+    DATABASE_AUTO_MIGRATE: bool = True  # Migrate/seed on startup if the schema is behind; False = fail fast
+    DATABASE_ASYNC: bool = False  # Serve requests through an async engine (aiosqlite/asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with the async driver
+    
+    # Read replica (list, get-by-id, stats and auth lookups; writes always go to DATABASE_URL)
+    DATABASE_REPLICA_URL: Optional[str] = None  # None = read from the primary
+    ASYNC_DATABASE_REPLICA_URL: Optional[str] = None  # Defaults to DATABASE_REPLICA_URL with the async driver
+    REPLICA_STICKY_SECONDS: float = 5.0  # After a write, that user's reads use the primary this long
+    
+    # Connection pool (per engine, per worker)
+    DATABASE_POOL_SIZE: int = 5  # Connections kept open
+    DATABASE_MAX_OVERFLOW: int = 10  # Extra connections allowed under load
+    DATABASE_POOL_RECYCLE: int = -1  # Seconds before a connection is replaced (-1 = never)
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DATABASE_POOL_PRE_PING: bool = True  # Test connections on checkout (one extra round trip)
+    
+    # SQLite production mode (WAL + pragmas + serialized writes, safe with several workers)
+    SQLITE_TUNED: bool = False
+    SQLITE_SERIALIZE_WRITES: bool = True  # Queue writes across workers via a lock file
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_CACHE_SIZE: int = -65536  # Negative = KiB, i.e. 64 MiB per connection
+    
+    # Caching
+    CACHE_BACKEND: Literal["memory", "shared_memory", "redis"] = "memory"  # Per worker, per host (mmap) or shared via Redis
+    CACHE_KEY_PREFIX: str = "hrms"  # Redis key / shared-memory directory prefix; change it to start from empty caches
+    CACHE_SHARED_MEMORY_DIR: Optional[str] = None  # Defaults to a directory per DATABASE_URL under /dev/shm
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"  # Any Redis-protocol server (Redis, Valkey, KeyDB)
+    CACHE_REDIS_TIMEOUT: float = 0.25  # Seconds per call before the cache counts as down (retried after 5s)
+    EMPLOYEE_COUNT_CACHE_TTL: int = 60  # Seconds an exact list total stays cached
+    EMPLOYEE_COUNT_CACHE_SIZE: int = 1024  # Max cached filter combinations
+    EMPLOYEE_STATS_CACHE_TTL: int = 300  # Seconds department/role aggregates stay cached
+    EMPLOYEE_VERSION_CACHE_TTL: float = 2.0  # Seconds the employees change version is trusted (0 = read per request)
+    EMPLOYEE_VALIDATOR_CACHE_SIZE: int = 10000  # Employee ETag inputs (updated_at) remembered
+    USER_CACHE_TTL: int = 30  # Seconds an authenticated user stays cached (0 disables)
+    USER_CACHE_SIZE: int = 10000  # Max cached users
+    
+    # Password hashing (existing hashes are upgraded on the next successful login)
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "scrypt", "argon2"] = "bcrypt"
+    BCRYPT_ROUNDS: int = 12  # log2 iterations
+    SCRYPT_LOG_N: int = 15  # log2 CPU/memory cost (N=32768 with r=8 uses 32 MiB)
+    SCRYPT_R: int = 8
+    SCRYPT_P: int = 1
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+
+    # Password hashing executor
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"  # "process" for GIL-bound KDFs
+    HASH_WORKERS: int = 4  # Hashes computed concurrently per worker
+    HASH_QUEUE_SIZE: int = 64  # Hashes allowed to wait for a free slot
+    HASH_QUEUE_TIMEOUT: float = 5.0  # Seconds to wait beyond that before answering 503
+    
+    # Bulk import
+    IMPORT_BATCH_SIZE: int = 1000  # Rows inserted per executemany/commit
+    IMPORT_MAX_ROWS: int = 100000  # Reject larger uploads
+    IMPORT_HASH_WORKERS: int = 4  # Threads hashing passwords
+    EXPORT_CHUNK_SIZE: int = 1000  # Rows fetched (yield_per) and written per chunk
+    
+    # Observability
+    METRICS_ENABLED: bool = True  # Per-route latency/phase histograms served at /metrics
+    METRICS_TOKEN: str = ""  # Bearer token for scraping /metrics (admins can always use their JWT)
+    SLOW_QUERY_MS: float = 200  # Log statements slower than this with their parameter types (0 disables)
+    N_PLUS_ONE_THRESHOLD: int = 10  # Warn when one request runs the same statement this often (0 disables)
+    QUERY_STATS_HEADERS: bool = True  # Add Server-Timing and X-DB-Query-Count to admin/METRICS_TOKEN responses
     
     # JWT Configuration
     JWT_SECRET_KEY: str = "monaco"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
+    JWT_CACHE_SIZE: int = 10000  # Max verified tokens cached per worker (0 disables)
     
     # CORS
     CORS_ORIGINS: list = ["http://localhost:5173", "http://127.0.0.1:5173"]
@@ -1,27 +1,630 @@
 """
 Database configuration and session management
 """
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from typing import Any, Callable, Optional, TypeVar
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Engine, Integer, String, Table,
+    column, delete, event, func, insert, select, table, text, update
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, create_engine, Session
+from app.cache import create_cache
 from app.config import settings
+from app.utils.metrics import Histogram
+from app.utils.query_stats import record_query
+
+T = TypeVar("T")
+
+
+class _CheckoutTimingMixin:
+    """Pool mixin that records how long each checkout waited for a connection"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram()
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_time.observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool with checkout wait-time metrics"""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait-time metrics"""
+
+
+# Pool settings shared by the sync and async engines
+_pool_options = {
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+}
+
+
+def _create_sync_engine(url: str) -> Engine:
+    """Sync engine with the shared pool settings and checkout metrics"""
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False} if "sqlite" in url else {},
+        echo=settings.DATABASE_ECHO,  # Configurable via environment
+        poolclass=InstrumentedQueuePool,
+        **_pool_options
+    )
+
 
 # Create database engine
 # Note: For SQLite in production with multiple workers, use external PostgreSQL instead
 # or deploy with single worker: gunicorn app.main:app -w 1 ...
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DATABASE_ECHO,  # Configurable via environment
-    pool_pre_ping=True  # Verify connections before checkout
+engine = _create_sync_engine(settings.DATABASE_URL)
+
+# Read replica for read-only request paths; the primary itself when none is configured
+replica_engine = (
+    _create_sync_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else engine
 )
 
 
+def _async_database_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart"""
+    scheme, _, rest = url.partition("://")
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme.startswith(("postgresql", "postgres")):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+# Async engines for the request path (DATABASE_ASYNC=True). Startup work
+# (table creation, seeding) keeps using the sync engine above.
+async_engine = None
+async_replica_engine = None
+if settings.DATABASE_ASYNC:
+    # Imported lazily: needs greenlet plus aiosqlite/asyncpg
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL),
+        echo=settings.DATABASE_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        **_pool_options
+    )
+    async_replica_engine = async_engine
+    if settings.DATABASE_REPLICA_URL:
+        async_replica_engine = create_async_engine(
+            settings.ASYNC_DATABASE_REPLICA_URL or _async_database_url(settings.DATABASE_REPLICA_URL),
+            echo=settings.DATABASE_ECHO,
+            poolclass=InstrumentedAsyncQueuePool,
+            **_pool_options
+        )
+
+
+def _pooled_engines() -> dict[str, Engine]:
+    """Every engine (and so every pool) in this worker, by name"""
+    engines = {"primary": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    if replica_engine is not engine:
+        engines["replica"] = replica_engine
+        if async_replica_engine is not None:
+            engines["async_replica"] = async_replica_engine.sync_engine
+    return engines
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLITE_TUNED pragmas to every new connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.close()
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    record_query(statement, parameters, executemany, time.perf_counter() - context._query_started)
+
+
+# Per-request query counts and "db" phase time, plus the slow-query log
+if settings.METRICS_ENABLED or settings.SLOW_QUERY_MS > 0:
+    for _bind in _pooled_engines().values():
+        event.listen(_bind, "before_cursor_execute", _start_query_timer)
+        event.listen(_bind, "after_cursor_execute", _stop_query_timer)
+
+
+# SQLite production mode: WAL lets readers in every worker run alongside
+# the single writer, and writes are funnelled through sqlite_write_lock()
+sqlite_tuned = settings.SQLITE_TUNED and _is_sqlite(settings.DATABASE_URL)
+if settings.SQLITE_TUNED:
+    for _bind in _pooled_engines().values():
+        if _bind.dialect.name == "sqlite":
+            event.listen(_bind, "connect", _set_sqlite_pragmas)
+
+_write_thread_lock = threading.Lock()
+_write_lock_file = None
+_write_lock_pid = None
+# Queues async writers on the event loop before they claim the locks above
+_async_write_lock = asyncio.Lock()
+
+
+def _sqlite_lock_file():
+    """Per-process handle on the lock file next to the SQLite database"""
+    global _write_lock_file, _write_lock_pid
+    if _write_lock_pid != os.getpid():
+        database = engine.url.database or "hrms.db"
+        _write_lock_file = open(f"{database}.write-lock", "a+b")
+        _write_lock_pid = os.getpid()
+    return _write_lock_file
+
+
+def _write_lock_enabled() -> bool:
+    return sqlite_tuned and settings.SQLITE_SERIALIZE_WRITES
+
+
+def _acquire_write_lock() -> None:
+    """Take the thread lock, then the flock (blocking; never call on the event loop)"""
+    _write_thread_lock.acquire()
+    try:
+        import fcntl
+    except ImportError:
+        return
+    try:
+        fcntl.flock(_sqlite_lock_file(), fcntl.LOCK_EX)
+    except BaseException:
+        _write_thread_lock.release()
+        raise
+
+
+def _release_write_lock() -> None:
+    try:
+        import fcntl
+    except ImportError:
+        pass
+    else:
+        fcntl.flock(_sqlite_lock_file(), fcntl.LOCK_UN)
+    _write_thread_lock.release()
+
+
+@contextmanager
+def sqlite_write_lock():
+    """
+    Serialize SQLite writers across threads and worker processes.
+    
+    A thread lock orders writers inside a worker and an flock() on a lock
+    file orders workers, so at most one write transaction is open at a time
+    and writers queue here instead of failing with "database is locked".
+    A no-op unless SQLITE_TUNED is on (Windows gets the thread lock only).
+    
+    Blocks the calling thread: async code uses async_sqlite_write_lock().
+    """
+    if not _write_lock_enabled():
+        yield
+        return
+    
+    _acquire_write_lock()
+    try:
+        yield
+    finally:
+        _release_write_lock()
+
+
+@asynccontextmanager
+async def async_sqlite_write_lock():
+    """
+    sqlite_write_lock() for the event loop.
+    
+    Writers queue on an asyncio.Lock and the blocking thread lock + flock
+    are taken in a worker thread, so a writer waiting for another never
+    blocks the loop that writer needs to finish (run_sync work runs on it).
+    """
+    if not _write_lock_enabled():
+        yield
+        return
+    
+    async with _async_write_lock:
+        acquired = []
+        
+        def acquire():
+            _acquire_write_lock()
+            acquired.append(True)
+        
+        try:
+            await run_in_threadpool(acquire)
+        except BaseException:
+            # Cancelled while the thread was waiting: it may still have got the locks
+            if acquired:
+                _release_write_lock()
+            raise
+        try:
+            yield
+        finally:
+            _release_write_lock()
+
+
+def _end_stale_read(session: Session) -> None:
+    """
+    End a read transaction the session already opened (e.g. during auth).
+    
+    Upgrading a stale WAL snapshot to a write fails immediately with
+    SQLITE_BUSY instead of waiting for the lock.
+    """
+    if sqlite_tuned and session.in_transaction():
+        session.rollback()
+
+
+def serialized_write(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Run a service write method (session as first argument) under sqlite_write_lock().
+    
+    Any read transaction the session already opened is ended first (see
+    _end_stale_read). run_db() recognises these methods and takes
+    async_sqlite_write_lock() instead when called with an AsyncSession.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = kwargs["session"] if "session" in kwargs else args[0]
+        with sqlite_write_lock():
+            _end_stale_read(session)
+            return fn(*args, **kwargs)
+    wrapper.serialized_write = True
+    return wrapper
+
+
+def pool_wait_histograms() -> dict[str, Histogram]:
+    """Checkout wait-time histogram of each pool in this worker"""
+    return {name: bind.pool.wait_time for name, bind in _pooled_engines().items()}
+
+
+def pool_status() -> dict:
+    """Live connection pool stats for each engine in this worker"""
+    status = {}
+    for name, bind in _pooled_engines().items():
+        pool = bind.pool
+        status[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "wait_time_seconds": pool.wait_time.snapshot(),
+        }
+    return status
+
+
+# SQLite FTS5 index over employees.name (rowid = employees.id)
+employee_name_fts = table("employees_fts", column("rowid"), column("name"))
+
+_SQLITE_SEARCH_INDEX = [
+    """CREATE VIRTUAL TABLE employees_fts USING fts5(
+        name, content='employees', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_ai AFTER INSERT ON employees BEGIN
+        INSERT INTO employees_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_ad AFTER DELETE ON employees BEGIN
+        INSERT INTO employees_fts(employees_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_au AFTER UPDATE OF name ON employees BEGIN
+        INSERT INTO employees_fts(employees_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO employees_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+    # Index rows that existed before the FTS table
+    "INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')",
+]
+
+_POSTGRES_SEARCH_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_employees_name_trgm ON employees USING gin (name gin_trgm_ops)",
+]
+
+
+def create_search_index(bind: Engine = engine):
+    """
+    Create the substring search index on employee names.
+    
+    A leading-wildcard ILIKE cannot use the btree index on name, so:
+    - SQLite: FTS5 trigram table kept in sync by triggers
+    - PostgreSQL: pg_trgm GIN index, which ILIKE '%term%' uses directly
+    
+    Failures (old SQLite, no CREATE EXTENSION privilege) are logged and
+    search keeps working through the plain ILIKE scan.
+    """
+    try:
+        with bind.begin() as conn:
+            if bind.dialect.name == "sqlite":
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = 'employees_fts'")
+                ).first()
+                if not exists:
+                    for statement in _SQLITE_SEARCH_INDEX:
+                        conn.execute(text(statement))
+            elif bind.dialect.name == "postgresql":
+                for statement in _POSTGRES_SEARCH_INDEX:
+                    conn.execute(text(statement))
+    except SQLAlchemyError as exc:
+        print(f"⚠️  Search index not created, falling back to ILIKE scans: {exc}")
+    finally:
+        has_search_index.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def database_key(bind: Engine) -> str:
+    """Name of the database behind an engine for cache keys shared across workers"""
+    return bind.url.render_as_string(hide_password=True)
+
+
+@lru_cache(maxsize=None)
+def has_search_index(bind: Engine) -> bool:
+    """Whether the SQLite FTS5 name index exists on this engine"""
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'employees_fts'")
+        ).first() is not None
+
+
 def create_db_and_tables():
     """Create all database tables"""
     # checkfirst=True prevents "table already exists" errors
     SQLModel.metadata.create_all(engine, checkfirst=True)
+    create_search_index(engine)
+
+
+# Bump whenever tables or indexes change; migrate_database() brings older databases up to date
+SCHEMA_VERSION = 3
+
+schema_version = Table(
+    "schema_version",
+    SQLModel.metadata,
+    Column("version", Integer, primary_key=True),
+)
+
+# Change counter per table, bumped in the same transaction as every write,
+# so all workers agree on whether a table changed (ETags, cache validation)
+table_versions = Table(
+    "table_versions",
+    SQLModel.metadata,
+    Column("table_name", String(64), primary_key=True),
+    Column("version", BigInteger, nullable=False),
+    Column("changed_at", DateTime(timezone=True), nullable=False),
+)
+
+# Tables whose writes go through bump_table_version()
+VERSIONED_TABLES = ("employees",)
+
+# Indexes from older schema versions that a newer index makes redundant
+_OBSOLETE_INDEXES = (
+    "ix_employees_name",  # ix_employees_name_id
+    "ix_employees_department",  # ix_employees_department_name_id
+    "ix_employees_job_role",  # ix_employees_job_role_name_id
+)
+
+
+def bump_table_version(conn: Any, table_name: str) -> None:
+    """
+    Record a write to table_name; call inside the writing transaction.
+    
+    Args:
+        conn: Session or Connection of the write (committed together with it)
+        table_name: Name of the changed table
+    """
+    now = datetime.now(timezone.utc)
+    bumped = conn.execute(
+        update(table_versions)
+        .where(table_versions.c.table_name == table_name)
+        .values(version=table_versions.c.version + 1, changed_at=now)
+    ).rowcount
+    if not bumped:
+        conn.execute(insert(table_versions).values(table_name=table_name, version=1, changed_at=now))
+
+
+def get_table_version(conn: Any, table_name: str) -> tuple[int, Optional[datetime]]:
+    """
+    Current (version, changed_at) of table_name; (0, None) if never recorded.
+    
+    One primary-key read. changed_at is returned in UTC.
+    """
+    row = conn.execute(
+        select(table_versions.c.version, table_versions.c.changed_at)
+        .where(table_versions.c.table_name == table_name)
+    ).first()
+    if row is None:
+        return 0, None
+    changed_at = row.changed_at
+    if changed_at.tzinfo is None:  # SQLite keeps no offset
+        changed_at = changed_at.replace(tzinfo=timezone.utc)
+    return row.version, changed_at
+
+
+def get_schema_version(bind: Engine = engine) -> int:
+    """
+    Schema version recorded by migrate_database() (0 if never migrated).
+    
+    A single read, cheap enough to run on every worker start.
+    """
+    try:
+        with bind.connect() as conn:
+            return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except SQLAlchemyError:
+        return 0
+
+
+def migrate_database(bind: Engine = engine) -> bool:
+    """
+    Bring the schema up to SCHEMA_VERSION.
+    
+    Creates missing tables, missing indexes on existing tables and the
+    search index, drops superseded indexes, starts the change counter of
+    each versioned table, then records the version. The version is re-checked
+    under sqlite_write_lock(), so workers racing here migrate once.
+    
+    Returns:
+        True if this call migrated, False if the schema was already current
+    """
+    from app.models import employee_model, user_model  # noqa: F401  (register the tables)
+    
+    with sqlite_write_lock():
+        if get_schema_version(bind) >= SCHEMA_VERSION:
+            return False
+        
+        SQLModel.metadata.create_all(bind, checkfirst=True)
+        for model_table in SQLModel.metadata.sorted_tables:
+            for index in model_table.indexes:
+                index.create(bind, checkfirst=True)
+        create_search_index(bind)
+        
+        with bind.begin() as conn:
+            for index_name in _OBSOLETE_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            for table_name in VERSIONED_TABLES:
+                if get_table_version(conn, table_name)[1] is None:
+                    bump_table_version(conn, table_name)
+            conn.execute(delete(schema_version))
+            conn.execute(insert(schema_version).values(version=SCHEMA_VERSION))
+        return True
 
 
 def get_session():
     """Dependency to get database session"""
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """Dependency to get an async database session"""
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
+# Users whose reads stay on the primary until their recent writes have replicated
+# (shared by all workers with a shared CACHE_BACKEND, so stickiness follows the user)
+_recent_writers = create_cache("recent_writers", maxsize=100000, ttl=settings.REPLICA_STICKY_SECONDS, max_item_bytes=64)
+
+
+def has_replica() -> bool:
+    """Whether reads are routed to a separate replica database"""
+    return replica_engine is not engine
+
+
+def mark_recent_write(user_id: int) -> None:
+    """Send user_id's reads to the primary for the next REPLICA_STICKY_SECONDS"""
+    if has_replica():
+        _recent_writers.set(str(user_id), True)
+
+
+def reads_from_primary(user_id: Optional[int]) -> bool:
+    """Whether user_id must read from the primary (no replica, or a recent write)"""
+    return not has_replica() or (user_id is not None and _recent_writers.get(str(user_id)) is not None)
+
+
+def get_read_session(user_id: Optional[int] = None):
+    """Session for read-only work: the replica, unless user_id wrote recently"""
+    with Session(engine if reads_from_primary(user_id) else replica_engine) as session:
+        yield session
+
+
+async def get_async_read_session(user_id: Optional[int] = None):
+    """Async version of get_read_session"""
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    
+    bind = async_engine if reads_from_primary(user_id) else async_replica_engine
+    async with AsyncSession(bind) as session:
+        yield session
+
+
+# Session or AsyncSession, depending on DATABASE_ASYNC
+DbSession = Any
+
+# Session dependency for request handlers: AsyncSession when DATABASE_ASYNC
+# is on, otherwise the blocking Session. Handlers pass it to run_db().
+get_db_session = get_async_session if settings.DATABASE_ASYNC else get_session
+
+
+async def run_db(session: Any, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run sync ORM code against either session type without blocking the event loop.
+    
+    - AsyncSession: runs fn inside run_sync, so I/O awaits the async driver
+    - Session: runs fn in the threadpool, like a sync `def` handler would
+    
+    Args:
+        session: Session or AsyncSession from get_db_session
+        fn: Callable taking a sync Session as its first argument
+    
+    Returns:
+        Whatever fn returns
+    """
+    if isinstance(session, Session):
+        return await run_in_threadpool(fn, session, *args, **kwargs)
+    if getattr(fn, "serialized_write", False):
+        # run_sync work runs on the event loop thread: take the write lock
+        # off the loop first, then run the undecorated method
+        async with async_sqlite_write_lock():
+            return await session.run_sync(_run_serialized_write, fn.__wrapped__, *args, **kwargs)
+    return await session.run_sync(fn, *args, **kwargs)
+
+
+def _run_serialized_write(session: Session, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Body of a serialized_write method whose lock the caller already holds"""
+    _end_stale_read(session)
+    return fn(session, *args, **kwargs)
+
+
+async def _run_in_new_session(primary: bool, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run fn in a fresh session whose connection is returned to the pool as soon as fn returns"""
+    if settings.DATABASE_ASYNC:
+        from sqlmodel.ext.asyncio.session import AsyncSession
+        
+        async with AsyncSession(async_engine if primary else async_replica_engine) as session:
+            return await run_db(session, fn, *args, **kwargs)
+    
+    with Session(engine if primary else replica_engine) as session:
+        return await run_db(session, fn, *args, **kwargs)
+
+
+async def run_on_primary(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run fn (sync Session as first argument) in a fresh primary session.
+    
+    For reads that must not miss rows the replica has not received yet.
+    """
+    return await _run_in_new_session(True, fn, *args, **kwargs)
+
+
+async def run_on_read_database(user_id: Optional[int], fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run fn (sync Session as first argument) in a fresh session on user_id's
+    read database (the replica unless they wrote recently, see get_read_session).
+    
+    For lookups made outside the handler's own session, e.g. authentication:
+    the connection is released before the handler runs, so a request never
+    holds two pooled connections at once.
+    """
+    return await _run_in_new_session(reads_from_primary(user_id), fn, *args, **kwargs)
@@ -1,40 +1,134 @@
 """
 Authentication dependencies for protected routes
 """
-from typing import Annotated
+import time
+from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, object_session
 from sqlmodel import Session, select
-from app.database import get_session
+from app.cache import create_cache
+from app.config import settings
+from app.database import (
+    get_async_read_session, get_read_session, has_replica, mark_recent_write, run_on_primary, run_on_read_database
+)
 from app.models.user_model import UserModel
+from app.schemas.user_schema import UserPrincipal
 from app.services.jwt_service import decode_access_token
+from app.utils.metrics import add_phase_time
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# session.info key of the user ids a session changed, invalidated again after commit
+_CHANGED_USERS = "changed_user_ids"
+
+# Authenticated users by id, so protected requests skip the users lookup
+_user_cache = create_cache(
+    "users",
+    maxsize=settings.USER_CACHE_SIZE if settings.USER_CACHE_TTL > 0 else 0,
+    ttl=settings.USER_CACHE_TTL
+)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the authentication cache after it changes"""
+    _user_cache.delete(str(user_id))
+
+
+def _load_principal(session: Session, user_id: int) -> Optional[UserPrincipal]:
+    """Load a user's principal data, or None if the user no longer exists"""
+    user = session.get(UserModel, user_id)
+    return UserPrincipal.model_validate(user) if user is not None else None
+
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> Optional[int]:
+    """user_id claim of a bearer token (None if invalid); decoding is cached"""
+    payload = decode_access_token(credentials.credentials)
+    return payload.get("user_id") if payload is not None else None
+
+
+def _get_caller_read_session(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]):
+    """Read session for the caller (see get_db_read_session)"""
+    yield from get_read_session(_token_user_id(credentials))
+
+
+async def _get_caller_async_read_session(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]):
+    """Async read session for the caller (see get_db_read_session)"""
+    async for session in get_async_read_session(_token_user_id(credentials)):
+        yield session
+
+
+# Session dependency for read-only handlers: on the read replica when one is
+# configured, except for callers who wrote within REPLICA_STICKY_SECONDS
+# (read-your-writes). Write handlers keep using get_db_session.
+get_db_read_session = (
+    _get_caller_async_read_session if settings.DATABASE_ASYNC else _get_caller_read_session
+)
+
+
+@event.listens_for(UserModel, "after_update")
+@event.listens_for(UserModel, "after_delete")
+def _invalidate_on_user_change(mapper, connection, target: UserModel) -> None:
+    """
+    Keep the authentication cache in step with ORM writes to users.
+    
+    Runs at flush, before the change is committed, so a concurrent cache
+    miss can still read and re-cache the old row; the id is remembered and
+    dropped again once the session commits.
+    """
+    invalidate_cached_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_after_commit(session: OrmSession) -> None:
+    """Drop users changed in the committed transaction (see _invalidate_on_user_change)"""
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        invalidate_cached_user(user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back_changes(session: OrmSession) -> None:
+    """Nothing changed, so nothing to drop after a rollback"""
+    session.info.pop(_CHANGED_USERS, None)
+
 
 async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    session: Annotated[Session, Depends(get_session)]
-) -> UserModel:
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+) -> UserPrincipal:
     """
     Dependency to get the current authenticated user from JWT token.
     
     This validates the JWT token and retrieves the user from database.
+    Users are cached for USER_CACHE_TTL seconds, so repeat
+    requests skip the database round trip. A miss is looked up in a
+    short-lived session (closed before the handler runs, so a request holds
+    at most one pooled connection) on the replica when one is configured,
+    falling back to the primary for users the replica does not have yet.
     Used in all protected routes.
     
     Args:
         credentials: HTTP Authorization header with Bearer token
-        session: Database session
     
     Returns:
-        UserModel: The authenticated user
+        UserPrincipal: The authenticated user
     
     Raises:
         HTTPException: 401 if token is invalid or user not found
     """
-    token = credentials.credentials
-    
+    started = time.perf_counter()
+    try:
+        return await _authenticate(credentials.credentials)
+    finally:
+        add_phase_time("auth", time.perf_counter() - started)
+
+
+async def _authenticate(token: str) -> UserPrincipal:
+    """Resolve a bearer token to its user (see get_current_user)"""
     # Decode and validate token
     payload = decode_access_token(token)
     if payload is None:
@@ -51,12 +145,33 @@ async def get_current_user(
             detail="Invalid or missing token"
         )
     
-    # Fetch user from database
-    user = session.get(UserModel, user_id)
-    if user is None:
+    # Serve from cache, falling back to the database
+    principal = _user_cache.get(str(user_id))
+    if principal is not None:
+        return principal
+    
+    principal = await run_on_read_database(user_id, _load_principal, user_id)
+    if principal is None and has_replica():
+        principal = await run_on_primary(_load_principal, user_id)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing token"
         )
     
-    return user
+    _user_cache.set(str(user_id), principal)
+    
+    return principal
+
+
+async def pin_reads_to_primary(current_user: Annotated[UserPrincipal, Depends(get_current_user)]):
+    """
+    Dependency for write routes: keep the caller's reads on the primary.
+    
+    Marks the caller before the write runs and again once it finished, so
+    their reads during and for REPLICA_STICKY_SECONDS after the write see it
+    even while the replica lags behind.
+    """
+    mark_recent_write(current_user.id)
+    yield
+    mark_recent_write(current_user.id)
@@ -1,27 +1,57 @@
 """
 Main FastAPI application entry point
 """
+import logging
 from typing import Annotated
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from app.cache import clear_caches
 from app.config import settings
-from app.database import create_db_and_tables
+from app.database import SCHEMA_VERSION, get_schema_version, has_replica, migrate_database
 from app.seed_data import seed_database
-from app.routers import auth_router, employee_router
+from app.routers import auth_router, employee_router, metrics_router
 from app.dependencies.auth import get_current_user
-from app.models.user_model import UserModel
+from app.middleware.timing import TimingMiddleware
+from app.schemas.user_schema import UserPrincipal
+from app.utils.hash_executor import hash_executor
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup"""
+    """
+    Check the database schema on startup.
+    
+    An up-to-date database costs one read and no writes. An older (or empty)
+    one is migrated and seeded here unless DATABASE_AUTO_MIGRATE is off, in
+    which case `python -m app.seed_data` must run before the workers start.
+    """
     print("🚀 Starting up application...")
-    create_db_and_tables()
-    seed_database()
-    print("✅ Database initialized")
+    version = get_schema_version()
+    if version < SCHEMA_VERSION:
+        if not settings.DATABASE_AUTO_MIGRATE:
+            raise RuntimeError(
+                f"Database schema is at version {version}, expected {SCHEMA_VERSION}. "
+                "Run `python -m app.seed_data` before starting the app."
+            )
+        if migrate_database():
+            seed_database()
+        # Shared caches outlive workers; drop anything read from the old database
+        clear_caches()
+        print("✅ Database initialized")
+    else:
+        print(f"✅ Database schema is current (version {version})")
+    if has_replica() and settings.CACHE_BACKEND == "memory":
+        # Each worker only knows its own recent writers, so read-your-writes breaks across workers
+        logger.warning(
+            "DATABASE_REPLICA_URL is set with CACHE_BACKEND=memory: a user who writes through one worker "
+            "may read stale data through another. Use CACHE_BACKEND=shared_memory or redis with a replica."
+        )
     yield
     print("🛑 Shutting down application...")
+    hash_executor.shutdown()
 
 
 # Create FastAPI app
@@ -41,6 +71,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and phase timings (outermost, so CORS is included)
+if settings.METRICS_ENABLED:
+    app.add_middleware(TimingMiddleware)
+
 
 @app.get("/", tags=["Health"])
 def health_check():
@@ -55,11 +89,12 @@ def health_check():
 # Include routers
 app.include_router(auth_router.router)
 app.include_router(employee_router.router)
+app.include_router(metrics_router.router)
 
 
 # Test protected endpoint
 @app.get("/me", tags=["User"])
-def get_my_profile(current_user: Annotated[UserModel, Depends(get_current_user)]):
+async def get_my_profile(current_user: Annotated[UserPrincipal, Depends(get_current_user)]):
     """
     Test endpoint to verify authentication.
     Returns the current user's profile.
@@ -0,0 +1,115 @@
+"""
+Request timing middleware
+"""
+import logging
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.services.jwt_service import decode_access_token
+from app.utils.metrics import RequestMetrics, is_metrics_token, phase_times, request_metrics
+from app.utils.query_stats import QueryStats, compact_sql, query_stats
+
+logger = logging.getLogger("app.sql")
+
+
+def server_timing(times: dict, stats: QueryStats) -> str:
+    """Server-Timing header value (milliseconds) for the phases seen so far"""
+    entries = [f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"']
+    entries += [
+        f"{phase};dur={seconds * 1000:.2f}"
+        for phase, seconds in times.items() if phase != "db"
+    ]
+    return ", ".join(entries)
+
+
+def may_see_query_stats(scope: Scope) -> bool:
+    """
+    Whether the caller sent METRICS_TOKEN or an admin's JWT.
+    
+    Query counts and phase times are metrics like those behind /metrics, so
+    they get the same audience. The JWT's role claim is trusted without a
+    database lookup (the token is signed and its decoding is cached).
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return False
+            if is_metrics_token(token):
+                return True
+            payload = decode_access_token(token)
+            return payload is not None and payload.get("role") == "admin"
+    return False
+
+
+class TimingMiddleware:
+    """
+    Record latency, status code, phase times and SQL statements for every HTTP request.
+
+    Requests are labelled with the matched route template (e.g.
+    /employees/{employee_id}) rather than the raw path, so the number of
+    series stays bounded; requests that match no route share "unmatched".
+    Streaming responses are timed until their last chunk is sent.
+
+    With `headers` on, responses to admins and METRICS_TOKEN callers carry
+    X-DB-Query-Count and Server-Timing (db/auth/serialization durations,
+    shown by browser dev tools) as of the moment the response starts. Requests that run one statement at least
+    `n_plus_one_threshold` times are logged as likely N+1 loops.
+
+    Pure ASGI (no BaseHTTPMiddleware) to keep the per-request cost to two
+    context variables, two clock reads and a few dict updates.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics = request_metrics,
+        headers: bool = settings.QUERY_STATS_HEADERS,
+        n_plus_one_threshold: int = settings.N_PLUS_ONE_THRESHOLD
+    ):
+        self.app = app
+        self.metrics = metrics
+        self.headers = headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        times: dict = {}
+        stats = QueryStats()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.headers and may_see_query_stats(scope):
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"server-timing", server_timing(times, stats).encode()),
+                    ]
+            await send(message)
+
+        times_token = phase_times.set(times)
+        stats_token = query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            phase_times.reset(times_token)
+            query_stats.reset(stats_token)
+            method = scope["method"]
+            route = getattr(scope.get("route"), "path", "unmatched")
+
+            repeated = stats.repeated(self.n_plus_one_threshold)
+            for statement, count in repeated:
+                logger.warning(
+                    "Statement ran %d times in one request (possible N+1) in %s %s: %s",
+                    count, method, route, compact_sql(statement)
+                )
+
+            self.metrics.observe(method, route, status_code, elapsed, times, stats.count, bool(repeated))
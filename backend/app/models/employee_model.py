@@ -3,6 +3,7 @@ Employee model for employee management
 """
 from datetime import datetime, timezone
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
@@ -11,10 +12,23 @@ class EmployeeModel(SQLModel, table=True):
     
     __tablename__ = "employees"
     
+    # Filter columns first, then the sort key, then id (the tie-breaker), so
+    # filtered and sorted list pages are read in index order with no sort step.
+    # The leading columns also serve plain filters, counts and GROUP BY.
+    __table_args__ = (
+        Index("ix_employees_name_id", "name", "id"),
+        Index("ix_employees_department_name_id", "department", "name", "id"),
+        Index("ix_employees_department_job_role_name_id", "department", "job_role", "name", "id"),
+        Index("ix_employees_job_role_name_id", "job_role", "name", "id"),
+        Index("ix_employees_department_salary_id", "department", "salary", "id"),
+        Index("ix_employees_salary_id", "salary", "id"),
+        Index("ix_employees_created_at_id", "created_at", "id"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(index=True)
-    department: str = Field(index=True)
-    job_role: str = Field(index=True)
+    name: str
+    department: str
+    job_role: str
     salary: float
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
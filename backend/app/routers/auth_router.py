@@ -1,22 +1,56 @@
 """
 Authentication router for login endpoint
 """
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from datetime import datetime, timezone
+from typing import Annotated, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import update
 from sqlmodel import Session, select
-from app.database import get_session
+from app.database import engine, get_db_session, run_db, sqlite_write_lock, DbSession
 from app.models.user_model import UserModel
 from app.schemas.user_schema import UserLogin, TokenResponse
 from app.services.jwt_service import create_access_token
-from app.utils.hashing import verify_password
+from app.utils.hash_executor import hash_executor
+from app.utils.hashing import hash_password, needs_rehash, verify_password, verify_unknown_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
+logger = logging.getLogger(__name__)
+
+
+def _get_user_by_email(session: Session, email: str) -> Optional[UserModel]:
+    """Look up a user by email"""
+    statement = select(UserModel).where(UserModel.email == email)
+    return session.exec(statement).first()
+
+
+def _rehash_password(user_id: int, password: str, old_hash: str) -> None:
+    """
+    Upgrade a stored hash to the configured scheme and cost.
+    
+    Runs after the login response has been sent. The update only applies if
+    the hash is still the one that was verified, so a concurrent password
+    change is never overwritten. Failures are logged; the old hash keeps
+    working and the upgrade is retried on the next login.
+    """
+    try:
+        new_hash = hash_executor.run(hash_password, password)
+        with sqlite_write_lock(), Session(engine) as session:
+            session.exec(
+                update(UserModel)
+                .where(UserModel.id == user_id, UserModel.password_hash == old_hash)
+                .values(password_hash=new_hash, updated_at=datetime.now(timezone.utc))
+            )
+            session.commit()
+    except Exception:
+        logger.exception("Password rehash failed for user %s", user_id)
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     credentials: UserLogin,
-    session: Annotated[Session, Depends(get_session)]
+    session: Annotated[DbSession, Depends(get_db_session)],
+    background_tasks: BackgroundTasks
 ):
     """
     Login endpoint - authenticate user and return JWT token.
@@ -43,24 +77,34 @@ def login(
     Args:
         credentials: Email and password
         session: Database session
+        background_tasks: Used to upgrade outdated password hashes
     
     Returns:
         TokenResponse with JWT token and user info
     
     Raises:
         HTTPException: 401 if credentials are invalid
+        HTTPException: 503 if the password hashing queue is full
     """
     # Find user by email
-    statement = select(UserModel).where(UserModel.email == credentials.email)
-    user = session.exec(statement).first()
+    user = await run_db(session, _get_user_by_email, credentials.email)
     
-    # Check if user exists and password is correct
-    if user is None or not verify_password(credentials.password, user.password_hash):
+    # Check the password (hashing runs on the bounded pool). An unknown email
+    # costs the same hashing work, so timing does not reveal which accounts exist.
+    if user is None:
+        valid = await hash_executor.run_async(verify_unknown_user, credentials.password)
+    else:
+        valid = await hash_executor.run_async(verify_password, credentials.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
+    # Legacy or outdated-cost hash: upgrade it once the response is sent
+    if needs_rehash(user.password_hash):
+        background_tasks.add_task(_rehash_password, user.id, credentials.password, user.password_hash)
+    
     # Create JWT token
     access_token = create_access_token(user_id=user.id, role=user.role)
     
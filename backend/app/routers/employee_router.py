@@ -1,33 +1,59 @@
 """
 Employee router - API endpoints for employee management
 """
-from typing import Annotated, Optional, List, Union
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session
-from app.database import get_session
-from app.dependencies.auth import get_current_user
-from app.models.user_model import UserModel
+from typing import Annotated, Optional, List, Union, Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.database import get_db_session, DbSession
+from app.dependencies.auth import get_current_user, get_db_read_session, pin_reads_to_primary
+from app.schemas.user_schema import UserPrincipal
 from app.schemas.employee_schema import (
     EmployeeCreate,
     EmployeeUpdate,
     EmployeeResponse,
-    EmployeeResponseNoSalary
+    EmployeeResponseNoSalary,
+    EmployeeStatsResponse,
+    EmployeeImportResponse,
+    EmployeeBulkSelection,
+    EmployeeBulkUpdate,
+    EmployeeBulkResult,
+    EmployeeBatchRequest,
+    EmployeeBatchResponse,
+    EmployeeSort,
+    SortOrder
 )
 from app.services.employee_service import EmployeeService
+from app.utils.bulk_io import BulkFormat, detect_format, parse_rows
+from app.utils.conditional import Validators
+from app.utils.responses import ORJSONResponse
 from app.utils.role_check import allow_roles
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
 
+def _employee_validators(employee_id: int, updated_at, include_salary: bool) -> Validators:
+    """Validators of one employee; salary-visible and hidden bodies never share an ETag"""
+    return Validators.build("employee", employee_id, updated_at, include_salary, last_modified=updated_at)
+
+
 @router.get("/", response_model=dict)
-def get_all_employees(
-    current_user: Annotated[UserModel, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_session)],
+async def get_all_employees(
+    request: Request,
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_read_session)],
     search: Optional[str] = Query(None, description="Search by employee name"),
     department: Optional[str] = Query(None, description="Filter by department"),
     job_role: Optional[str] = Query(None, description="Filter by job role"),
     page: int = Query(1, ge=1,description="Page number"),
-    limit: int = Query(10, ge=1, le=100, description="Items per page")
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    pagination: Literal["offset", "cursor"] = Query("offset", description="Pagination mode"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (cursor mode)"),
+    include_total: bool = Query(True, description="Return the total count (offset mode)"),
+    total_mode: Literal["exact", "estimated"] = Query("exact", description="Exact or estimated total"),
+    sort: Optional[EmployeeSort] = Query(None, description="Sort field (default: id, or name in cursor mode)"),
+    order: SortOrder = Query("asc", description="Sort direction")
 ):
     """
     Get all employees with optional filtering and pagination.
@@ -35,7 +61,7 @@ def get_all_employees(
     **Access:**
     - Admin: Can see all employees with salary
     - HR: Can see all employees with salary
-    - Employee: Can see all employees WITHOUT salary
+    - Employee: Can see all employees WITHOUT salary (and cannot sort by it)
     
     **Query Parameters:**
     - `search`: Search by employee name (case-insensitive)
@@ -43,6 +69,17 @@ def get_all_employees(
     - `job_role`: Filter by specific job role
     - `page`: Page number (default: 1)
     - `limit`: Items per page (default: 10, max: 100)
+    - `pagination`: `offset` (default) or `cursor` for keyset pagination
+    - `cursor`: `next_cursor` from the previous page (implies cursor mode)
+    - `include_total`: Set to false to skip the COUNT query (`total` and `total_pages` are null)
+    - `total_mode`: `exact` (default, cached until the next write) or `estimated`
+      (from database statistics; `total_is_estimate` tells which one you got).
+      On SQLite only the unfiltered total is estimated, as the highest id: an
+      upper bound that still counts deleted rows. Filtered totals are exact
+    - `sort`: `name`, `department`, `job_role`, `salary` or `created_at`
+      (`department` and `job_role` sort by name within each group); ties are
+      broken by id, so pages never overlap. Default: id (offset), name (cursor)
+    - `order`: `asc` (default) or `desc`
     
     **Response:**
     ```json
@@ -51,41 +88,217 @@ def get_all_employees(
       "total": 50,
       "page": 1,
       "limit": 10,
-      "total_pages": 5
+      "total_pages": 5,
+      "total_is_estimate": false
+    }
+    ```
+    
+    **Response (cursor mode):**
+    ```json
+    {
+      "employees": [...],
+      "limit": 10,
+      "next_cursor": "eyJuYW1lIjoi..."
     }
     ```
+    `next_cursor` is null on the last page. Cursor mode orders by name and
+    its cost does not grow with depth, so use it for deep or full scans.
+    
+    Rows come back as plain dicts and the page is encoded once by
+    ORJSONResponse instead of going through response_model validation.
+    
+    **Caching:** the ETag covers the employees table change version, the
+    query and salary visibility; Last-Modified is the time of the last
+    employee write. Revalidating with If-None-Match / If-Modified-Since
+    returns an empty 304 while nothing has changed, usually without any
+    database query.
     """
     # Determine if salary should be included based on role
     include_salary = current_user.role in ["admin", "hr"]
     
+    # Salary order would leak what the response hides
+    if sort == "salary" and not include_salary:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to sort by salary"
+        )
+    
+    # Read the version before the rows, so a concurrent write can only make the ETag older
+    version, changed_at = await EmployeeService.get_change_version_async(session)
+    validators = Validators.build(
+        "employees", version, changed_at, include_salary, str(request.query_params),
+        last_modified=changed_at
+    )
+    if validators.not_modified(request.headers):
+        return validators.not_modified_response()
+    
+    if pagination == "cursor" or cursor is not None:
+        try:
+            employees, next_cursor = await EmployeeService.get_employees_by_cursor_async(
+                session,
+                search=search,
+                department=department,
+                job_role=job_role,
+                cursor=cursor,
+                limit=limit,
+                include_salary=include_salary,
+                sort=sort or "name",
+                order=order
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        
+        return ORJSONResponse({
+            "employees": employees,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }, headers=validators.headers())
+    
     # Get employees from service
-    employees, total = EmployeeService.get_all_employees(
-        session=session,
+    employees, total, total_is_estimate = await EmployeeService.get_all_employees_async(
+        session,
         search=search,
         department=department,
         job_role=job_role,
         page=page,
         limit=limit,
-        include_salary=include_salary
+        include_salary=include_salary,
+        count_mode=total_mode if include_total else "none",
+        sort=sort,
+        order=order
     )
     
     # Calculate total pages
-    total_pages = (total + limit - 1) // limit
+    total_pages = (total + limit - 1) // limit if total is not None else None
     
-    return {
+    return ORJSONResponse({
         "employees": employees,
         "total": total,
         "page": page,
         "limit": limit,
-        "total_pages": total_pages
+        "total_pages": total_pages,
+        "total_is_estimate": total_is_estimate
+    }, headers=validators.headers())
+
+
+@router.get("/stats", response_model=EmployeeStatsResponse, response_model_exclude_none=True)
+async def get_employee_stats(
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_read_session)]
+):
+    """
+    Get headcount per department and job role.
+    
+    **Access:**
+    - Admin, HR: Headcount plus salary sum/avg/min/max per group
+    - Employee: Headcount only
+    
+    **Response:**
+    ```json
+    {
+      "total": 8,
+      "departments": [
+        {"name": "Engineering", "headcount": 3, "salary_sum": 270000.0,
+         "salary_avg": 90000.0, "salary_min": 85000.0, "salary_max": 95000.0}
+      ],
+      "job_roles": [...]
     }
+    ```
+    """
+    # Determine if salary should be included based on role
+    include_salary = current_user.role in ["admin", "hr"]
+    
+    return await EmployeeService.get_employee_stats_async(
+        session,
+        include_salary=include_salary
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_employees(
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    search: Optional[str] = Query(None, description="Search by employee name"),
+    department: Optional[str] = Query(None, description="Filter by department"),
+    job_role: Optional[str] = Query(None, description="Filter by job role"),
+    format: BulkFormat = Query("csv", description="csv or ndjson")
+):
+    """
+    Stream the employee directory as CSV or NDJSON.
+    
+    **Access:**
+    - Admin, HR: All fields including salary
+    - Employee: Same fields WITHOUT salary
+    
+    Rows are streamed from a server-side cursor, so exports of any size
+    use constant memory. Accepts the same filters as `GET /employees/`.
+    """
+    # Determine if salary should be included based on role
+    include_salary = current_user.role in ["admin", "hr"]
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    extension = "csv" if format == "csv" else "ndjson"
+    
+    return StreamingResponse(
+        EmployeeService.stream_employees(
+            search=search,
+            department=department,
+            job_role=job_role,
+            include_salary=include_salary,
+            fmt=format,
+            chunk_size=settings.EXPORT_CHUNK_SIZE
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="employees.{extension}"'}
+    )
+
+
+@router.post("/batch", response_model=EmployeeBatchResponse)
+async def get_employees_batch(
+    batch: EmployeeBatchRequest,
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_read_session)]
+):
+    """
+    Get up to 500 employees by ID in one request (and one query).
+    
+    A POST only so that hundreds of ids fit in the body; nothing is written.
+    
+    **Access:**
+    - Admin: Can see employees with salary
+    - HR: Can see employees with salary
+    - Employee: Can see employees WITHOUT salary
+    
+    **Request Body:**
+    ```json
+    {"ids": [12, 7, 9999]}
+    ```
+    
+    **Response:** found employees in request order, plus the ids that do not exist:
+    ```json
+    {"employees": [{"id": 12, ...}, {"id": 7, ...}], "missing": [9999]}
+    ```
+    """
+    # Determine if salary should be included based on role
+    include_salary = current_user.role in ["admin", "hr"]
+    
+    employees, missing = await EmployeeService.get_employees_by_ids_async(
+        session,
+        ids=batch.ids,
+        include_salary=include_salary
+    )
+    
+    return ORJSONResponse({"employees": employees, "missing": missing})
 
 
 @router.get("/{employee_id}", response_model=Union[EmployeeResponse, EmployeeResponseNoSalary])
-def get_employee(
+async def get_employee(
     employee_id: int,
-    current_user: Annotated[UserModel, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_session)]
+    request: Request,
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_read_session)]
 ):
     """
     Get a single employee by ID.
@@ -94,13 +307,27 @@ def get_employee(
     - Admin: Can see employee with salary
     - HR: Can see employee with salary
     - Employee: Can see employee WITHOUT salary
+    
+    **Caching:** the ETag and Last-Modified come from the employee's
+    `updated_at` and salary visibility. Revalidating with If-None-Match /
+    If-Modified-Since returns an empty 304 while the employee is unchanged;
+    while no employee has been written since this worker last read the row,
+    that needs no database query.
     """
     # Determine if salary should be included based on role
     include_salary = current_user.role in ["admin", "hr"]
     
+    # Answer revalidations from the remembered updated_at while the table is unchanged
+    version, _ = await EmployeeService.get_change_version_async(session)
+    updated_at = EmployeeService.cached_updated_at(employee_id, version)
+    if updated_at is not None:
+        validators = _employee_validators(employee_id, updated_at, include_salary)
+        if validators.not_modified(request.headers):
+            return validators.not_modified_response()
+    
     # Get employee from service
-    employee = EmployeeService.get_employee_by_id(
-        session=session,
+    employee = await EmployeeService.get_employee_by_id_async(
+        session,
         employee_id=employee_id,
         include_salary=include_salary
     )
@@ -111,14 +338,24 @@ def get_employee(
             detail=f"Employee with id {employee_id} not found"
         )
     
-    return employee
+    EmployeeService.remember_updated_at(employee_id, version, employee["updated_at"])
+    validators = _employee_validators(employee_id, employee["updated_at"], include_salary)
+    if validators.not_modified(request.headers):
+        return validators.not_modified_response()
+    
+    return ORJSONResponse(employee, headers=validators.headers())
 
 
-@router.post("/", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
-def create_employee(
+@router.post(
+    "/",
+    response_model=EmployeeResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(pin_reads_to_primary)]
+)
+async def create_employee(
     employee_data: EmployeeCreate,
-    current_user: Annotated[UserModel, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_session)]
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_session)]
 ):
     """
     Create a new employee AND a corresponding user account.
@@ -151,20 +388,159 @@ def create_employee(
         )
     
     # Create employee via service
-    employee = EmployeeService.create_employee(
-        session=session,
+    employee = await EmployeeService.create_employee_async(
+        session,
         employee_data=employee_data
     )
     
     return employee
 
 
-@router.put("/{employee_id}", response_model=EmployeeResponse)
-def update_employee(
+@router.post(
+    "/import",
+    response_model=EmployeeImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}}
+            }
+        }
+    },
+    dependencies=[Depends(pin_reads_to_primary)]
+)
+async def import_employees(
+    request: Request,
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_session)],
+    format: Optional[BulkFormat] = Query(None, description="csv or ndjson (default: from Content-Type)"),
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=10000, description="Rows per insert batch")
+):
+    """
+    Bulk import employees and their user accounts from CSV or NDJSON.
+    
+    **Access:**
+    - Admin: Rows may use any role
+    - HR: Rows may only use the "employee" role
+    
+    **Body:** CSV with a header row, or one JSON object per line, using the
+    same fields as `POST /employees/`:
+    ```
+    name,email,password,role,department,job_role,salary
+    Jane Smith,jane@example.com,securepassword,employee,Engineering,Software Engineer,90000
+    ```
+    
+    Invalid rows are skipped and reported; valid rows are still imported.
+    
+    **Response:**
+    ```json
+    {
+      "total_rows": 3,
+      "imported": 2,
+      "failed": 1,
+      "errors": [{"row": 2, "email": "bad", "error": "salary: Input should be a valid number"}]
+    }
+    ```
+    """
+    # Check authorization - only admin and hr can import
+    allow_roles(current_user.role, "admin", "hr")
+    
+    # RBAC Enforcement: HR can ONLY create "employee" role
+    allowed_roles = ["admin", "hr", "employee"] if current_user.role == "admin" else ["employee"]
+    
+    content = await request.body()
+    try:
+        # Parsed in a worker thread: a large upload must not stall the event loop
+        rows = await run_in_threadpool(
+            lambda: list(parse_rows(content, format or detect_format(request.headers.get("content-type", ""))))
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    
+    if len(rows) > settings.IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Import is limited to {settings.IMPORT_MAX_ROWS} rows per request"
+        )
+    
+    return await EmployeeService.import_employees_async(
+        session,
+        rows=rows,
+        allowed_roles=allowed_roles,
+        batch_size=batch_size
+    )
+
+
+@router.post("/bulk-update", response_model=EmployeeBulkResult, dependencies=[Depends(pin_reads_to_primary)])
+async def bulk_update_employees(
+    bulk_data: EmployeeBulkUpdate,
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_session)]
+):
+    """
+    Apply one patch to many employees in a single UPDATE.
+    
+    **Access:** Admin, HR only
+    
+    **Request Body:** select rows by `ids`, `department` and/or `job_role`
+    (all given conditions must match):
+    ```json
+    {
+      "department": "Sales",
+      "patch": {"department": "Revenue"}
+    }
+    ```
+    
+    **Response:** `{"affected": 42}`
+    """
+    # Check authorization - only admin and hr can update
+    allow_roles(current_user.role, "admin", "hr")
+    
+    affected = await EmployeeService.bulk_update_employees_async(
+        session,
+        selection=bulk_data,
+        employee_data=bulk_data.patch
+    )
+    
+    return EmployeeBulkResult(affected=affected)
+
+
+@router.post("/bulk-delete", response_model=EmployeeBulkResult, dependencies=[Depends(pin_reads_to_primary)])
+async def bulk_delete_employees(
+    selection: EmployeeBulkSelection,
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_session)]
+):
+    """
+    Delete many employees in a single DELETE.
+    
+    **Access:** Admin, HR only
+    
+    **Request Body:**
+    ```json
+    {"ids": [12, 13, 14]}
+    ```
+    
+    **Response:** `{"affected": 3}`
+    """
+    # Check authorization - only admin and hr can delete
+    allow_roles(current_user.role, "admin", "hr")
+    
+    affected = await EmployeeService.bulk_delete_employees_async(
+        session,
+        selection=selection
+    )
+    
+    return EmployeeBulkResult(affected=affected)
+
+
+@router.put("/{employee_id}", response_model=EmployeeResponse, dependencies=[Depends(pin_reads_to_primary)])
+async def update_employee(
     employee_id: int,
     employee_data: EmployeeUpdate,
-    current_user: Annotated[UserModel, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_session)]
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_session)]
 ):
     """
     Update an existing employee.
@@ -186,8 +562,8 @@ def update_employee(
     allow_roles(current_user.role, "admin", "hr")
     
     # Update employee via service
-    employee = EmployeeService.update_employee(
-        session=session,
+    employee = await EmployeeService.update_employee_async(
+        session,
         employee_id=employee_id,
         employee_data=employee_data
     )
@@ -201,11 +577,15 @@ def update_employee(
     return employee
 
 
-@router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_employee(
+@router.delete(
+    "/{employee_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(pin_reads_to_primary)]
+)
+async def delete_employee(
     employee_id: int,
-    current_user: Annotated[UserModel, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_session)]
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)],
+    session: Annotated[DbSession, Depends(get_db_session)]
 ):
     """
     Delete an employee.
@@ -216,8 +596,8 @@ def delete_employee(
     allow_roles(current_user.role, "admin", "hr")
     
     # Delete employee via service
-    success = EmployeeService.delete_employee(
-        session=session,
+    success = await EmployeeService.delete_employee_async(
+        session,
         employee_id=employee_id
     )
     
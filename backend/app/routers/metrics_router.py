@@ -0,0 +1,145 @@
+"""
+Metrics router - runtime stats for capacity planning
+
+Metrics reveal routes, traffic and database layout, so they are not public:
+callers send either METRICS_TOKEN (for scrapers, which cannot log in) or an
+admin's JWT as a Bearer token.
+"""
+import os
+from dataclasses import asdict
+from typing import Annotated
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from app.cache import cache_stats
+from app.database import pool_status, pool_wait_histograms
+from app.dependencies.auth import get_current_user, security
+from app.utils import query_stats
+from app.utils.metrics import format_labels, histogram_lines, is_metrics_token, request_metrics
+from app.utils.role_check import allow_roles
+
+
+async def require_metrics_access(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+) -> None:
+    """
+    Dependency for the metrics routes: the metrics token or an admin.
+    
+    Raises:
+        HTTPException: 401 if the token is neither METRICS_TOKEN nor a valid JWT
+        HTTPException: 403 if the JWT is not an admin's
+    """
+    if is_metrics_token(credentials.credentials):
+        return
+    current_user = await get_current_user(credentials)
+    allow_roles(current_user.role, "admin")
+
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"], dependencies=[Depends(require_metrics_access)])
+
+
+@router.get("/pool")
+def get_pool_metrics():
+    """
+    Get live connection pool stats for this worker.
+    
+    Each gunicorn worker has its own pools, so `pid` identifies which
+    worker answered. `wait_time_seconds` is a cumulative histogram of how
+    long checkouts waited for a connection.
+    
+    **Response:**
+    ```json
+    {
+      "pid": 4242,
+      "pools": {
+        "primary": {
+          "size": 5, "checked_in": 1, "checked_out": 0, "overflow": -4,
+          "max_overflow": 10,
+          "wait_time_seconds": {"buckets": {"0.0005": 120, "+Inf": 121}, "sum": 0.02, "count": 121}
+        }
+      }
+    }
+    ```
+    """
+    return {
+        "pid": os.getpid(),
+        "pools": pool_status()
+    }
+
+
+@router.get("/cache")
+def get_cache_metrics():
+    """
+    Get hit/miss counters and sizes of the application caches.
+    
+    Counters of the memory and redis backends cover this worker only; the
+    shared_memory backend keeps them in the shared file, so they cover every
+    worker on the host. `entries` is null where counting would be costly.
+    
+    **Response:**
+    ```json
+    {
+      "pid": 4242,
+      "caches": {
+        "users": {"backend": "memory", "hits": 950, "misses": 50, "entries": 12, "max_bytes": null}
+      }
+    }
+    ```
+    """
+    return {
+        "pid": os.getpid(),
+        "caches": {namespace: asdict(stats) for namespace, stats in cache_stats().items()}
+    }
+
+
+@router.get("", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    """
+    Request and pool metrics for this worker in Prometheus text format.
+    
+    - `http_request_duration_seconds{method,route}`: latency histogram
+    - `http_request_phase_seconds{method,route,phase}`: time in auth, db
+      (statement execution) and serialization (rows to response models)
+    - `http_requests_total{method,route,status}`: request counter
+    - `http_request_db_queries{method,route}`: SQL statements per request
+    - `http_requests_repeated_statements_total{method,route}`: requests
+      flagged as likely N+1 (see N_PLUS_ONE_THRESHOLD)
+    - `db_slow_queries_total`: statements slower than SLOW_QUERY_MS
+    - `db_pool_wait_seconds{pool}`: connection checkout wait histogram
+    - `cache_requests_total{cache,backend,result}`: cache hits and misses
+      (see /metrics/cache for which counters span workers)
+    - `cache_entries{cache,backend}`: live entries, where cheap to count
+    
+    Metrics are per worker process, like the pools themselves.
+    """
+    lines = request_metrics.prometheus_lines()
+    lines += [
+        "# HELP db_pool_wait_seconds Time spent waiting for a pooled connection",
+        "# TYPE db_pool_wait_seconds histogram",
+    ]
+    for name, histogram in pool_wait_histograms().items():
+        lines += histogram_lines("db_pool_wait_seconds", {"pool": name}, histogram)
+    lines += [
+        "# HELP db_slow_queries_total Statements slower than SLOW_QUERY_MS",
+        "# TYPE db_slow_queries_total counter",
+        f"db_slow_queries_total {query_stats.slow_query_total}",
+    ]
+    
+    caches = cache_stats()
+    lines += [
+        "# HELP cache_requests_total Cache lookups by result",
+        "# TYPE cache_requests_total counter",
+    ]
+    for namespace, stats in caches.items():
+        for result, count in (("hit", stats.hits), ("miss", stats.misses)):
+            labels = format_labels({"cache": namespace, "backend": stats.backend, "result": result})
+            lines.append(f"cache_requests_total{labels} {count}")
+    lines += [
+        "# HELP cache_entries Live cache entries",
+        "# TYPE cache_entries gauge",
+    ]
+    for namespace, stats in caches.items():
+        if stats.entries is not None:
+            lines.append(f"cache_entries{format_labels({'cache': namespace, 'backend': stats.backend})} {stats.entries}")
+    
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
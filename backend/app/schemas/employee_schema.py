@@ -2,8 +2,15 @@
 Pydantic schemas for Employee-related requests and responses
 """
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import Optional, List, Literal, Union
+from pydantic import BaseModel, Field, model_validator
+
+# Sort options of GET /employees/ (id is always the final tie-breaker)
+EmployeeSort = Literal["name", "department", "job_role", "salary", "created_at"]
+SortOrder = Literal["asc", "desc"]
+
+# Most ids POST /employees/batch accepts (one IN list, well under SQLite's bound parameter limit)
+EMPLOYEE_BATCH_MAX_IDS = 500
 
 
 class EmployeeCreate(BaseModel):
@@ -25,6 +32,30 @@ class EmployeeUpdate(BaseModel):
     salary: Optional[float] = None
 
 
+class EmployeeBulkSelection(BaseModel):
+    """Which employees a bulk operation applies to (ids and/or a filter)"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    department: Optional[str] = None
+    job_role: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def require_selection(self):
+        """Refuse to touch every row by accident (an empty ids list is rejected by min_length)"""
+        if self.ids is None and self.department is None and self.job_role is None:
+            raise ValueError("Provide ids, department or job_role")
+        return self
+
+
+class EmployeeBulkUpdate(EmployeeBulkSelection):
+    """Schema for updating many employees at once"""
+    patch: EmployeeUpdate
+
+
+class EmployeeBulkResult(BaseModel):
+    """Number of rows a bulk operation changed"""
+    affected: int
+
+
 class EmployeeResponse(BaseModel):
     """Full employee response schema (includes salary)"""
     id: int
@@ -50,3 +81,46 @@ class EmployeeResponseNoSalary(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class EmployeeBatchRequest(BaseModel):
+    """Employees to fetch in one call"""
+    ids: List[int] = Field(..., min_length=1, max_length=EMPLOYEE_BATCH_MAX_IDS)
+
+
+class EmployeeBatchResponse(BaseModel):
+    """Employees found (in request order, duplicates once) and the ids that do not exist"""
+    employees: List[Union[EmployeeResponse, EmployeeResponseNoSalary]]
+    missing: List[int]
+
+
+class GroupStats(BaseModel):
+    """Headcount and salary aggregates for one department or job role"""
+    name: str
+    headcount: int
+    salary_sum: Optional[float] = None
+    salary_avg: Optional[float] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+
+
+class EmployeeStatsResponse(BaseModel):
+    """Employee aggregates (salary fields only for admin/hr)"""
+    total: int
+    departments: List[GroupStats]
+    job_roles: List[GroupStats]
+
+
+class ImportRowError(BaseModel):
+    """Why one row of a bulk import was rejected"""
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class EmployeeImportResponse(BaseModel):
+    """Result of a bulk employee import"""
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
@@ -24,6 +24,18 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserPrincipal(BaseModel):
+    """Authenticated user data needed by request handlers (cacheable)"""
+    id: int
+    name: str
+    email: str
+    role: str
+    
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 class TokenResponse(BaseModel):
     """JWT token response schema"""
     access_token: str
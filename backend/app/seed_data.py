@@ -1,35 +1,84 @@
 """
 Database seed script to create initial users and employees
+
+Also the one-time migration step for deploys: it brings the schema up to
+date and seeds the demo users and employees into an empty database, so
+app workers can start without writing (DATABASE_AUTO_MIGRATE=False).
+
+    python -m app.seed_data
+
+With --employees/--users it also generates a large synthetic dataset:
+
+    python -m app.seed_data --employees 1000000 --users 50000 --seed 42
 """
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Any, Dict, List
+from sqlalchemy import Engine, func, insert
 from sqlmodel import Session, select
-from app.database import engine, create_db_and_tables
+from app.database import bump_table_version, engine, migrate_database, sqlite_write_lock
 from app.models.user_model import UserModel
 from app.models.employee_model import EmployeeModel
 from app.utils.hashing import hash_password
 
+# Synthetic data: (department, weight) and per department (job role, weight, base salary).
+# Weights are relative; a few large departments and many junior roles, like a real org chart.
+DEPARTMENTS = [
+    ("Engineering", 30), ("Sales", 20), ("Operations", 14), ("Support", 12),
+    ("Marketing", 8), ("Finance", 7), ("HR", 5), ("Legal", 4),
+]
+JOB_ROLES = {
+    "Engineering": [("Software Engineer", 45, 85000), ("Senior Software Engineer", 25, 110000),
+                    ("DevOps Engineer", 12, 95000), ("Engineering Manager", 6, 140000),
+                    ("Intern", 12, 35000)],
+    "Sales": [("Sales Representative", 55, 50000), ("Account Executive", 30, 70000),
+              ("Sales Manager", 10, 95000), ("Sales Director", 5, 140000)],
+    "Operations": [("Operations Associate", 60, 45000), ("Operations Analyst", 30, 60000),
+                   ("Operations Manager", 10, 90000)],
+    "Support": [("Support Specialist", 70, 42000), ("Support Engineer", 22, 60000),
+                ("Support Manager", 8, 80000)],
+    "Marketing": [("Marketing Specialist", 55, 60000), ("Content Strategist", 30, 65000),
+                  ("Marketing Manager", 15, 95000)],
+    "Finance": [("Accountant", 45, 65000), ("Financial Analyst", 35, 72000),
+                ("Senior Accountant", 15, 80000), ("Finance Director", 5, 150000)],
+    "HR": [("HR Generalist", 50, 55000), ("Recruiter", 35, 58000), ("HR Manager", 15, 80000)],
+    "Legal": [("Paralegal", 40, 55000), ("Legal Counsel", 45, 120000), ("General Counsel", 15, 190000)],
+}
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Wei", "Priya",
+    "Carlos", "Fatima", "Hiroshi", "Olga", "Ahmed", "Chloe", "Mateo", "Aisha", "Lars", "Ngozi",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee",
+    "Chen", "Patel", "Kim", "Nguyen", "Kowalski", "Okafor", "Tanaka", "Ivanova", "Silva", "Schmidt",
+]
+USER_ROLES = [("employee", 94), ("hr", 5), ("admin", 1)]
+SYNTHETIC_PASSWORD = "password123"
+
 
-def seed_database():
-    """Seed the database with initial users and employees"""
+def seed_database() -> bool:
+    """
+    Seed an empty database with the demo users and employees
     
-    # Create tables first
-    create_db_and_tables()
+    Existing data is never touched, so this is a read-only no-op once the
+    database has users. Tables must exist (see migrate_database).
     
+    Returns:
+        True if the database was seeded
+    """
     with Session(engine) as session:
         # Check if users already exist
         existing_user_statement = select(UserModel)
         existing_users = session.exec(existing_user_statement).first()
         
         if existing_users:
-            print("Database already seeded. Checking Admin...")
-            # Force update admin password to ensure access
-            admin_statement = select(UserModel).where(UserModel.email == "admin@example.com")
-            admin = session.exec(admin_statement).first()
-            if admin:
-                admin.password_hash = hash_password("admin123")
-                session.add(admin)
-                session.commit()
-                print("Admin password reset to 'admin123'")
-            return
+            print("Database already seeded.")
+            return False
         
         print("Seeding database...")
         
@@ -119,7 +168,195 @@ def seed_database():
         print("Admin: admin@example.com / admin123")
         print("HR: hr@example.com / hr123")
         print("Employee: employee@example.com / emp123")
+        return True
 
 
-if __name__ == "__main__":
+def reset_admin_password(password: str = "admin123") -> bool:
+    """
+    Reset the demo admin's password (recovery for a lost admin login)
+    
+    Returns:
+        True if the admin user exists and was updated
+    """
+    with sqlite_write_lock(), Session(engine) as session:
+        admin = session.exec(select(UserModel).where(UserModel.email == "admin@example.com")).first()
+        if admin is None:
+            return False
+        admin.password_hash = hash_password(password)
+        session.add(admin)
+        session.commit()
+        print(f"Admin password reset to '{password}'")
+        return True
+
+
+
+def _zipf_weights(count: int) -> List[float]:
+    """Cumulative weights where the n-th most common value appears ~1/n as often"""
+    return list(accumulate(1 / (rank + 1) for rank in range(count)))
+
+
+_FIRST_NAME_WEIGHTS = _zipf_weights(len(FIRST_NAMES))
+_LAST_NAME_WEIGHTS = _zipf_weights(len(LAST_NAMES))
+_DEPARTMENT_NAMES = [name for name, _ in DEPARTMENTS]
+_DEPARTMENT_WEIGHTS = list(accumulate(weight for _, weight in DEPARTMENTS))
+_ROLE_WEIGHTS = {
+    department: list(accumulate(weight for _, weight, _ in roles))
+    for department, roles in JOB_ROLES.items()
+}
+
+
+def _names(rng: random.Random, count: int) -> List[str]:
+    firsts = rng.choices(FIRST_NAMES, cum_weights=_FIRST_NAME_WEIGHTS, k=count)
+    lasts = rng.choices(LAST_NAMES, cum_weights=_LAST_NAME_WEIGHTS, k=count)
+    return [f"{first} {last}" for first, last in zip(firsts, lasts)]
+
+
+def _timestamps(rng: random.Random, now: datetime) -> tuple[datetime, datetime]:
+    """Hire date within the last ten years and a last update after it"""
+    created_at = now - timedelta(seconds=rng.randrange(10 * 365 * 86400))
+    updated_at = created_at + (now - created_at) * rng.random() ** 3
+    return created_at, updated_at
+
+
+def generate_employee_rows(rng: random.Random, count: int, now: datetime) -> List[Dict[str, Any]]:
+    """
+    Build `count` synthetic employee rows for a core insert
+    
+    Departments, roles and names follow skewed distributions; salaries are
+    log-normally spread around the role's base salary.
+    """
+    departments = rng.choices(_DEPARTMENT_NAMES, cum_weights=_DEPARTMENT_WEIGHTS, k=count)
+    rows = []
+    for name, department in zip(_names(rng, count), departments):
+        job_role, _, base_salary = rng.choices(JOB_ROLES[department], cum_weights=_ROLE_WEIGHTS[department])[0]
+        created_at, updated_at = _timestamps(rng, now)
+        rows.append({
+            "name": name,
+            "department": department,
+            "job_role": job_role,
+            "salary": round(base_salary * rng.lognormvariate(0, 0.15), 2),
+            "created_at": created_at,
+            "updated_at": updated_at,
+        })
+    return rows
+
+
+def generate_user_rows(
+    rng: random.Random,
+    count: int,
+    now: datetime,
+    start: int,
+    password_hash: str
+) -> List[Dict[str, Any]]:
+    """
+    Build `count` synthetic user rows with unique emails numbered from `start`
+    
+    All rows share one precomputed password hash; hashing millions of
+    passwords with a real KDF would take days.
+    """
+    roles = rng.choices(
+        [role for role, _ in USER_ROLES],
+        cum_weights=list(accumulate(weight for _, weight in USER_ROLES)),
+        k=count
+    )
+    rows = []
+    for offset, (name, role) in enumerate(zip(_names(rng, count), roles)):
+        created_at, updated_at = _timestamps(rng, now)
+        rows.append({
+            "name": name,
+            "email": f"{name.lower().replace(' ', '.')}.{start + offset}@synthetic.example.com",
+            "password_hash": password_hash,
+            "role": role,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        })
+    return rows
+
+
+def seed_synthetic_data(
+    employees: int,
+    users: int = 0,
+    seed: int = 42,
+    chunk_size: int = 10000,
+    bind: Engine = engine
+) -> Dict[str, Any]:
+    """
+    Bulk insert a large synthetic dataset
+    
+    Rows are generated with a seeded RNG (same seed, same data) and written
+    with executemany core inserts, one transaction per chunk. Synthetic
+    users log in with SYNTHETIC_PASSWORD.
+    
+    Args:
+        employees: Number of employees to generate
+        users: Number of users to generate
+        seed: RNG seed
+        chunk_size: Rows per insert/commit
+        bind: Engine to write to
+    
+    Returns:
+        Dict with row counts, elapsed seconds and rows per second
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    password_hash = hash_password(SYNTHETIC_PASSWORD) if users else ""
+    
+    with Session(bind) as session:
+        next_user = session.exec(select(func.count()).select_from(UserModel)).one()
+    
+    started = time.perf_counter()
+    for model, total in [(EmployeeModel, employees), (UserModel, users)]:
+        table_started = time.perf_counter()
+        for start in range(0, total, chunk_size):
+            count = min(chunk_size, total - start)
+            if model is EmployeeModel:
+                rows = generate_employee_rows(rng, count, now)
+            else:
+                rows = generate_user_rows(rng, count, now, next_user + start, password_hash)
+            with sqlite_write_lock(), bind.begin() as conn:
+                conn.execute(insert(model), rows)
+                if model is EmployeeModel:
+                    bump_table_version(conn, "employees")
+            
+            done = start + count
+            rate = done / (time.perf_counter() - table_started)
+            print(f"  {model.__tablename__}: {done:,}/{total:,} rows ({rate:,.0f} rows/s)", end="\r")
+        if total:
+            print()
+    
+    seconds = time.perf_counter() - started
+    return {
+        "employees": employees,
+        "users": users,
+        "seconds": round(seconds, 2),
+        "rows_per_second": round((employees + users) / seconds) if seconds else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the HRMS database")
+    parser.add_argument("--employees", type=int, default=0, help="Synthetic employees to generate")
+    parser.add_argument("--users", type=int, default=0, help="Synthetic users to generate")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for reproducible data")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per bulk insert")
+    parser.add_argument("--reset-admin-password", action="store_true", help="Reset admin@example.com to admin123")
+    args = parser.parse_args()
+    
+    if migrate_database():
+        print("Database schema migrated")
     seed_database()
+    if args.reset_admin_password:
+        reset_admin_password()
+    if args.employees or args.users:
+        print(f"Generating {args.employees:,} employees and {args.users:,} users (seed {args.seed})...")
+        stats = seed_synthetic_data(args.employees, args.users, args.seed, args.chunk_size)
+        print(
+            f"Inserted {stats['employees'] + stats['users']:,} rows in {stats['seconds']}s "
+            f"({stats['rows_per_second']:,} rows/s)"
+        )
+        if args.users:
+            print(f"Synthetic users log in with password '{SYNTHETIC_PASSWORD}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,297 @@
 """
 Employee service layer - Business logic for employee management
 """
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Literal, Iterable, Iterator
 from datetime import datetime, timezone
+from pydantic import ValidationError
+from sqlalchemy import func, tuple_, text, insert, update, delete
+from sqlalchemy.exc import IntegrityError
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session, select, or_, col
 
+from app.cache import create_cache
+from app.config import settings
+from app.database import (
+    bump_table_version, database_key, engine, employee_name_fts, get_table_version, has_search_index,
+    run_db, serialized_write, DbSession
+)
 from app.models.employee_model import EmployeeModel
 from app.models.user_model import UserModel
+from app.utils.bulk_io import BulkFormat, format_rows
+from app.utils.hash_executor import hash_executor
 from app.utils.hashing import get_password_hash
+from app.utils.metrics import timed
+from app.utils.pagination import encode_cursor, decode_cursor
 from app.schemas.employee_schema import (
     EmployeeCreate, 
     EmployeeUpdate, 
     EmployeeResponse,
-    EmployeeResponseNoSalary
+    EmployeeResponseNoSalary,
+    EmployeeStatsResponse,
+    GroupStats,
+    EmployeeImportResponse,
+    ImportRowError,
+    EmployeeBulkSelection,
+    EmployeeSort,
+    SortOrder
+)
+
+# The caches below are keyed by the database (primary or read replica) a value
+# was read from, so a lagging replica never answers for the primary. With a
+# shared CACHE_BACKEND a write in one worker clears them for every worker.
+
+# Exact list totals keyed by filter combination, cleared on every employee write
+_count_cache = create_cache(
+    "employee_counts",
+    maxsize=settings.EMPLOYEE_COUNT_CACHE_SIZE,
+    ttl=settings.EMPLOYEE_COUNT_CACHE_TTL
+)
+
+# Department/job role aggregates (with salaries), cleared on every employee write
+_stats_cache = create_cache(
+    "employee_stats", maxsize=2, ttl=settings.EMPLOYEE_STATS_CACHE_TTL, max_item_bytes=65536
 )
 
+# (version, changed_at) of the employees table, cleared on every employee write
+_version_cache = create_cache("employee_versions", maxsize=2, ttl=settings.EMPLOYEE_VERSION_CACHE_TTL)
+
+# employee id -> (table version, updated_at) as last read; only trusted while
+# the table is still at that version, so the TTL is just a memory backstop
+_updated_at_cache = create_cache(
+    "employee_updated_at", maxsize=settings.EMPLOYEE_VALIDATOR_CACHE_SIZE, ttl=3600, max_item_bytes=256
+)
+
+# ORDER BY columns per sort option, before the id tie-breaker. Each key is
+# backed by a composite index in EmployeeModel.__table_args__.
+_SORT_KEYS = {
+    "name": ("name",),
+    "department": ("department", "name"),
+    "job_role": ("job_role", "name"),
+    "salary": ("salary",),
+    "created_at": ("created_at",),
+}
+
+# JSON types of cursor values (created_at travels as an ISO string)
+_CURSOR_TYPES = {
+    "name": str,
+    "department": str,
+    "job_role": str,
+    "salary": (int, float),
+    "created_at": str,
+    "id": int,
+}
+
 
 class EmployeeService:
     """Service class for employee business logic"""
     
+    @staticmethod
+    def _name_search(session: Session, search: str):
+        """
+        Build the case-insensitive substring match on employee name.
+        
+        On SQLite, terms of 3+ characters go through the FTS5 trigram index
+        (its LIKE is index-assisted and case-insensitive). PostgreSQL answers
+        the ILIKE from the pg_trgm GIN index, so it needs no special path.
+        """
+        pattern = f"%{search}%"
+        bind = session.get_bind()
+        if len(search) >= 3 and has_search_index(bind):
+            return EmployeeModel.id.in_(
+                select(employee_name_fts.c.rowid).where(employee_name_fts.c.name.like(pattern))
+            )
+        return EmployeeModel.name.ilike(pattern)
+    
+    @staticmethod
+    def _apply_filters(
+        session: Session,
+        statement,
+        search: Optional[str] = None,
+        department: Optional[str] = None,
+        job_role: Optional[str] = None
+    ):
+        """Apply the list filters shared by the page, count and cursor queries"""
+        if search:
+            statement = statement.where(EmployeeService._name_search(session, search))
+        
+        if department:
+            statement = statement.where(EmployeeModel.department == department)
+        
+        if job_role:
+            statement = statement.where(EmployeeModel.job_role == job_role)
+        
+        return statement
+    
+    @staticmethod
+    def invalidate_caches() -> None:
+        """Drop cached employee data after a write"""
+        _count_cache.clear()
+        _stats_cache.clear()
+        _version_cache.clear()
+    
+    @staticmethod
+    def get_change_version(session: Session) -> tuple[int, Optional[datetime]]:
+        """
+        Current (version, changed_at) of the employees table.
+        
+        Every employee write bumps the version in its own transaction. The
+        value is cached for EMPLOYEE_VERSION_CACHE_TTL seconds and dropped on
+        writes: with the memory CACHE_BACKEND this worker's writes are seen at
+        once and other workers' within the TTL; shared backends see all at once.
+        
+        Args:
+            session: Database session
+        
+        Returns:
+            Tuple of (version, time of the last write in UTC or None)
+        """
+        key = database_key(session.get_bind())
+        version = _version_cache.get(key)
+        if version is None:
+            version = get_table_version(session, "employees")
+            _version_cache.set(key, version)
+        return version
+    
+    @staticmethod
+    def cached_updated_at(employee_id: int, version: int) -> Optional[datetime]:
+        """updated_at of an employee remembered at `version`, or None if unknown or stale"""
+        entry = _updated_at_cache.get(str(employee_id))
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+    
+    @staticmethod
+    def remember_updated_at(employee_id: int, version: int, updated_at: datetime) -> None:
+        """Record updated_at as read at `version` (read the version first)"""
+        _updated_at_cache.set(str(employee_id), (version, updated_at))
+    
+    @staticmethod
+    def _explain_statement(statement, dialect) -> tuple[str, Union[dict, tuple]]:
+        """
+        EXPLAIN (FORMAT JSON) of statement as driver SQL and parameters.
+        
+        Positional drivers (asyncpg's $1, $2...) take a tuple in bind order,
+        named ones (psycopg's %(name)s) a dict.
+        """
+        compiled = statement.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+        params = compiled.params
+        if dialect.positional:
+            params = tuple(params[name] for name in compiled.positiontup)
+        return f"EXPLAIN (FORMAT JSON) {compiled}", params
+    
+    @staticmethod
+    def _estimate_count(
+        session: Session,
+        search: Optional[str] = None,
+        department: Optional[str] = None,
+        job_role: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Cheap row count estimate from database statistics.
+        
+        PostgreSQL uses planner statistics (reltuples, or EXPLAIN rows for
+        filtered queries). SQLite has no statistics, so only the unfiltered
+        total is estimated, as max(id): an upper bound that ignores deleted
+        rows. Returns None when the backend has no usable estimate for the
+        given filters, in which case the caller falls back to COUNT(*).
+        """
+        dialect = session.get_bind().dialect
+        filtered = bool(search or department or job_role)
+        
+        if dialect.name == "postgresql":
+            if not filtered:
+                estimate = session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'employees'::regclass")
+                ).scalar()
+            else:
+                statement = EmployeeService._apply_filters(
+                    session, select(EmployeeModel.id), search, department, job_role
+                )
+                sql, params = EmployeeService._explain_statement(statement, dialect)
+                plan = session.connection().exec_driver_sql(sql, params).scalar()
+                estimate = plan[0]["Plan"]["Plan Rows"]
+            # reltuples is -1 until the table has been analyzed
+            return int(estimate) if estimate is not None and estimate >= 0 else None
+        
+        if dialect.name == "sqlite" and not filtered:
+            # Highest rowid is an index lookup and an upper bound on the row count
+            # (deleted ids still count); filtered queries get an exact COUNT(*)
+            return session.exec(select(func.max(EmployeeModel.id))).one() or 0
+        
+        return None
+    
+    @staticmethod
+    def count_employees(
+        session: Session,
+        search: Optional[str] = None,
+        department: Optional[str] = None,
+        job_role: Optional[str] = None,
+        estimated: bool = False
+    ) -> tuple[int, bool]:
+        """
+        Count employees matching the list filters.
+        
+        Exact counts are cached per filter combination until the next
+        employee write. In estimated mode a cached exact count is still
+        preferred, then the database estimate, then a real COUNT(*).
+        
+        Args:
+            session: Database session
+            search: Search query for name
+            department: Filter by department
+            job_role: Filter by job role
+            estimated: Whether an approximate count is acceptable
+        
+        Returns:
+            Tuple of (count, whether the count is an estimate)
+        """
+        cache_key = repr((database_key(session.get_bind()), search, department, job_role))
+        cached = _count_cache.get(cache_key)
+        if cached is not None:
+            return cached, False
+        
+        if estimated:
+            estimate = EmployeeService._estimate_count(session, search, department, job_role)
+            if estimate is not None:
+                return estimate, True
+        
+        count_statement = EmployeeService._apply_filters(
+            session, select(func.count()).select_from(EmployeeModel), search, department, job_role
+        )
+        total_count = session.exec(count_statement).one()
+        _count_cache.set(cache_key, total_count)
+        
+        return total_count, False
+    
+    @staticmethod
+    def _sort_keys(sort: Optional[EmployeeSort]) -> List[str]:
+        """Column names to order by for a sort option, ending with the id tie-breaker"""
+        return [*_SORT_KEYS.get(sort, ()), "id"]
+    
+    @staticmethod
+    def _order_by(statement, keys: List[str], order: SortOrder):
+        """Apply ORDER BY keys, all in the same direction so one index scan serves it"""
+        columns = [getattr(EmployeeModel, key) for key in keys]
+        return statement.order_by(*(column.desc() if order == "desc" else column for column in columns))
+    
+    @staticmethod
+    def _response_fields(include_salary: bool) -> List[str]:
+        """Response field names, which double as EmployeeModel column names"""
+        schema = EmployeeResponse if include_salary else EmployeeResponseNoSalary
+        return list(schema.model_fields)
+    
+    @staticmethod
+    def _select_response_rows(session: Session, statement, fields: List[str]) -> List[dict]:
+        """
+        Execute a column select built from _response_fields and return plain dicts.
+        
+        Skips ORM identity-map bookkeeping and per-row Pydantic models: the
+        rows already hold exactly the response fields, in order.
+        """
+        rows = session.exec(statement).all()
+        with timed("serialization"):
+            return [dict(zip(fields, row)) for row in rows]
+    
     @staticmethod
     def get_all_employees(
         session: Session,
@@ -27,8 +300,11 @@ class EmployeeService:
         job_role: Optional[str] = None,
         page: int = 1,
         limit: int = 10,
-        include_salary: bool = True
-    ) -> tuple[List[Union[EmployeeResponse, EmployeeResponseNoSalary]], int]:
+        include_salary: bool = True,
+        count_mode: Literal["exact", "estimated", "none"] = "exact",
+        sort: Optional[EmployeeSort] = None,
+        order: SortOrder = "asc"
+    ) -> tuple[List[dict], Optional[int], bool]:
         """
         Get all employees with optional filtering and pagination.
         
@@ -40,62 +316,230 @@ class EmployeeService:
             page: Page number (1-indexed)
             limit: Items per page
             include_salary: Whether to include salary in response
+            count_mode: "exact" (cached COUNT), "estimated" or "none" to skip the total
+            sort: Sort field (None = by id); ties are always broken by id
+            order: "asc" or "desc"
         
         Returns:
-            Tuple of (list of employees, total count)
+            Tuple of (employee dicts in EmployeeResponse/EmployeeResponseNoSalary shape,
+            total count or None, whether the total is an estimate)
         """
-        # Build query
-        statement = select(EmployeeModel)
+        # Build query over the response columns only
+        fields = EmployeeService._response_fields(include_salary)
+        statement = EmployeeService._apply_filters(
+            session, select(*[getattr(EmployeeModel, field) for field in fields]),
+            search, department, job_role
+        )
         
-        # Apply filters
-        if search:
-            statement = statement.where(
-                EmployeeModel.name.ilike(f"%{search}%")
+        # Get total count before pagination (skipped entirely when not requested)
+        total_count, is_estimate = None, False
+        if count_mode != "none":
+            total_count, is_estimate = EmployeeService.count_employees(
+                session, search, department, job_role,
+                estimated=count_mode == "estimated"
             )
         
-        if department:
-            statement = statement.where(EmployeeModel.department == department)
+        # Apply a total order, so offset pages neither overlap nor skip rows
+        statement = EmployeeService._order_by(statement, EmployeeService._sort_keys(sort), order)
         
-        if job_role:
-            statement = statement.where(EmployeeModel.job_role == job_role)
+        # Apply pagination
+        offset = (page - 1) * limit
+        statement = statement.offset(offset).limit(limit)
         
-        # Get total count before pagination (efficient COUNT query)
-        from sqlalchemy import func
-        count_statement = select(func.count()).select_from(EmployeeModel)
+        # Execute query
+        employees = EmployeeService._select_response_rows(session, statement, fields)
         
-        # Apply same filters to count query
-        if search:
-            count_statement = count_statement.where(
-                EmployeeModel.name.ilike(f"%{search}%")
+        return employees, total_count, is_estimate
+    
+    @staticmethod
+    def get_employees_by_cursor(
+        session: Session,
+        search: Optional[str] = None,
+        department: Optional[str] = None,
+        job_role: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        include_salary: bool = True,
+        sort: EmployeeSort = "name",
+        order: SortOrder = "asc"
+    ) -> tuple[List[dict], Optional[str]]:
+        """
+        Get employees with keyset (cursor) pagination.
+        
+        Rows are ordered by the sort key plus id and each page starts strictly
+        after the row encoded in the cursor, so deep pages cost the same as the
+        first one instead of scanning and discarding every earlier row like
+        OFFSET does. A cursor only continues the sort it was issued for.
+        
+        Args:
+            session: Database session
+            search: Search query for name
+            department: Filter by department
+            job_role: Filter by job role
+            cursor: Cursor from a previous page (None for the first page)
+            limit: Items per page
+            include_salary: Whether to include salary in response
+                (must be True to sort by salary)
+            sort: Sort field; ties are broken by id
+            order: "asc" or "desc"
+        
+        Returns:
+            Tuple of (employee dicts, cursor for the next page or None)
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        fields = EmployeeService._response_fields(include_salary)
+        statement = EmployeeService._apply_filters(
+            session, select(*[getattr(EmployeeModel, field) for field in fields]),
+            search, department, job_role
+        )
+        
+        keys = EmployeeService._sort_keys(sort)
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("order", "asc") != order:
+                raise ValueError("Invalid cursor")
+            if not all(isinstance(position.get(key), _CURSOR_TYPES[key]) for key in keys):
+                raise ValueError("Invalid cursor")
+            values = tuple(
+                datetime.fromisoformat(position[key]) if key == "created_at" else position[key]
+                for key in keys
             )
-        if department:
-            count_statement = count_statement.where(EmployeeModel.department == department)
-        if job_role:
-            count_statement = count_statement.where(EmployeeModel.job_role == job_role)
+            row = tuple_(*[getattr(EmployeeModel, key) for key in keys])
+            statement = statement.where(row < values if order == "desc" else row > values)
         
-        total_count = session.exec(count_statement).one()
+        # Fetch one extra row to know whether another page exists
+        statement = EmployeeService._order_by(statement, keys, order).limit(limit + 1)
+        employees = EmployeeService._select_response_rows(session, statement, fields)
         
-        # Apply pagination
-        offset = (page - 1) * limit
-        statement = statement.offset(offset).limit(limit)
+        next_cursor = None
+        if len(employees) > limit:
+            employees = employees[:limit]
+            last = employees[-1]
+            position = {key: last[key] for key in keys}
+            if order == "desc":
+                position["order"] = "desc"
+            next_cursor = encode_cursor(position)
         
-        # Execute query
-        employees = session.exec(statement).all()
+        return employees, next_cursor
+    
+    @staticmethod
+    def _group_stats(session: Session, column) -> List[GroupStats]:
+        """Run one GROUP BY aggregate over employees"""
+        statement = (
+            select(
+                column,
+                func.count(),
+                func.sum(EmployeeModel.salary),
+                func.avg(EmployeeModel.salary),
+                func.min(EmployeeModel.salary),
+                func.max(EmployeeModel.salary)
+            )
+            .group_by(column)
+            .order_by(column)
+        )
+        return [
+            GroupStats(
+                name=name,
+                headcount=headcount,
+                salary_sum=salary_sum,
+                salary_avg=round(salary_avg, 2),
+                salary_min=salary_min,
+                salary_max=salary_max
+            )
+            for name, headcount, salary_sum, salary_avg, salary_min, salary_max
+            in session.exec(statement).all()
+        ]
+    
+    @staticmethod
+    def get_employee_stats(
+        session: Session,
+        include_salary: bool = True
+    ) -> EmployeeStatsResponse:
+        """
+        Get headcount and salary aggregates per department and job role.
+        
+        Aggregates are computed with GROUP BY queries and cached until the
+        next employee write (or the cache TTL), then stripped of salary
+        fields for callers that may not see them.
+        
+        Args:
+            session: Database session
+            include_salary: Whether to include salary aggregates
+        
+        Returns:
+            Employee aggregates
+        """
+        key = database_key(session.get_bind())
+        stats = _stats_cache.get(key)
+        if stats is None:
+            departments = EmployeeService._group_stats(session, EmployeeModel.department)
+            stats = EmployeeStatsResponse(
+                total=sum(group.headcount for group in departments),
+                departments=departments,
+                job_roles=EmployeeService._group_stats(session, EmployeeModel.job_role)
+            )
+            _stats_cache.set(key, stats)
         
-        # Convert to response schemas
         if include_salary:
-            response_list = [EmployeeResponse.model_validate(emp) for emp in employees]
-        else:
-            response_list = [EmployeeResponseNoSalary.model_validate(emp) for emp in employees]
+            return stats
         
-        return response_list, total_count
+        return EmployeeStatsResponse(
+            total=stats.total,
+            departments=[GroupStats(name=g.name, headcount=g.headcount) for g in stats.departments],
+            job_roles=[GroupStats(name=g.name, headcount=g.headcount) for g in stats.job_roles]
+        )
+    
+    @staticmethod
+    def stream_employees(
+        search: Optional[str] = None,
+        department: Optional[str] = None,
+        job_role: Optional[str] = None,
+        include_salary: bool = True,
+        fmt: BulkFormat = "csv",
+        chunk_size: int = 1000
+    ) -> Iterator[str]:
+        """
+        Stream every matching employee as CSV or NDJSON text chunks.
+        
+        Only the response columns are selected and rows are pulled through a
+        server-side cursor (yield_per), so memory stays flat however many
+        rows match. The generator opens its own session because it outlives
+        the request handler.
+        
+        Args:
+            search: Search query for name
+            department: Filter by department
+            job_role: Filter by job role
+            include_salary: Whether to include salary (same fields as EmployeeResponseNoSalary otherwise)
+            fmt: "csv" or "ndjson"
+            chunk_size: Rows fetched and written per chunk
+        
+        Yields:
+            Chunks of formatted output
+        """
+        fields = EmployeeService._response_fields(include_salary)
+        columns = [getattr(EmployeeModel, field) for field in fields]
+        
+        with Session(engine) as session:
+            statement = EmployeeService._apply_filters(
+                session, select(*columns), search, department, job_role
+            ).order_by(EmployeeModel.id)
+            
+            result = session.execute(statement.execution_options(yield_per=chunk_size))
+            
+            if fmt == "csv":
+                yield format_rows([], fields, fmt, header=True)
+            for chunk in result.partitions():
+                yield format_rows(chunk, fields, fmt)
     
     @staticmethod
     def get_employee_by_id(
         session: Session,
         employee_id: int,
         include_salary: bool = True
-    ) -> Optional[Union[EmployeeResponse, EmployeeResponseNoSalary]]:
+    ) -> Optional[dict]:
         """
         Get a single employee by ID.
         
@@ -105,36 +549,77 @@ class EmployeeService:
             include_salary: Whether to include salary in response
         
         Returns:
-            Employee if found, None otherwise
+            Employee dict in EmployeeResponse/EmployeeResponseNoSalary shape if found, None otherwise
         """
-        employee = session.get(EmployeeModel, employee_id)
+        fields = EmployeeService._response_fields(include_salary)
+        statement = select(*[getattr(EmployeeModel, field) for field in fields]).where(
+            EmployeeModel.id == employee_id
+        )
+        employees = EmployeeService._select_response_rows(session, statement, fields)
         
-        if employee is None:
-            return None
+        return employees[0] if employees else None
+    
+    @staticmethod
+    def get_employees_by_ids(
+        session: Session,
+        ids: List[int],
+        include_salary: bool = True
+    ) -> tuple[List[dict], List[int]]:
+        """
+        Get many employees by ID with one `WHERE id IN (...)` query.
         
-        if include_salary:
-            return EmployeeResponse.model_validate(employee)
-        else:
-            return EmployeeResponseNoSalary.model_validate(employee)
+        Args:
+            session: Database session
+            ids: Employee IDs (duplicates are fetched and returned once)
+            include_salary: Whether to include salary in response
+        
+        Returns:
+            Tuple of (employee dicts in the order of `ids`, ids that do not exist)
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        fields = EmployeeService._response_fields(include_salary)
+        statement = select(*[getattr(EmployeeModel, field) for field in fields]).where(
+            col(EmployeeModel.id).in_(unique_ids)
+        )
+        found = {
+            employee["id"]: employee
+            for employee in EmployeeService._select_response_rows(session, statement, fields)
+        }
+        
+        employees = [found[employee_id] for employee_id in unique_ids if employee_id in found]
+        missing = [employee_id for employee_id in unique_ids if employee_id not in found]
+        return employees, missing
     
     @staticmethod
     def create_employee(
         session: Session,
-        employee_data: EmployeeCreate
+        employee_data: EmployeeCreate,
+        password_hash: Optional[str] = None
     ) -> EmployeeResponse:
         """
         Create a new employee.
         
+        The password is hashed before the write lock is taken, so other
+        writers never wait behind a hash.
+        
         Args:
             session: Database session
             employee_data: Employee creation data
+            password_hash: Precomputed hash of employee_data.password
+                (hashed on the bounded hashing pool when omitted)
         
         Returns:
             Created employee
         """
+        if password_hash is None:
+            password_hash = hash_executor.run(get_password_hash, employee_data.password)
+        return EmployeeService._insert_employee(session, employee_data, password_hash)
+    
+    @staticmethod
+    @serialized_write
+    def _insert_employee(session: Session, employee_data: EmployeeCreate, password_hash: str) -> EmployeeResponse:
+        """Insert the user account and employee record of create_employee"""
         # 1. Create User account first
-        password_hash = get_password_hash(employee_data.password)
-        
         user = UserModel(
             name=employee_data.name,
             email=employee_data.email,
@@ -154,12 +639,15 @@ class EmployeeService:
         )
         
         session.add(employee)
+        bump_table_version(session, "employees")
         session.commit()
+        EmployeeService.invalidate_caches()
         session.refresh(employee)
         
         return EmployeeResponse.model_validate(employee)
     
     @staticmethod
+    @serialized_write
     def update_employee(
         session: Session,
         employee_id: int,
@@ -190,12 +678,15 @@ class EmployeeService:
         employee.updated_at = datetime.now(timezone.utc)
         
         session.add(employee)
+        bump_table_version(session, "employees")
         session.commit()
+        EmployeeService.invalidate_caches()
         session.refresh(employee)
         
         return EmployeeResponse.model_validate(employee)
     
     @staticmethod
+    @serialized_write
     def delete_employee(
         session: Session,
         employee_id: int
@@ -216,6 +707,321 @@ class EmployeeService:
             return False
         
         session.delete(employee)
+        bump_table_version(session, "employees")
         session.commit()
+        EmployeeService.invalidate_caches()
         
         return True
+    
+    @staticmethod
+    def _bulk_conditions(selection: EmployeeBulkSelection) -> list:
+        """WHERE clauses for a bulk selection (all must match)"""
+        conditions = []
+        if selection.ids is not None:
+            conditions.append(col(EmployeeModel.id).in_(selection.ids))
+        if selection.department is not None:
+            conditions.append(EmployeeModel.department == selection.department)
+        if selection.job_role is not None:
+            conditions.append(EmployeeModel.job_role == selection.job_role)
+        return conditions
+    
+    @staticmethod
+    @serialized_write
+    def bulk_update_employees(
+        session: Session,
+        selection: EmployeeBulkSelection,
+        employee_data: EmployeeUpdate
+    ) -> int:
+        """
+        Apply the same patch to many employees with one set-based UPDATE.
+        
+        Args:
+            session: Database session
+            selection: Ids and/or department/job_role filter
+            employee_data: Fields to set (only provided fields are updated)
+        
+        Returns:
+            Number of rows updated
+        """
+        update_data = employee_data.model_dump(exclude_unset=True)
+        if not update_data:
+            return 0
+        
+        # Update timestamp
+        update_data["updated_at"] = datetime.now(timezone.utc)
+        
+        statement = (
+            update(EmployeeModel)
+            .where(*EmployeeService._bulk_conditions(selection))
+            .values(**update_data)
+            .execution_options(synchronize_session=False)
+        )
+        affected = session.execute(statement).rowcount
+        if affected:
+            bump_table_version(session, "employees")
+        session.commit()
+        EmployeeService.invalidate_caches()
+        
+        return affected
+    
+    @staticmethod
+    @serialized_write
+    def bulk_delete_employees(
+        session: Session,
+        selection: EmployeeBulkSelection
+    ) -> int:
+        """
+        Delete many employees with one set-based DELETE.
+        
+        Args:
+            session: Database session
+            selection: Ids and/or department/job_role filter
+        
+        Returns:
+            Number of rows deleted
+        """
+        statement = (
+            delete(EmployeeModel)
+            .where(*EmployeeService._bulk_conditions(selection))
+            .execution_options(synchronize_session=False)
+        )
+        affected = session.execute(statement).rowcount
+        if affected:
+            bump_table_version(session, "employees")
+        session.commit()
+        EmployeeService.invalidate_caches()
+        
+        return affected
+    
+    @staticmethod
+    def _insert_import_batch(
+        session: Session,
+        batch: List[tuple[int, EmployeeCreate, str]],
+        errors: List[ImportRowError]
+    ) -> int:
+        """
+        Insert one batch of validated rows with two executemany INSERTs.
+        
+        If the batch hits a constraint (e.g. an email registered since the
+        pre-check), it is retried row by row inside savepoints so only the
+        offending rows are reported.
+        
+        Returns:
+            Number of rows inserted
+        """
+        now = datetime.now(timezone.utc)
+        users = [
+            {"name": data.name, "email": data.email, "password_hash": password_hash,
+             "role": data.role, "created_at": now, "updated_at": now}
+            for _, data, password_hash in batch
+        ]
+        employees = [
+            {"name": data.name, "department": data.department, "job_role": data.job_role,
+             "salary": data.salary, "created_at": now, "updated_at": now}
+            for _, data, _ in batch
+        ]
+        
+        try:
+            with session.begin_nested():
+                session.execute(insert(UserModel), users)
+                session.execute(insert(EmployeeModel), employees)
+            return len(batch)
+        except IntegrityError:
+            pass
+        
+        inserted = 0
+        for (row, data, _), user, employee in zip(batch, users, employees):
+            try:
+                with session.begin_nested():
+                    session.execute(insert(UserModel), [user])
+                    session.execute(insert(EmployeeModel), [employee])
+                inserted += 1
+            except IntegrityError:
+                errors.append(ImportRowError(row=row, email=data.email, error="Email already registered"))
+        return inserted
+    
+    @staticmethod
+    def _validate_import_rows(
+        rows: Iterable[tuple[int, Union[dict, ValueError]]],
+        allowed_roles: Iterable[str]
+    ) -> tuple[int, List[tuple[int, EmployeeCreate]], List[ImportRowError]]:
+        """
+        Validate uploaded rows against EmployeeCreate and the caller's roles.
+        
+        Returns:
+            Tuple of (rows seen, valid (row, data) pairs, errors of the rest)
+        """
+        allowed_roles = set(allowed_roles)
+        errors: List[ImportRowError] = []
+        valid: List[tuple[int, EmployeeCreate]] = []
+        seen_emails = set()
+        total_rows = 0
+        
+        for row, record in rows:
+            total_rows += 1
+            if isinstance(record, ValueError):
+                errors.append(ImportRowError(row=row, error=str(record)))
+                continue
+            try:
+                data = EmployeeCreate.model_validate(record)
+            except ValidationError as exc:
+                first = exc.errors()[0]
+                field = ".".join(str(part) for part in first["loc"])
+                errors.append(ImportRowError(row=row, email=record.get("email"), error=f"{field}: {first['msg']}"))
+                continue
+            if data.role not in allowed_roles:
+                errors.append(ImportRowError(row=row, email=data.email, error=f"Not allowed to create role '{data.role}'"))
+                continue
+            if data.email in seen_emails:
+                errors.append(ImportRowError(row=row, email=data.email, error="Duplicate email in upload"))
+                continue
+            seen_emails.add(data.email)
+            valid.append((row, data))
+        
+        return total_rows, valid, errors
+    
+    @staticmethod
+    def _registered_emails(session: Session, emails: List[str]) -> set:
+        """Which of emails already belong to a user"""
+        return set(session.exec(select(UserModel.email).where(col(UserModel.email).in_(emails))).all())
+    
+    @staticmethod
+    @serialized_write
+    def _commit_import_batch(
+        session: Session,
+        batch: List[tuple[int, EmployeeCreate, str]],
+        errors: List[ImportRowError]
+    ) -> int:
+        """Insert and commit one batch of hashed rows; returns the number inserted"""
+        inserted = EmployeeService._insert_import_batch(session, batch, errors)
+        if inserted:
+            bump_table_version(session, "employees")
+        session.commit()
+        return inserted
+    
+    # Async versions for the async request path. Each runs the sync method
+    # through run_db, so the same logic serves Session and AsyncSession.
+    
+    @staticmethod
+    async def get_all_employees_async(session: DbSession, **kwargs):
+        """Async version of get_all_employees"""
+        return await run_db(session, EmployeeService.get_all_employees, **kwargs)
+    
+    @staticmethod
+    async def get_employees_by_cursor_async(session: DbSession, **kwargs):
+        """Async version of get_employees_by_cursor"""
+        return await run_db(session, EmployeeService.get_employees_by_cursor, **kwargs)
+    
+    @staticmethod
+    async def get_employee_stats_async(session: DbSession, **kwargs):
+        """Async version of get_employee_stats"""
+        return await run_db(session, EmployeeService.get_employee_stats, **kwargs)
+    
+    @staticmethod
+    async def get_change_version_async(session: DbSession):
+        """Async version of get_change_version (no database hop while cached)"""
+        version = _version_cache.get(database_key(session.get_bind()))
+        if version is not None:
+            return version
+        return await run_db(session, EmployeeService.get_change_version)
+    
+    @staticmethod
+    async def get_employee_by_id_async(session: DbSession, **kwargs):
+        """Async version of get_employee_by_id"""
+        return await run_db(session, EmployeeService.get_employee_by_id, **kwargs)
+    
+    @staticmethod
+    async def get_employees_by_ids_async(session: DbSession, **kwargs):
+        """Async version of get_employees_by_ids"""
+        return await run_db(session, EmployeeService.get_employees_by_ids, **kwargs)
+    
+    @staticmethod
+    async def create_employee_async(session: DbSession, employee_data: EmployeeCreate):
+        """Async version of create_employee (hashes before taking the write path)"""
+        password_hash = await hash_executor.run_async(get_password_hash, employee_data.password)
+        return await run_db(session, EmployeeService._insert_employee, employee_data, password_hash)
+    
+    @staticmethod
+    async def update_employee_async(session: DbSession, **kwargs):
+        """Async version of update_employee"""
+        return await run_db(session, EmployeeService.update_employee, **kwargs)
+    
+    @staticmethod
+    async def delete_employee_async(session: DbSession, **kwargs):
+        """Async version of delete_employee"""
+        return await run_db(session, EmployeeService.delete_employee, **kwargs)
+    
+    @staticmethod
+    async def bulk_update_employees_async(session: DbSession, **kwargs):
+        """Async version of bulk_update_employees"""
+        return await run_db(session, EmployeeService.bulk_update_employees, **kwargs)
+    
+    @staticmethod
+    async def bulk_delete_employees_async(session: DbSession, **kwargs):
+        """Async version of bulk_delete_employees"""
+        return await run_db(session, EmployeeService.bulk_delete_employees, **kwargs)
+    
+    @staticmethod
+    async def import_employees_async(
+        session: DbSession,
+        rows: Iterable[tuple[int, Union[dict, ValueError]]],
+        allowed_roles: Iterable[str],
+        batch_size: int = 1000
+    ) -> EmployeeImportResponse:
+        """
+        Bulk import employees (and their user accounts).
+        
+        Rows are validated against EmployeeCreate, checked for duplicate
+        emails, hashed on the shared hash executor and inserted with executemany in
+        batches of `batch_size`, each committed on its own. Bad rows are
+        reported and skipped; they never abort the rest of the import.
+        
+        Validation and hashing run off the event loop and only the per-batch
+        queries go through run_db, so with an AsyncSession the event loop
+        keeps serving other requests for the whole import.
+        
+        Args:
+            session: Database session
+            rows: (row number, record dict or parse error) pairs
+            allowed_roles: Roles the caller may assign
+            batch_size: Rows per INSERT batch / commit
+        
+        Returns:
+            Import summary with per-row errors
+        """
+        # 1. Validate every row
+        total_rows, valid, errors = await run_in_threadpool(
+            EmployeeService._validate_import_rows, rows, allowed_roles
+        )
+        
+        # 2. Insert in batches
+        imported = 0
+        for start in range(0, len(valid), batch_size):
+            chunk = valid[start:start + batch_size]
+            
+            existing = await run_db(
+                session, EmployeeService._registered_emails, [data.email for _, data in chunk]
+            )
+            for row, data in chunk:
+                if data.email in existing:
+                    errors.append(ImportRowError(row=row, email=data.email, error="Email already registered"))
+            chunk = [(row, data) for row, data in chunk if data.email not in existing]
+            
+            # Same admission control as logins, IMPORT_HASH_WORKERS at a time
+            hashes = await hash_executor.map_async(
+                get_password_hash, [data.password for _, data in chunk], settings.IMPORT_HASH_WORKERS
+            )
+            batch = [(row, data, password_hash) for (row, data), password_hash in zip(chunk, hashes)]
+            
+            imported += await run_db(session, EmployeeService._commit_import_batch, batch, errors)
+        
+        if imported:
+            EmployeeService.invalidate_caches()
+        
+        errors.sort(key=lambda error: error.row)
+        return EmployeeImportResponse(
+            total_rows=total_rows,
+            imported=imported,
+            failed=len(errors),
+            errors=errors
+        )
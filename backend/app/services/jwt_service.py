@@ -1,10 +1,23 @@
 """
 JWT token generation and validation service
 """
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 import jwt
 from app.config import settings
+from app.utils.cache import TTLCache
+
+# Verified payloads keyed by token digest; each entry expires with its token.
+# Always per worker (not CACHE_BACKEND): it saves an HMAC check, which is
+# cheaper than a round trip to a shared cache.
+_token_cache = TTLCache(maxsize=settings.JWT_CACHE_SIZE)
+
+
+def _token_digest(token: str) -> bytes:
+    """Fixed-size cache key for a token"""
+    return hashlib.sha256(token.encode()).digest()
 
 
 def create_access_token(user_id: int, role: str) -> str:
@@ -39,20 +52,51 @@ def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and validate a JWT access token
     
+    Verified payloads are cached until the token's own expiry, so a token
+    reused across requests is only verified once per worker.
+    
     Args:
         token: JWT token string
     
     Returns:
         Decoded payload dict if valid, None if invalid or expired
     """
+    digest = _token_digest(token)
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        return dict(cached)
+    
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        _token_cache.set(digest, dict(payload), ttl=remaining)
+    
+    return payload
+
+
+def evict_access_token(token: str) -> None:
+    """
+    Remove a token from the verified-token cache.
+    
+    Call this when a token is revoked so the next request re-verifies it
+    instead of being answered from the cache.
+    
+    Args:
+        token: JWT token string
+    """
+    _token_cache.delete(_token_digest(token))
+
+
+def clear_token_cache() -> None:
+    """Drop every cached token (e.g. after rotating JWT_SECRET_KEY)"""
+    _token_cache.clear()
@@ -0,0 +1,95 @@
+"""
+CSV / NDJSON parsing helpers for bulk endpoints
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, Literal, Sequence, Union
+
+BulkFormat = Literal["csv", "ndjson"]
+
+
+def detect_format(content_type: str) -> BulkFormat:
+    """Pick the bulk format from a Content-Type header (CSV unless it says JSON)"""
+    return "ndjson" if "json" in (content_type or "").lower() else "csv"
+
+
+def parse_rows(content: bytes, fmt: BulkFormat) -> Iterator[tuple[int, Union[dict, ValueError]]]:
+    """
+    Parse an uploaded CSV (with header row) or NDJSON document.
+    
+    Yields (row number, dict) per record, or (row number, ValueError) for a
+    record that could not be parsed, so one bad line never aborts the rest.
+    Row numbers are 1-based and do not count the CSV header or blank lines.
+    
+    Raises:
+        ValueError: If the document is not valid UTF-8
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ValueError("Upload must be UTF-8 encoded") from exc
+    
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for number, record in enumerate(reader, start=1):
+            if None in record:
+                yield number, ValueError("Row has more columns than the header")
+            else:
+                # Empty cells mean "use the default", like a missing JSON key
+                yield number, {
+                    key.strip(): value.strip()
+                    for key, value in record.items()
+                    if key and value and value.strip()
+                }
+        return
+    
+    number = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, ValueError(f"Invalid JSON: {exc.msg}")
+            continue
+        if not isinstance(record, dict):
+            yield number, ValueError("Each line must be a JSON object")
+        else:
+            yield number, record
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def format_rows(rows: Iterable[Sequence], fields: list[str], fmt: BulkFormat, header: bool = False) -> str:
+    """
+    Render a chunk of result rows as CSV lines or NDJSON objects.
+    
+    Args:
+        rows: Value tuples in the same order as fields
+        fields: Column names
+        fmt: Output format
+        header: Whether to start with the CSV header row
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if header:
+            writer.writerow(fields)
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        return buffer.getvalue()
+    
+    return "".join(
+        json.dumps(dict(zip(fields, row)), default=_json_default, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
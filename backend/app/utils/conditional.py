@@ -0,0 +1,82 @@
+"""
+Conditional GET helpers (ETag / Last-Modified validators and 304 responses)
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Mapping, Optional
+from starlette.responses import Response
+
+
+@dataclass(frozen=True, slots=True)
+class Validators:
+    """ETag and Last-Modified of one representation of a resource"""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def build(cls, *parts: Any, last_modified: Optional[datetime] = None) -> "Validators":
+        """
+        Derive an opaque strong ETag from everything the body depends on
+
+        Args:
+            parts: Values that change whenever the body does (row timestamps,
+                table versions, the caller's salary visibility, the query)
+            last_modified: Time of the last change to the body; naive values
+                (SQLite keeps no offset) are taken as UTC
+        """
+        digest = hashlib.blake2b(repr(parts).encode(), digest_size=10).hexdigest()
+        if last_modified is not None:
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            else:
+                last_modified = last_modified.astimezone(timezone.utc)
+        return cls(etag=f'"{digest}"', last_modified=last_modified)
+
+    def headers(self) -> dict[str, str]:
+        """
+        Validator headers for 200 and 304 responses
+
+        Responses differ per caller (salary visibility), so they are marked
+        private and vary on Authorization; no-cache makes browsers
+        revalidate on every navigation instead of reusing a stale copy.
+        """
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "private, no-cache",
+            "Vary": "Authorization",
+        }
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.astimezone(timezone.utc), usegmt=True)
+        return headers
+
+    def not_modified(self, request_headers: Mapping[str, str]) -> bool:
+        """
+        Whether the client's cached copy is current (RFC 9110 section 13.2.2)
+
+        If-None-Match wins when present (weak comparison, "*" matches);
+        otherwise If-Modified-Since is compared at one-second resolution.
+        """
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return self.etag in candidates
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return self.last_modified.replace(microsecond=0) <= since
+
+    def not_modified_response(self) -> Response:
+        """Empty 304 carrying the validators"""
+        return Response(status_code=304, headers=self.headers())
@@ -0,0 +1,217 @@
+"""
+Bounded executor for password hashing
+
+Password hashing is deliberately slow CPU work. Running it inline blocks
+request threads (or the event loop), so hashes run on a dedicated pool
+behind an admission queue: at most HASH_WORKERS run at once, at most
+HASH_QUEUE_SIZE more wait, and anything beyond that waits up to
+HASH_QUEUE_TIMEOUT seconds before being turned away with 503. Login
+latency under a burst is then bounded instead of growing without limit.
+
+Sync and async callers share one admission counter. Async callers wait on
+a future, so waiting costs no thread (request threads stay free for other
+endpoints); sync callers wait on an event.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, TypeVar
+from fastapi import HTTPException, status
+from app.config import settings
+
+T = TypeVar("T")
+
+
+class _Waiter:
+    """A caller queued for a slot: a thread (event) or a coroutine (loop and future)"""
+
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+    def wake(self) -> None:
+        """Tell the waiter it holds a slot (raises RuntimeError if its loop is closed)"""
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class Admission:
+    """
+    Counting semaphore shared by threads and event loops.
+    
+    Slots are handed to waiters in arrival order on release, so sync and
+    async callers together never hold more than `capacity` slots.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def _take_free_slot(self) -> bool:
+        """Take a slot if one is free and nobody queues ahead (call with the lock held)"""
+        if self.in_use < self.capacity and not self._waiters:
+            self.in_use += 1
+            return True
+        return False
+
+    def acquire(self, timeout: Optional[float]) -> bool:
+        """Wait up to timeout seconds (None = forever) for a slot; False if none came"""
+        with self._lock:
+            if self._take_free_slot():
+                return True
+            waiter = _Waiter(event=threading.Event())
+            self._waiters.append(waiter)
+        waiter.event.wait(timeout)
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+            return waiter.granted
+
+    async def acquire_async(self, timeout: Optional[float]) -> bool:
+        """Like acquire, without blocking the event loop; safe to cancel"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._take_free_slot():
+                return True
+            waiter = _Waiter(loop=loop, future=loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            # Granted just as we were cancelled: pass the slot on
+            self.release()
+            raise
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+            return waiter.granted
+
+    def release(self) -> None:
+        """Hand the slot to the longest waiter, or free it"""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.wake()
+                except RuntimeError:  # its event loop is gone
+                    continue
+                waiter.granted = True
+                return
+            self.in_use -= 1
+
+
+class HashExecutor:
+    """Thread or process pool with an admission limit in front of it"""
+
+    def __init__(self, kind: str, workers: int, queue_size: int, timeout: float):
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.capacity = self.workers + max(0, queue_size)
+        self._admission = Admission(self.capacity)
+        self._executor: Optional[Executor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        """Create the pool lazily, and again after a fork (gunicorn workers)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hash")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry",
+            headers={"Retry-After": "1"}
+        )
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(*args) on the pool from sync code and wait for the result.
+        
+        Raises:
+            HTTPException: 503 if no slot frees up within the queue timeout
+        """
+        if not self._admission.acquire(self.timeout):
+            raise self._busy()
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._admission.release()
+
+    async def _run_admitted(self, fn: Callable[..., T], args: tuple, timeout: Optional[float]) -> T:
+        """Wait for an async slot (up to timeout; None = as long as it takes), then run on the pool"""
+        if not await self._admission.acquire_async(timeout):
+            raise self._busy()
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._admission.release()
+
+    async def run_async(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(*args) on the pool without blocking the event loop.
+        
+        Raises:
+            HTTPException: 503 if no slot frees up within the queue timeout
+        """
+        return await self._run_admitted(fn, args, self.timeout)
+
+    async def map_async(self, fn: Callable[..., T], items: Iterable, concurrency: int) -> List[T]:
+        """
+        fn(item) for every item, at most `concurrency` in flight.
+        
+        For bulk work such as imports: each call is admitted like run_async,
+        so it queues behind logins instead of crowding them out, but it
+        waits for a slot as long as it takes rather than failing with 503.
+        """
+        limit = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(item):
+            async with limit:
+                return await self._run_admitted(fn, (item,), None)
+
+        return list(await asyncio.gather(*(run_one(item) for item in items)))
+
+    def shutdown(self) -> None:
+        """Stop the pool (called on application shutdown)"""
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_executor = HashExecutor(
+    kind=settings.HASH_EXECUTOR,
+    workers=settings.HASH_WORKERS,
+    queue_size=settings.HASH_QUEUE_SIZE,
+    timeout=settings.HASH_QUEUE_TIMEOUT
+)
@@ -1,38 +1,207 @@
 """
-Password hashing utilities using hashlib with salting
+Password hashing utilities with a versioned, tunable KDF
+
+Stored hashes identify their own scheme and cost, so the configured
+scheme can change without breaking existing logins:
+- bcrypt:  $2b$<rounds>$...                      (bcrypt library)
+- scrypt:  $scrypt$ln=<log2 N>,r=<r>,p=<p>$<salt>$<hash>   (hashlib)
+- argon2:  $argon2id$v=19$m=<KiB>,t=<t>,p=<p>$... (argon2-cffi)
+- legacy:  <salt>$<sha256>                        (verify only)
+
+needs_rehash() reports hashes that use another scheme or cost than the
+current settings; the login endpoint upgrades them transparently.
 """
+import base64
 import hashlib
+import hmac
 import secrets
+import time
+from app.config import settings
+
+# bcrypt ignores everything past 72 bytes; newer releases raise instead
+BCRYPT_MAX_BYTES = 72
+
+# Hash of a random password per scheme and cost, verified for unknown emails
+_dummy_hashes: dict = {}
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _argon2_hasher(time_cost: int = None, memory_cost: int = None, parallelism: int = None):
+    """argon2-cffi PasswordHasher for the given (or configured) cost"""
+    try:
+        from argon2 import PasswordHasher
+    except ImportError as exc:
+        raise RuntimeError("PASSWORD_HASH_SCHEME=argon2 requires the argon2-cffi package") from exc
+    return PasswordHasher(
+        time_cost=time_cost or settings.ARGON2_TIME_COST,
+        memory_cost=memory_cost or settings.ARGON2_MEMORY_COST,
+        parallelism=parallelism or settings.ARGON2_PARALLELISM
+    )
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=2 ** log_n, r=r, p=p,
+        maxmem=256 * r * (2 ** log_n) + 1024 * 1024, dklen=32
+    )
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, scheme: str = None, **cost) -> str:
     """
-    Hash a plain text password with a random salt
-    
-    Returns: salt$hash format
+    Hash a plain text password with the configured KDF
+
+    Args:
+        password: Plain text password
+        scheme: Override PASSWORD_HASH_SCHEME (bcrypt, scrypt or argon2)
+        **cost: Override the scheme's cost settings (rounds / log_n, r, p /
+            time_cost, memory_cost, parallelism)
+
+    Returns: Self-describing hash string (see module docstring)
     """
-    salt = secrets.token_hex(16)
-    pwd_hash = hashlib.sha256(f"{salt}{password}".encode()).hexdigest()
-    return f"{salt}${pwd_hash}"
+    scheme = scheme or settings.PASSWORD_HASH_SCHEME
+
+    if scheme == "bcrypt":
+        import bcrypt
+        rounds = cost.get("rounds", settings.BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode()[:BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds)).decode()
+
+    if scheme == "scrypt":
+        log_n = cost.get("log_n", settings.SCRYPT_LOG_N)
+        r = cost.get("r", settings.SCRYPT_R)
+        p = cost.get("p", settings.SCRYPT_P)
+        salt = secrets.token_bytes(16)
+        digest = _scrypt(password, salt, log_n, r, p)
+        return f"$scrypt$ln={log_n},r={r},p={p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    if scheme == "argon2":
+        return _argon2_hasher(**cost).hash(password)
+
+    raise ValueError(f"Unknown password hash scheme: {scheme}")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain text password against a hashed password
-    
+
     Args:
         plain_password: Plain text password to verify
-        hashed_password: Stored hash in format "salt$hash"
-    
+        hashed_password: Stored hash in any supported format
+
     Returns:
         True if password matches, False otherwise
     """
     try:
+        if hashed_password.startswith("$2"):
+            import bcrypt
+            return bcrypt.checkpw(plain_password.encode()[:BCRYPT_MAX_BYTES], hashed_password.encode())
+
+        if hashed_password.startswith("$scrypt$"):
+            _, _, params, salt, digest = hashed_password.split("$")
+            values = dict(item.split("=") for item in params.split(","))
+            computed = _scrypt(
+                plain_password, _b64decode(salt),
+                int(values["ln"]), int(values["r"]), int(values["p"])
+            )
+            return hmac.compare_digest(computed, _b64decode(digest))
+
+        if hashed_password.startswith("$argon2"):
+            from argon2.exceptions import VerificationError, InvalidHashError
+            try:
+                return _argon2_hasher().verify(hashed_password, plain_password)
+            except (VerificationError, InvalidHashError):
+                return False
+
+        # Legacy single-round SHA-256 "salt$hash"
         salt, pwd_hash = hashed_password.split("$")
         computed_hash = hashlib.sha256(f"{salt}{plain_password}".encode()).hexdigest()
-        return computed_hash == pwd_hash
-    except (ValueError, AttributeError):
+        return hmac.compare_digest(computed_hash, pwd_hash)
+    except (ValueError, AttributeError, KeyError):
         return False
 
+
+def verify_unknown_user(plain_password: str) -> bool:
+    """
+    Do the work of a failed verify for an email that has no account
+
+    Verifies against a hash of a random password with the configured scheme
+    and cost, so the response time does not reveal whether an email is
+    registered.
+
+    Returns:
+        False, always
+    """
+    key = (
+        settings.PASSWORD_HASH_SCHEME, settings.BCRYPT_ROUNDS, settings.SCRYPT_LOG_N, settings.SCRYPT_R,
+        settings.SCRYPT_P, settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM
+    )
+    dummy_hash = _dummy_hashes.get(key)
+    if dummy_hash is None:
+        dummy_hash = _dummy_hashes[key] = hash_password(secrets.token_urlsafe(16))
+    verify_password(plain_password, dummy_hash)
+    return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Whether a stored hash should be replaced after a successful login
+
+    True for legacy hashes and for hashes whose scheme or cost differs
+    from the current settings.
+    """
+    scheme = settings.PASSWORD_HASH_SCHEME
+
+    if hashed_password.startswith("$2"):
+        return scheme != "bcrypt" or hashed_password[4:6] != f"{settings.BCRYPT_ROUNDS:02d}"
+
+    if hashed_password.startswith("$scrypt$"):
+        expected = f"ln={settings.SCRYPT_LOG_N},r={settings.SCRYPT_R},p={settings.SCRYPT_P}"
+        return scheme != "scrypt" or hashed_password.split("$")[2] != expected
+
+    if hashed_password.startswith("$argon2"):
+        return scheme != "argon2" or _argon2_hasher().check_needs_rehash(hashed_password)
+
+    return True
+
+
+def calibrate(scheme: str, target_seconds: float) -> dict:
+    """
+    Find the cheapest cost for a scheme whose verify time reaches the target
+
+    Raises the scheme's main cost knob (bcrypt rounds, scrypt log2 N,
+    argon2 time cost) until one verify on this machine takes at least
+    target_seconds.
+
+    Returns:
+        Dict with the chosen cost settings and the measured seconds
+    """
+    def measure(**cost) -> float:
+        hashed = hash_password("calibration-password", scheme=scheme, **cost)
+        started = time.perf_counter()
+        verify_password("calibration-password", hashed)
+        return time.perf_counter() - started
+
+    if scheme == "bcrypt":
+        knob, value, limit, to_settings = "rounds", 4, 20, lambda v: {"BCRYPT_ROUNDS": v}
+    elif scheme == "scrypt":
+        knob, value, limit, to_settings = "log_n", 10, 20, lambda v: {"SCRYPT_LOG_N": v}
+    elif scheme == "argon2":
+        knob, value, limit, to_settings = "time_cost", 1, 50, lambda v: {"ARGON2_TIME_COST": v}
+    else:
+        raise ValueError(f"Unknown password hash scheme: {scheme}")
+
+    elapsed = measure(**{knob: value})
+    while elapsed < target_seconds and value < limit:
+        value += 1
+        elapsed = measure(**{knob: value})
+
+    return {**to_settings(value), "verify_seconds": elapsed}
+
 # Alias for compatibility with other services
 get_password_hash = hash_password
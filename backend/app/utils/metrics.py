@@ -0,0 +1,191 @@
+"""
+Lightweight in-process metrics primitives
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Optional
+from app.config import settings
+
+def is_metrics_token(token: str) -> bool:
+    """Whether a bearer token is the configured METRICS_TOKEN"""
+    return bool(settings.METRICS_TOKEN) and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode())
+
+
+# Latency buckets in seconds (Prometheus-style upper bounds)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# SQL statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.sum = 0.0
+        self.count = 0
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation"""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        with self._lock:
+            counts = list(self._counts)
+        pairs, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def snapshot(self) -> dict:
+        """JSON-friendly view of the histogram"""
+        return {
+            "buckets": {("+Inf" if bound == float("inf") else str(bound)): count for bound, count in self.cumulative()},
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+# Seconds spent per phase (auth, db, serialization) in the current request.
+# The timing middleware installs a fresh dict per request; outside a request
+# it is None and timings are dropped.
+phase_times: ContextVar[Optional[dict]] = ContextVar("phase_times", default=None)
+
+
+def add_phase_time(phase: str, seconds: float) -> None:
+    """Add time to a phase of the current request"""
+    times = phase_times.get()
+    if times is not None:
+        times[phase] = times.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    """Time the enclosed block as part of a request phase"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase_time(phase, time.perf_counter() - started)
+
+
+class RequestMetrics:
+    """Per-route request latency and phase histograms plus status counts"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.phases: dict[tuple[str, str, str], Histogram] = {}
+        self.statuses: dict[tuple[str, str, int], int] = {}
+        self.queries: dict[tuple[str, str], Histogram] = {}
+        self.repeated: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, store: dict, key: tuple, buckets: Optional[Iterable[float]] = None) -> Histogram:
+        histogram = store.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = store.setdefault(key, Histogram(buckets or self.buckets))
+        return histogram
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        phases: dict,
+        queries: Optional[int] = None,
+        repeated: bool = False
+    ) -> None:
+        """Record one finished request (queries: SQL statements it ran; repeated: flagged as N+1)"""
+        self._histogram(self.latency, (method, route)).observe(seconds)
+        for phase, phase_seconds in phases.items():
+            self._histogram(self.phases, (method, route, phase)).observe(phase_seconds)
+        if queries is not None:
+            self._histogram(self.queries, (method, route), QUERY_COUNT_BUCKETS).observe(queries)
+        with self._lock:
+            key = (method, route, status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if repeated:
+                self.repeated[(method, route)] = self.repeated.get((method, route), 0) + 1
+
+    def prometheus_lines(self) -> list[str]:
+        """Prometheus text exposition lines for every route seen so far"""
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines += histogram_lines("http_request_duration_seconds", {"method": method, "route": route}, histogram)
+
+        lines += [
+            "# HELP http_request_phase_seconds Time per request spent in auth, db and serialization",
+            "# TYPE http_request_phase_seconds histogram",
+        ]
+        for (method, route, phase), histogram in sorted(self.phases.items()):
+            labels = {"method": method, "route": route, "phase": phase}
+            lines += histogram_lines("http_request_phase_seconds", labels, histogram)
+
+        lines += [
+            "# HELP http_requests_total Requests by route and status code",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            statuses = sorted(self.statuses.items())
+        for (method, route, status), count in statuses:
+            labels = format_labels({"method": method, "route": route, "status": str(status)})
+            lines.append(f"http_requests_total{labels} {count}")
+
+        lines += [
+            "# HELP http_request_db_queries SQL statements executed per request",
+            "# TYPE http_request_db_queries histogram",
+        ]
+        for (method, route), histogram in sorted(self.queries.items()):
+            lines += histogram_lines("http_request_db_queries", {"method": method, "route": route}, histogram)
+
+        lines += [
+            "# HELP http_requests_repeated_statements_total Requests that ran one statement N_PLUS_ONE_THRESHOLD+ times",
+            "# TYPE http_requests_repeated_statements_total counter",
+        ]
+        with self._lock:
+            repeated = sorted(self.repeated.items())
+        for (method, route), count in repeated:
+            labels = format_labels({"method": method, "route": route})
+            lines.append(f"http_requests_repeated_statements_total{labels} {count}")
+        return lines
+
+
+def format_labels(labels: dict) -> str:
+    """Render a Prometheus label set"""
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def histogram_lines(name: str, labels: dict, histogram: Histogram) -> list[str]:
+    """Prometheus text lines (_bucket, _sum, _count) for one histogram"""
+    lines = []
+    for bound, count in histogram.cumulative():
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f"{name}_bucket{format_labels({**labels, 'le': le})} {count}")
+    lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+    lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+    return lines
+
+
+# Process-wide request metrics, filled by app.middleware.timing
+request_metrics = RequestMetrics()
@@ -0,0 +1,46 @@
+"""
+Cursor (keyset) pagination utilities
+"""
+import base64
+import json
+from typing import Any
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """
+    Encode the position of the last row of a page into an opaque cursor
+
+    Args:
+        values: Sort key values of the last row (must include "id")
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous response
+
+    Returns:
+        Dict of sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    # type() rather than isinstance(): bool is an int subclass, so {"id": true} must not pass
+    if not isinstance(values, dict) or type(values.get("id")) is not int:
+        raise ValueError("Invalid cursor")
+
+    return values
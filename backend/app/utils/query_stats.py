@@ -0,0 +1,98 @@
+"""
+Per-request SQL statistics, slow-query logging and repeated-statement detection
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from app.config import settings
+from app.utils.metrics import add_phase_time
+
+logger = logging.getLogger("app.sql")
+
+_WHITESPACE = re.compile(r"\s+")
+
+_slow_query_lock = threading.Lock()
+slow_query_total = 0  # Statements over SLOW_QUERY_MS since start (per worker)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Statements executed while serving one request"""
+
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least `threshold` times (likely N+1 loops), most frequent first"""
+        if threshold <= 0 or self.count < threshold:
+            return []
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+# Stats of the current request; installed by the timing middleware, None elsewhere
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def compact_sql(statement: str, limit: int = 300) -> str:
+    """Single-line, truncated SQL for logs and warnings"""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    return sql if len(sql) <= limit else sql[:limit] + "..."
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """
+    Describe bind parameters by type and size without their values
+
+    Keeps salaries, emails and password hashes out of the logs while still
+    showing what a statement was called with, e.g. "(int, str[12], None)"
+    or "500 x (str[9], float)" for executemany.
+    """
+    def shape(value: Any) -> str:
+        if value is None:
+            return "None"
+        if isinstance(value, (str, bytes, list, tuple)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    def row(params: Any) -> str:
+        if isinstance(params, dict):
+            return "{" + ", ".join(f"{key}: {shape(value)}" for key, value in params.items()) + "}"
+        if isinstance(params, (list, tuple)):
+            return "(" + ", ".join(shape(value) for value in params) + ")"
+        return shape(params)
+
+    if executemany and isinstance(parameters, (list, tuple)) and parameters \
+            and isinstance(parameters[0], (dict, list, tuple)):
+        return f"{len(parameters)} x {row(parameters[0])}"
+    return row(parameters)
+
+
+def record_query(statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+    """
+    Account one executed statement
+
+    Adds it to the current request's stats and "db" phase, and logs it when
+    it took longer than SLOW_QUERY_MS.
+    """
+    add_phase_time("db", seconds)
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+        stats.statements[statement] += 1
+
+    if 0 < settings.SLOW_QUERY_MS <= seconds * 1000:
+        global slow_query_total
+        with _slow_query_lock:
+            slow_query_total += 1
+        logger.warning(
+            "Slow query (%.1f ms): %s | params: %s",
+            seconds * 1000,
+            compact_sql(statement),
+            parameter_shape(parameters, executemany)
+        )
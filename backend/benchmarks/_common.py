@@ -0,0 +1,62 @@
+"""Shared helpers for the benchmark scripts"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import SQLModel, create_engine
+from app.models.employee_model import EmployeeModel
+
+DEPARTMENTS = ["Engineering", "HR", "Finance", "Sales", "Marketing", "Support", "Legal", "Operations"]
+JOB_ROLES = ["Engineer", "Manager", "Analyst", "Specialist", "Executive", "Director", "Intern"]
+FIRST_NAMES = ["Alice", "Bob", "Carol", "David", "Eve", "Frank", "Grace", "Henry", "Ivy", "Jack",
+               "Karen", "Liam", "Mia", "Noah", "Olivia", "Paul", "Quinn", "Ruby", "Sam", "Tina"]
+LAST_NAMES = ["Johnson", "Smith", "Williams", "Brown", "Davis", "Miller", "Wilson", "Taylor",
+              "Anderson", "Thomas", "Moore", "Martin", "Jackson", "White", "Harris", "Clark"]
+
+
+def make_engine(path=None):
+    """Create an engine on a fresh SQLite file with the app schema"""
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="hrms_bench_"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def seed_employees(engine, count, chunk_size=50_000, seed=42):
+    """Bulk insert `count` synthetic employees with a seeded RNG"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    table = EmployeeModel.__table__
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for start in range(0, count, chunk_size):
+            rows = [
+                {
+                    "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+                    "department": rng.choice(DEPARTMENTS),
+                    "job_role": rng.choice(JOB_ROLES),
+                    "salary": round(rng.uniform(30_000, 200_000), 2),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + chunk_size, count))
+            ]
+            conn.execute(table.insert(), rows)
+    return time.perf_counter() - started
+
+
+def timeit(fn, repeat=5):
+    """Return the best wall time of `repeat` calls in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
@@ -0,0 +1,209 @@
+"""Load-test the HTTP API and record latency percentiles and throughput
+
+Seeds a throwaway SQLite database with N synthetic employees, then drives
+login, /me, filtered list, get-by-id and create with C concurrent clients,
+either in-process through the ASGI transport or against a local uvicorn
+started on that database. Results are printed and written to JSON; pass
+--compare with an earlier file to see the change per scenario.
+
+Usage:
+    python benchmarks/bench_api.py [--employees 100000] [--requests 500] [--concurrency 8]
+                                   [--transport asgi|uvicorn] [--scenario list ...]
+                                   [--output results.json] [--compare baseline.json]
+
+Login and create cost one password hash each; lower BCRYPT_ROUNDS in the
+environment to measure the rest of the request path.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="hrms_bench_"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import _common  # noqa: E402  (puts the backend on sys.path)
+import httpx  # noqa: E402
+
+SCENARIOS = ["login", "me", "list", "get_by_id", "create"]
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--employees", type=int, default=100_000, help="Synthetic employees to seed")
+parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+parser.add_argument("--port", type=int, default=8765, help="Port for --transport uvicorn")
+parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="Run only these scenarios")
+parser.add_argument("--output", default="bench_api_results.json", help="Where to write the JSON results")
+parser.add_argument("--compare", help="Earlier results file to compare against")
+args = parser.parse_args()
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+
+def build_requests(headers, max_id):
+    """Scenario name -> function(i) returning (method, url, kwargs, expected status)"""
+    rng = random.Random(7)
+    return {
+        "login": lambda i: ("POST", "/auth/login",
+                            {"json": {"email": "admin@example.com", "password": "admin123"}}, 200),
+        "me": lambda i: ("GET", "/me", {"headers": headers}, 200),
+        "list": lambda i: ("GET", "/employees/", {"headers": headers, "params": {
+            "department": rng.choice(_common.DEPARTMENTS),
+            "job_role": rng.choice(_common.JOB_ROLES),
+            "page": rng.randint(1, 5),
+            "limit": 20,
+        }}, 200),
+        "get_by_id": lambda i: ("GET", f"/employees/{rng.randint(1, max_id)}", {"headers": headers}, 200),
+        "create": lambda i: ("POST", "/employees/", {"headers": headers, "json": {
+            "name": f"Bench User {i}",
+            "email": f"bench_{uuid.uuid4().hex}@example.com",
+            "password": "password123",
+            "department": rng.choice(_common.DEPARTMENTS),
+            "job_role": rng.choice(_common.JOB_ROLES),
+            "salary": 50000,
+        }}, 201),
+    }
+
+
+async def run_scenario(client, make_request, total, concurrency):
+    latencies, errors = [], 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, url, kwargs, expected = make_request(i)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != expected:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_all(client, scenarios):
+    login = await client.post("/auth/login", json={"email": "admin@example.com", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    requests_by_name = build_requests(headers, args.employees)
+
+    results = {}
+    for name in scenarios:
+        # Warm up caches and connections before measuring
+        await run_scenario(client, requests_by_name[name], min(20, args.requests), 1)
+        results[name] = await run_scenario(client, requests_by_name[name], args.requests, args.concurrency)
+        r = results[name]
+        print(f"  {name:<10} {r['throughput_rps']:8.1f} req/s   p50 {r['p50_ms']:7.2f}   "
+              f"p95 {r['p95_ms']:7.2f}   p99 {r['p99_ms']:7.2f} ms   errors {r['errors']}")
+    return results
+
+
+async def run_asgi(scenarios):
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_all(client, scenarios)
+
+
+async def run_uvicorn(scenarios):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.2)
+            return await run_all(client, scenarios)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(results, baseline):
+    print("\nChange vs baseline (p95 latency, throughput):")
+    for name, current in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        p95 = (current["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+        rps = (current["throughput_rps"] / before["throughput_rps"] - 1) * 100 if before["throughput_rps"] else 0.0
+        print(f"  {name:<10} p95 {p95:+7.1f}%   throughput {rps:+7.1f}%")
+
+
+scenarios = args.scenario or SCENARIOS
+
+print("=" * 60)
+print(f"API LOAD BENCHMARK - {args.employees:,} employees, {args.requests:,} requests x "
+      f"{args.concurrency} clients ({args.transport})")
+print("=" * 60)
+
+engine = _common.make_engine(DB_PATH)
+seconds = _common.seed_employees(engine, args.employees)
+engine.dispose()
+print(f"  seeded {args.employees:,} employees in {seconds:.1f}s\n")
+
+runner = run_asgi if args.transport == "asgi" else run_uvicorn
+results = asyncio.run(runner(scenarios))
+
+report = {
+    "timestamp": datetime.now(timezone.utc).isoformat(),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "cpus": os.cpu_count(),
+    "config": {
+        "employees": args.employees,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "transport": args.transport,
+    },
+    "scenarios": results,
+}
+with open(args.output, "w") as f:
+    json.dump(report, f, indent=2)
+print(f"\nResults written to {args.output}")
+
+if args.compare:
+    with open(args.compare) as f:
+        compare(results, json.load(f))
@@ -0,0 +1,50 @@
+"""Benchmark protected requests with and without the authenticated-user cache
+
+Runs with the cache off, then on each local backend (per-worker memory and
+the cross-worker shared_memory file).
+
+Usage: python benchmarks/bench_auth_cache.py [requests]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hrms_bench_'), 'bench.db')}"
+
+import _common  # noqa: F401  (puts the backend on sys.path)
+from fastapi.testclient import TestClient
+from app.cache import create_cache
+from app.dependencies import auth
+from app.main import app
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+
+def requests_per_second(client, path, headers):
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        assert client.get(path, headers=headers).status_code == 200
+    return REQUESTS / (time.perf_counter() - started)
+
+
+print("=" * 60)
+print(f"AUTH USER CACHE BENCHMARK - {REQUESTS:,} requests per run")
+print("=" * 60)
+
+with TestClient(app) as client:
+    token = client.post("/auth/login", json={"email": "admin@example.com", "password": "admin123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    employee_id = client.get("/employees/", headers=headers).json()["employees"][0]["id"]
+
+    for path in ["/me", f"/employees/{employee_id}"]:
+        auth._user_cache = create_cache("bench_users", maxsize=0, ttl=30)
+        uncached = requests_per_second(client, path, headers)
+        print(f"  {path:<16} {'uncached':<14} {uncached:8.0f} req/s")
+
+        for backend in ["memory", "shared_memory"]:
+            auth._user_cache = create_cache("bench_users", maxsize=10000, ttl=30, backend=backend)
+            auth._user_cache.clear()
+            cached = requests_per_second(client, path, headers)
+            print(f"  {path:<16} {backend:<14} {cached:8.0f} req/s   ({cached / uncached:.2f}x)")
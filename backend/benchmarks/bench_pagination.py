@@ -0,0 +1,43 @@
+"""Benchmark offset vs cursor pagination on a large employee table
+
+Usage: python benchmarks/bench_pagination.py [rows] [limit]
+"""
+
+import sys
+
+from _common import make_engine, seed_employees, timeit
+from sqlmodel import Session, select
+from app.models.employee_model import EmployeeModel
+from app.services.employee_service import EmployeeService
+from app.utils.pagination import encode_cursor
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+LIMIT = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+DEEP_PAGE = min(5000, ROWS // LIMIT)
+
+print("=" * 60)
+print(f"PAGINATION BENCHMARK - {ROWS:,} employees, limit {LIMIT}")
+print("=" * 60)
+
+engine = make_engine()
+print(f"Seeded in {seed_employees(engine, ROWS):.1f}s")
+
+with Session(engine) as session:
+    # Cursor pointing at the last row of the page before DEEP_PAGE
+    last = session.exec(
+        select(EmployeeModel.name, EmployeeModel.id)
+        .order_by(EmployeeModel.name, EmployeeModel.id)
+        .offset((DEEP_PAGE - 1) * LIMIT - 1)
+        .limit(1)
+    ).one()
+    deep_cursor = encode_cursor({"name": last.name, "id": last.id})
+
+    results = {
+        "offset page 1": timeit(lambda: EmployeeService.get_all_employees(session, page=1, limit=LIMIT, count_mode="none")),
+        f"offset page {DEEP_PAGE}": timeit(lambda: EmployeeService.get_all_employees(session, page=DEEP_PAGE, limit=LIMIT, count_mode="none")),
+        "cursor page 1": timeit(lambda: EmployeeService.get_employees_by_cursor(session, limit=LIMIT)),
+        f"cursor page {DEEP_PAGE}": timeit(lambda: EmployeeService.get_employees_by_cursor(session, cursor=deep_cursor, limit=LIMIT)),
+    }
+
+for name, ms in results.items():
+    print(f"  {name:<22} {ms:9.2f} ms")
@@ -0,0 +1,58 @@
+"""Measure password verify latency per KDF and pick costs for a target latency
+
+For each scheme, raises the main cost parameter until one verify takes at
+least the target on this machine and prints the matching .env settings.
+
+Usage: python benchmarks/bench_password_kdf.py [--target-ms 250] [--scheme bcrypt]
+"""
+
+import argparse
+import time
+
+import _common  # noqa: F401  (puts the backend on sys.path)
+from app.config import settings
+from app.utils.hashing import calibrate, hash_password, verify_password
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--target-ms", type=float, default=250.0, help="Desired verify latency")
+parser.add_argument("--scheme", choices=["bcrypt", "scrypt", "argon2"], action="append")
+args = parser.parse_args()
+schemes = args.scheme or ["bcrypt", "scrypt", "argon2"]
+
+print("=" * 60)
+print(f"PASSWORD KDF BENCHMARK - target {args.target_ms:.0f} ms per verify")
+print("=" * 60)
+
+
+def verify_ms(hashed: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        verify_password("benchmark-password", hashed)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+print("\nCurrent settings:")
+for scheme in schemes:
+    try:
+        hashed = hash_password("benchmark-password", scheme=scheme)
+    except RuntimeError as exc:
+        print(f"  {scheme:<8} unavailable ({exc})")
+        continue
+    print(f"  {scheme:<8} {verify_ms(hashed):8.1f} ms/verify")
+
+print("\nRecommended for this machine:")
+for scheme in schemes:
+    try:
+        result = calibrate(scheme, args.target_ms / 1000)
+    except RuntimeError:
+        continue
+    seconds = result.pop("verify_seconds")
+    env = " ".join(f"{key}={value}" for key, value in result.items())
+    print(f"  {scheme:<8} {seconds * 1000:8.1f} ms/verify   PASSWORD_HASH_SCHEME={scheme} {env}")
+
+print(
+    f"\nLogins per second per core at the target: ~{1000 / args.target_ms:.0f}"
+    f" (HASH_WORKERS={settings.HASH_WORKERS} bounds concurrent hashes)"
+)
@@ -0,0 +1,43 @@
+"""Benchmark employee name search: ILIKE scan vs the search index
+
+Usage: python benchmarks/bench_search.py [rows]
+"""
+
+import sys
+import time
+
+from _common import make_engine, seed_employees, timeit
+from sqlalchemy import func
+from sqlmodel import Session, select
+from app.database import create_search_index
+from app.models.employee_model import EmployeeModel
+from app.services.employee_service import EmployeeService
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+TERMS = ["ali", "Smith", "son 99", "Quinn Clark 12345"]
+
+print("=" * 60)
+print(f"NAME SEARCH BENCHMARK - {ROWS:,} employees")
+print("=" * 60)
+
+engine = make_engine()
+print(f"Seeded in {seed_employees(engine, ROWS):.1f}s")
+
+started = time.perf_counter()
+create_search_index(engine)
+print(f"Search index built in {time.perf_counter() - started:.1f}s")
+
+with Session(engine) as session:
+    print(f"\n  {'term':<20} {'matches':>9} {'ILIKE scan':>12} {'indexed':>12}")
+    for term in TERMS:
+        scan = select(func.count()).select_from(EmployeeModel).where(EmployeeModel.name.ilike(f"%{term}%"))
+
+        def indexed():
+            EmployeeService.invalidate_caches()
+            return EmployeeService.count_employees(session, search=term)
+
+        matches = session.exec(scan).one()
+        assert indexed()[0] == matches
+        scan_ms = timeit(lambda: session.exec(scan).one(), repeat=3)
+        indexed_ms = timeit(indexed, repeat=3)
+        print(f"  {term:<20} {matches:>9,} {scan_ms:>9.1f} ms {indexed_ms:>9.1f} ms")
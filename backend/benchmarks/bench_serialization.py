@@ -0,0 +1,76 @@
+"""Benchmark building and encoding one 100-row employee page
+
+Compares the previous path (ORM entities -> Pydantic response models ->
+FastAPI response_model validation and dump) with the current one (column
+select -> plain dicts -> one ORJSONResponse encode). Each page is read in a
+fresh session so the ORM identity map does not flatter the old path.
+
+Usage: python benchmarks/bench_serialization.py [rows] [limit] [pages]
+"""
+
+import sys
+
+from _common import make_engine, seed_employees, timeit
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+from app.models.employee_model import EmployeeModel
+from app.schemas.employee_schema import EmployeeResponse
+from app.services.employee_service import EmployeeService
+from app.utils import responses
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+LIMIT = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+PAGES = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+print("=" * 60)
+print(f"SERIALIZATION BENCHMARK - {PAGES} pages x {LIMIT} rows ({ROWS:,} employees)")
+print(f"encoder: {'orjson' if responses.orjson is not None else 'json (orjson not installed)'}")
+print("=" * 60)
+
+engine = make_engine()
+seed_employees(engine, ROWS)
+envelope = TypeAdapter(dict)  # what FastAPI builds for response_model=dict
+
+
+def page(employees):
+    return {"employees": employees, "total": ROWS, "page": 1, "limit": LIMIT,
+            "total_pages": ROWS // LIMIT, "total_is_estimate": False}
+
+
+def models_fetch(session, offset):
+    entities = session.exec(select(EmployeeModel).offset(offset).limit(LIMIT)).all()
+    return [EmployeeResponse.model_validate(emp) for emp in entities]
+
+
+def models_encode(content):
+    return envelope.dump_json(envelope.validate_python(content))
+
+
+def rows_fetch(session, offset):
+    return EmployeeService.get_all_employees(session, page=offset // LIMIT + 1, limit=LIMIT, count_mode="none")[0]
+
+
+def run(fetch, encode=None):
+    for number in range(PAGES):
+        with Session(engine) as session:
+            content = page(fetch(session, number * LIMIT))
+        if encode:
+            encode(content)
+
+
+with Session(engine) as session:
+    old = models_encode(page(models_fetch(session, 0)))
+    new = responses.dumps(page(rows_fetch(session, 0)))
+assert old == new, "encoded pages differ"
+
+results = {
+    "models: fetch + build": timeit(lambda: run(models_fetch)),
+    "models: + encode": timeit(lambda: run(models_fetch, models_encode)),
+    "rows: fetch + build": timeit(lambda: run(rows_fetch)),
+    "rows: + encode": timeit(lambda: run(rows_fetch, responses.dumps)),
+}
+
+for name, ms in results.items():
+    print(f"  {name:<24} {ms / PAGES:8.3f} ms/page")
+print()
+print(f"  speedup (end to end): {results['models: + encode'] / results['rows: + encode']:.2f}x")
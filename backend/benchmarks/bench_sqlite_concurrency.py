@@ -0,0 +1,96 @@
+"""Benchmark several worker processes sharing one SQLite file, default vs SQLITE_TUNED
+
+Each run starts reader and writer processes (like uvicorn workers) that go
+through EmployeeService for a fixed time and counts completed operations
+and "database is locked" failures. Writers reuse one precomputed password
+hash, so the numbers show lock contention rather than bcrypt.
+
+Usage: python benchmarks/bench_sqlite_concurrency.py [readers] [writers] [seconds]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import _common  # noqa: F401  (puts the backend on sys.path, also for spawned workers)
+
+READERS = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+WRITERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+SECONDS = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+
+def setup():
+    """Create the schema and a few thousand rows"""
+    from _common import seed_employees
+    from app.database import engine, migrate_database
+
+    migrate_database()
+    seed_employees(engine, 5000)
+
+
+def worker(role, seconds):
+    """Run reads or writes for `seconds` after imports; return (ok, locked, other errors)"""
+    from sqlalchemy.exc import OperationalError
+    from sqlmodel import Session
+    from app.database import engine
+    from app.models.user_model import UserModel
+    from app.schemas.employee_schema import EmployeeCreate, EmployeeUpdate
+    from app.services.employee_service import EmployeeService
+    from app.utils.hashing import get_password_hash
+
+    password_hash = get_password_hash("x")
+    # Start the clock here, so spawn and import time is not counted
+    deadline = time.time() + seconds
+    ok = locked = failed = 0
+    while time.time() < deadline:
+        try:
+            with Session(engine) as session:
+                if role == "reader":
+                    EmployeeService.get_all_employees(session=session, department="Engineering", page=3, limit=50)
+                else:
+                    # Like a real request, read (the auth lookup) before writing
+                    session.get(UserModel, 1)
+                    created = EmployeeService.create_employee(session=session, employee_data=EmployeeCreate(
+                        name="Bench Writer", email=f"{uuid.uuid4()}@bench.local", password="x",
+                        department="Engineering", job_role="Engineer", salary=50000,
+                    ), password_hash=password_hash)
+                    EmployeeService.update_employee(session=session, employee_id=created.id,
+                                                    employee_data=EmployeeUpdate(salary=60000))
+            ok += 1
+        except OperationalError as exc:
+            if "locked" in str(exc):
+                locked += 1
+            else:
+                failed += 1
+    return ok, locked, failed
+
+
+def run(tuned):
+    directory = tempfile.mkdtemp(prefix="hrms_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    os.environ["SQLITE_TUNED"] = str(tuned)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(READERS + WRITERS) as pool:
+        pool.apply(setup)
+        roles = ["reader"] * READERS + ["writer"] * WRITERS
+        results = pool.starmap(worker, [(role, SECONDS) for role in roles], chunksize=1)
+
+    reads = [r for role, r in zip(roles, results) if role == "reader"]
+    writes = [r for role, r in zip(roles, results) if role == "writer"]
+    label = "SQLITE_TUNED" if tuned else "default"
+    print(f"  {label:<13} reads {sum(r[0] for r in reads) / SECONDS:8.0f}/s"
+          f"   writes {sum(r[0] for r in writes) / SECONDS:7.0f}/s"
+          f"   locked errors {sum(r[1] for r in reads + writes):5}"
+          f"   other errors {sum(r[2] for r in reads + writes):3}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"SQLITE CONCURRENCY BENCHMARK - {READERS} readers, {WRITERS} writers, {SECONDS:.0f}s")
+    print("=" * 60)
+    run(tuned=False)
+    run(tuned=True)
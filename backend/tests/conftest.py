@@ -0,0 +1,64 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import pytest
+import requests
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Server the live-server tests talk to (started and seeded before the run)
+BASE_URL = "http://127.0.0.1:8000"
+
+
+def login(email, password, base_url=BASE_URL):
+    """Authorization headers for a seeded user"""
+    response = requests.post(f"{base_url}/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="module")
+def admin_headers():
+    return login("admin@example.com", "admin123")
+
+
+@pytest.fixture(scope="module")
+def hr_headers():
+    return login("hr@example.com", "hr123")
+
+
+@pytest.fixture(scope="module")
+def employee_headers():
+    return login("employee@example.com", "emp123")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def app_server(env):
+    """Run the app in a uvicorn subprocess with extra environment; yields its base URL"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=BACKEND, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                requests.get(base_url, timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
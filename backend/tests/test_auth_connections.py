@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from tests.conftest import app_server, login
+
+
+@pytest.fixture(scope="module", params=["sync", "async"])
+def server(request, tmp_path_factory):
+    """App with a single pooled connection and no user cache, so every request authenticates in the database"""
+    env = {
+        "DATABASE_URL": f"sqlite:///{tmp_path_factory.mktemp(f'pool_{request.param}') / 'pool.db'}",
+        "DATABASE_ASYNC": str(request.param == "async"),
+        "DATABASE_POOL_SIZE": "1",
+        "DATABASE_MAX_OVERFLOW": "0",
+        "DATABASE_POOL_TIMEOUT": "5",
+        "USER_CACHE_TTL": "0",
+    }
+    with app_server(env) as base_url:
+        yield base_url
+
+
+def test_authenticated_writes_hold_one_connection(server):
+    headers = login("admin@example.com", "admin123", server)
+
+    def update(salary):
+        return requests.put(f"{server}/employees/2", headers=headers, json={"salary": salary}, timeout=30).status_code
+
+    # Authentication releases its connection before the handler takes one, so
+    # a one-connection pool serves concurrent writes instead of exhausting
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(update, range(50000, 50008))) == [200] * 8
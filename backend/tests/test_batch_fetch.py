@@ -0,0 +1,49 @@
+import pytest
+import requests
+
+from app.schemas.employee_schema import EMPLOYEE_BATCH_MAX_IDS
+from tests.conftest import BASE_URL
+
+MISSING_ID = 999_999_999
+
+
+@pytest.fixture(scope="module")
+def employee_ids(admin_headers):
+    listing = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"limit": 100}).json()
+    return [employee["id"] for employee in listing["employees"]]
+
+
+def batch(headers, ids):
+    return requests.post(f"{BASE_URL}/employees/batch", headers=headers, json={"ids": ids})
+
+
+def test_batch_matches_single_fetches_in_request_order(admin_headers, employee_ids):
+    ids = [employee_ids[2], employee_ids[0], MISSING_ID, employee_ids[2]]
+    response = batch(admin_headers, ids)
+    assert response.status_code == 200
+    body = response.json()
+
+    assert [employee["id"] for employee in body["employees"]] == [employee_ids[2], employee_ids[0]]
+    assert body["missing"] == [MISSING_ID]
+    for employee in body["employees"]:
+        assert employee == requests.get(f"{BASE_URL}/employees/{employee['id']}", headers=admin_headers).json()
+
+
+def test_batch_is_one_query(admin_headers, employee_ids):
+    batch(admin_headers, employee_ids)  # warm the user cache
+    response = batch(admin_headers, employee_ids)
+    assert len(response.json()["employees"]) == len(employee_ids)
+    assert int(response.headers["X-DB-Query-Count"]) == 1
+
+
+def test_batch_hides_salary_from_employees(employee_headers, employee_ids):
+    body = batch(employee_headers, employee_ids).json()
+    assert len(body["employees"]) == len(employee_ids)
+    assert all("salary" not in employee for employee in body["employees"])
+
+
+def test_batch_size_is_bounded(admin_headers):
+    assert batch(admin_headers, []).status_code == 422
+    assert batch(admin_headers, list(range(1, EMPLOYEE_BATCH_MAX_IDS + 2))).status_code == 422
+    assert batch(admin_headers, list(range(1, EMPLOYEE_BATCH_MAX_IDS + 1))).status_code == 200
+    assert requests.post(f"{BASE_URL}/employees/batch", json={"ids": [1]}).status_code in (401, 403)
@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+import requests
+import uuid
+
+from tests.conftest import BASE_URL, app_server, login
+
+
+def test_csv_import_reports_bad_rows_without_aborting(admin_headers):
+    """Valid rows are imported, invalid and duplicate rows are reported"""
+    tag = uuid.uuid4().hex[:8]
+    csv_body = "\n".join([
+        "name,email,password,role,department,job_role,salary",
+        f"Import One,one_{tag}@example.com,pw,employee,Import {tag},Engineer,50000",
+        f"Import Two,two_{tag}@example.com,pw,,Import {tag},Engineer,not-a-number",
+        f"Import Three,one_{tag}@example.com,pw,employee,Import {tag},Engineer,51000",
+        f"Import Four,four_{tag}@example.com,pw,hr,Import {tag},Manager,70000",
+        "Import Five,admin@example.com,pw,employee,Import,Engineer,50000",
+    ])
+    response = requests.post(
+        f"{BASE_URL}/employees/import",
+        headers={**admin_headers, "Content-Type": "text/csv"},
+        data=csv_body,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_rows"] == 5
+    assert data["imported"] == 2
+    assert [error["row"] for error in data["errors"]] == [2, 3, 5]
+
+    listed = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"department": f"Import {tag}"}).json()
+    assert listed["total"] == 2
+
+
+def test_ndjson_import_respects_hr_role_limit(hr_headers):
+    """HR imports may only create employee-role accounts"""
+    tag = uuid.uuid4().hex[:8]
+    lines = [
+        {"name": "Nd One", "email": f"nd1_{tag}@example.com", "password": "pw",
+         "department": "Import", "job_role": "Engineer", "salary": 50000},
+        {"name": "Nd Two", "email": f"nd2_{tag}@example.com", "password": "pw", "role": "admin",
+         "department": "Import", "job_role": "Engineer", "salary": 50000},
+    ]
+    response = requests.post(
+        f"{BASE_URL}/employees/import",
+        headers={**hr_headers, "Content-Type": "application/x-ndjson"},
+        data="\n".join(json.dumps(line) for line in lines) + "\n{broken",
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 1
+    assert [error["row"] for error in data["errors"]] == [2, 3]
+
+
+def test_async_import_keeps_the_event_loop_responsive(tmp_path):
+    """Hashing and validation run off the event loop, so other requests are served mid-import"""
+    env = {
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'import.db'}",
+        "DATABASE_ASYNC": "True",
+        "BCRYPT_ROUNDS": "11",
+    }
+    with app_server(env) as base_url:
+        headers = login("admin@example.com", "admin123", base_url)
+        csv_body = "\n".join(
+            ["name,email,password,role,department,job_role,salary"]
+            + [f"Loop {n},loop{n}@example.com,pw{n},employee,Import,Engineer,50000" for n in range(16)]
+        )
+        result = {}
+
+        def run_import():
+            started = time.perf_counter()
+            result["response"] = requests.post(
+                f"{base_url}/employees/import",
+                headers={**headers, "Content-Type": "text/csv"},
+                data=csv_body,
+            )
+            result["seconds"] = time.perf_counter() - started
+
+        importer = threading.Thread(target=run_import)
+        importer.start()
+        time.sleep(0.2)
+        started = time.perf_counter()
+        assert requests.get(base_url, timeout=30).status_code == 200
+        health_seconds = time.perf_counter() - started
+        importer.join()
+
+        assert result["response"].json()["imported"] == 16
+        assert health_seconds < result["seconds"] / 2, (health_seconds, result["seconds"])
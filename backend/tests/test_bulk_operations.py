@@ -0,0 +1,70 @@
+import pytest
+import requests
+import uuid
+
+from tests.conftest import BASE_URL
+
+
+@pytest.fixture
+def department(admin_headers):
+    """A throwaway department with three employees"""
+    name = f"Bulk {uuid.uuid4().hex[:8]}"
+    for i in range(3):
+        payload = {
+            "name": f"Bulk Person {i}",
+            "email": f"bulk_{uuid.uuid4()}@example.com",
+            "password": "password123",
+            "department": name,
+            "job_role": "Engineer",
+            "salary": 50000,
+        }
+        assert requests.post(f"{BASE_URL}/employees/", headers=admin_headers, json=payload).status_code == 201
+    return name
+
+
+def list_department(headers, name):
+    return requests.get(f"{BASE_URL}/employees/", headers=headers, params={"department": name}).json()["employees"]
+
+
+def test_bulk_update_by_filter(admin_headers, department):
+    """One patch applied to a whole department bumps updated_at"""
+    before = list_department(admin_headers, department)
+    response = requests.post(
+        f"{BASE_URL}/employees/bulk-update",
+        headers=admin_headers,
+        json={"department": department, "patch": {"salary": 65000}},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"affected": 3}
+
+    after = list_department(admin_headers, department)
+    assert all(emp["salary"] == 65000 for emp in after)
+    assert all(a["updated_at"] > b["updated_at"] for a, b in zip(after, before))
+
+
+def test_bulk_delete_by_ids(admin_headers, department):
+    """Deleting by ids reports the affected row count"""
+    ids = [emp["id"] for emp in list_department(admin_headers, department)]
+    response = requests.post(f"{BASE_URL}/employees/bulk-delete", headers=admin_headers, json={"ids": ids + [999999]})
+    assert response.status_code == 200
+    assert response.json() == {"affected": 3}
+    assert list_department(admin_headers, department) == []
+
+
+def test_bulk_requires_selection_and_role(admin_headers, employee_headers):
+    """An empty selection is rejected and employees cannot bulk delete"""
+    assert requests.post(f"{BASE_URL}/employees/bulk-delete", headers=admin_headers, json={}).status_code == 422
+    assert requests.post(
+        f"{BASE_URL}/employees/bulk-delete", headers=employee_headers, json={"department": "Engineering"}
+    ).status_code == 403
+
+
+def test_empty_id_list_never_widens_to_the_filter(admin_headers, department):
+    """ids: [] is rejected instead of being read as "no ids", which would hit the whole department"""
+    for path, body in [
+        ("bulk-delete", {"ids": [], "department": department}),
+        ("bulk-update", {"ids": [], "department": department, "patch": {"job_role": "Wiped"}}),
+    ]:
+        assert requests.post(f"{BASE_URL}/employees/{path}", headers=admin_headers, json=body).status_code == 422
+    assert len(list_department(admin_headers, department)) == 3
+    assert all(employee["job_role"] != "Wiped" for employee in list_department(admin_headers, department))
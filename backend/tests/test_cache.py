@@ -0,0 +1,317 @@
+import asyncio
+import multiprocessing
+import os
+import socketserver
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import jwt
+import pytest
+import requests
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.cache import MemoryCache, RedisCache
+from app.cache.shared_memory import SharedMemoryCache
+from app.config import settings
+from app.database import engine
+from app.dependencies.auth import _authenticate, _user_cache
+from app.models.user_model import UserModel
+from app.schemas.user_schema import UserPrincipal
+from app.services import jwt_service
+from app.services.jwt_service import create_access_token, decode_access_token, evict_access_token
+from tests.conftest import BACKEND, app_server, login
+
+
+class RespStandIn(socketserver.ThreadingTCPServer):
+    """
+    Minimal in-process server speaking the Redis protocol
+
+    Implements just the commands RedisCache sends (GET, SET .. PX, DEL, INCR,
+    AUTH, SELECT) with lazy expiry, like the real server.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.data = {}
+        self.lock = threading.Lock()
+        self.commands = []
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def live(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        while (args := self.read_command()) is not None:
+            server = self.server
+            name, args = args[0].upper().decode(), args[1:]
+            server.commands.append(name)
+            with server.lock:
+                if name in ("AUTH", "SELECT"):
+                    reply = b"+OK\r\n"
+                elif name == "GET":
+                    value = server.live(args[0])
+                    reply = b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+                elif name == "SET":
+                    expires_at = time.monotonic() + int(args[3]) / 1000 if len(args) > 3 else None
+                    server.data[args[0]] = (args[1], expires_at)
+                    reply = b"+OK\r\n"
+                elif name == "DEL":
+                    reply = b":%d\r\n" % sum(server.data.pop(key, None) is not None for key in args)
+                elif name == "INCR":
+                    value = int(server.live(args[0]) or 0) + 1
+                    server.data[args[0]] = (str(value).encode(), None)
+                    reply = b":%d\r\n" % value
+                else:
+                    reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture(scope="module")
+def resp_server():
+    server = RespStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "shared_memory", "redis"])
+def cache(request, tmp_path, resp_server):
+    if request.param == "memory":
+        return MemoryCache("test", maxsize=64, ttl=60)
+    if request.param == "shared_memory":
+        return SharedMemoryCache("test", str(tmp_path / "test.cache"), slots=64, slot_bytes=512, ttl=60)
+    namespace = f"test{request.node.name}"
+    return RedisCache(namespace, resp_server.url, ttl=60, max_item_bytes=512)
+
+
+def test_get_set_delete_clear(cache):
+    principal = UserPrincipal(id=7, name="Cached User", email="cached@example.com", role="hr")
+    assert cache.get("7") is None
+    cache.set("7", principal)
+    cache.set("count", 42)
+    assert cache.get("7") == principal
+    assert cache.get("count") == 42
+
+    cache.delete("7")
+    assert cache.get("7") is None
+    cache.clear()
+    assert cache.get("count") is None
+
+    stats = cache.stats()
+    assert (stats.backend, stats.hits, stats.misses) == (cache.backend, 2, 3)
+
+
+def test_entries_expire(cache):
+    cache.set("short", "value", ttl=0.05)
+    cache.set("long", "value")
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.get("long") == "value"
+
+
+@pytest.mark.parametrize("backend", ["shared_memory", "redis"])
+def test_items_over_the_size_bound_are_not_stored(backend, tmp_path, resp_server):
+    if backend == "shared_memory":
+        cache = SharedMemoryCache("big", str(tmp_path / "big.cache"), slots=8, slot_bytes=256, ttl=60)
+    else:
+        cache = RedisCache("big", resp_server.url, ttl=60, max_item_bytes=256)
+    cache.set("key", "small")
+    cache.set("key", "x" * 1000)
+    assert cache.get("key") is None
+
+
+def test_shared_memory_stays_within_its_file(tmp_path):
+    cache = SharedMemoryCache("bounded", str(tmp_path / "bounded.cache"), slots=16, slot_bytes=128, ttl=60)
+    for number in range(500):
+        cache.set(f"key{number}", number)
+
+    stats = cache.stats()
+    assert stats.entries <= 16
+    assert stats.max_bytes == os.path.getsize(tmp_path / "bounded.cache")
+    # Least recently used entries go first
+    assert cache.get("key499") == 499
+
+
+def _write_and_clear(path, ready, cleared):
+    cache = SharedMemoryCache("workers", path, slots=64, slot_bytes=256, ttl=60)
+    cache.set("from_child", {"pid": os.getpid()})
+    ready.set()
+    cleared.wait(5)
+    cache.clear()
+
+
+def test_shared_memory_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "workers.cache")
+    cache = SharedMemoryCache("workers", path, slots=64, slot_bytes=256, ttl=60)
+    cache.set("from_parent", 1)
+
+    context = multiprocessing.get_context("fork")
+    ready, cleared = context.Event(), context.Event()
+    child = context.Process(target=_write_and_clear, args=(path, ready, cleared))
+    child.start()
+    assert ready.wait(5)
+    assert cache.get("from_child") == {"pid": child.pid}
+
+    # A clear in one process is an invalidation in every process
+    cleared.set()
+    child.join(5)
+    assert cache.get("from_parent") is None
+    assert cache.stats().hits == 1
+
+
+def test_app_imports_without_fcntl(tmp_path):
+    """Windows has no fcntl; only the shared_memory backend needs it"""
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'windows.db'}", "CACHE_BACKEND": "memory"}
+    script = "import sys; sys.modules['fcntl'] = None; import app.main"
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND, env=env, check=True, capture_output=True)
+
+
+def test_redis_cache_uses_one_round_trip_and_survives_outages(resp_server):
+    cache = RedisCache("trips", resp_server.url, ttl=60, max_item_bytes=512)
+    cache.set("key", "value")
+    resp_server.commands.clear()
+    assert cache.get("key") == "value"
+    # The generation read is pipelined with the entry read
+    assert resp_server.commands == ["GET", "GET"]
+
+    with socketserver.TCPServer(("127.0.0.1", 0), socketserver.BaseRequestHandler) as closed:
+        port = closed.server_address[1]
+    down = RedisCache("down", f"redis://127.0.0.1:{port}/0", ttl=60, max_item_bytes=512)
+    down.set("key", "value")
+    assert down.get("key") is None
+    down.clear()
+    assert down.stats().misses == 1
+
+
+def test_redis_clear_is_seen_by_every_worker_and_tracks_no_keys(resp_server):
+    worker, other_worker = (RedisCache("cleared", resp_server.url, ttl=60, max_item_bytes=512) for _ in range(2))
+    for number in range(100):
+        worker.set(f"key{number}", number)
+    assert other_worker.get("key1") == 1
+
+    other_worker.clear()
+    assert worker.get("key1") is None
+    worker.set("key1", "fresh")
+    assert other_worker.get("key1") == "fresh"
+
+    # Only the entries (which expire) and the counter: no per-key bookkeeping that grows forever
+    keys = [key for key in resp_server.data if key.startswith(b"hrms:cleared:")]
+    assert len(keys) == 100 + 1 + 1
+    assert all(key == b"hrms:cleared:generation" or key.count(b":") == 3 for key in keys)
+
+
+def test_user_cache_follows_orm_writes_to_users():
+    """Updating or deleting a user through the ORM drops its cached principal"""
+    with Session(engine) as session:
+        user = UserModel(name="Cached Before", email=f"cached_{uuid.uuid4()}@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+    token = create_access_token(user_id=user_id, role="employee")
+
+    async def scenario():
+        assert (await _authenticate(token)).name == "Cached Before"
+        assert _user_cache.get(str(user_id)) is not None
+
+        with Session(engine) as session:
+            session.get(UserModel, user_id).name = "Cached After"
+            session.commit()
+        assert _user_cache.get(str(user_id)) is None
+        assert (await _authenticate(token)).name == "Cached After"
+
+        with Session(engine) as session:
+            session.delete(session.get(UserModel, user_id))
+            session.commit()
+        assert _user_cache.get(str(user_id)) is None
+        with pytest.raises(HTTPException) as gone:
+            await _authenticate(token)
+        assert gone.value.status_code == 401
+
+    asyncio.run(scenario())
+
+
+def test_user_cache_drops_rows_read_before_the_commit():
+    """A cache miss between flush and commit re-caches the old row; the commit drops it again"""
+    with Session(engine) as session:
+        user = UserModel(name="Before Commit", email=f"window_{uuid.uuid4()}@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+    token = create_access_token(user_id=user_id, role="employee")
+
+    async def scenario():
+        with Session(engine) as session:
+            session.get(UserModel, user_id).name = "After Commit"
+            session.flush()
+            # Another request misses the cache and reads the committed (old) row
+            assert (await _authenticate(token)).name == "Before Commit"
+            assert _user_cache.get(str(user_id)) is not None
+            session.commit()
+        assert _user_cache.get(str(user_id)) is None
+        assert (await _authenticate(token)).name == "After Commit"
+
+    asyncio.run(scenario())
+
+
+def test_user_cache_ttl_zero_reads_every_change(tmp_path):
+    """With USER_CACHE_TTL=0 even writes that bypass the ORM show on the next request"""
+    database = tmp_path / "uncached.db"
+    with app_server({"DATABASE_URL": f"sqlite:///{database}", "USER_CACHE_TTL": "0"}) as base_url:
+        headers = login("admin@example.com", "admin123", base_url)
+        assert requests.get(f"{base_url}/me", headers=headers).json()["name"] != "Renamed Admin"
+
+        with sqlite3.connect(database) as conn:
+            conn.execute("UPDATE users SET name = 'Renamed Admin' WHERE email = 'admin@example.com'")
+        assert requests.get(f"{base_url}/me", headers=headers).json()["name"] == "Renamed Admin"
+
+
+def test_cached_token_expires_with_its_exp_claim():
+    expires_at = int(time.time()) + 1
+    token = jwt.encode(
+        {"user_id": 1, "role": "admin", "exp": expires_at}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+    )
+    assert decode_access_token(token)["user_id"] == 1
+    assert jwt_service._token_cache.get(jwt_service._token_digest(token)) is not None
+
+    time.sleep(expires_at - time.time() + 0.1)
+    assert decode_access_token(token) is None
+    assert jwt_service._token_cache.get(jwt_service._token_digest(token)) is None
+
+
+def test_evicted_token_is_verified_again(monkeypatch):
+    token = create_access_token(user_id=1, role="admin")
+    assert decode_access_token(token)["user_id"] == 1
+
+    # Under a rotated key only the cache still accepts the token
+    monkeypatch.setattr(settings, "JWT_SECRET_KEY", "rotated")
+    assert decode_access_token(token)["user_id"] == 1
+    evict_access_token(token)
+    assert decode_access_token(token) is None
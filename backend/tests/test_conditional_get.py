@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+from app.utils.conditional import Validators
+from tests.conftest import BASE_URL
+
+
+@pytest.fixture(scope="module")
+def employee_id(admin_headers):
+    return requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["employees"][0]["id"]
+
+
+def test_detail_revalidates_with_etag(admin_headers, employee_id):
+    url = f"{BASE_URL}/employees/{employee_id}"
+    first = requests.get(url, headers=admin_headers)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    etag = first.headers["ETag"]
+
+    # Warm caches answer the revalidation without touching the database
+    query_counts = []
+    for _ in range(3):
+        again = requests.get(url, headers={**admin_headers, "If-None-Match": etag})
+        assert again.status_code == 304 and again.content == b""
+        assert again.headers["ETag"] == etag
+        query_counts.append(int(again.headers["X-DB-Query-Count"]))
+    assert min(query_counts) == 0
+
+    modified = requests.get(url, headers={**admin_headers, "If-Modified-Since": first.headers["Last-Modified"]})
+    assert modified.status_code == 304
+
+
+def test_salary_variants_never_share_an_etag(admin_headers, employee_headers, employee_id):
+    url = f"{BASE_URL}/employees/{employee_id}"
+    admin_etag = requests.get(url, headers=admin_headers).headers["ETag"]
+    hidden = requests.get(url, headers={**employee_headers, "If-None-Match": admin_etag})
+    assert hidden.status_code == 200
+    assert "salary" not in hidden.json()
+    assert hidden.headers["ETag"] != admin_etag
+
+
+def test_write_changes_detail_and_list_etags(admin_headers, employee_id):
+    url = f"{BASE_URL}/employees/{employee_id}"
+    detail_etag = requests.get(url, headers=admin_headers).headers["ETag"]
+    listing = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"limit": 5})
+    list_etag = listing.headers["ETag"]
+    assert requests.get(
+        f"{BASE_URL}/employees/", headers={**admin_headers, "If-None-Match": list_etag}, params={"limit": 5}
+    ).status_code == 304
+
+    salary = requests.get(url, headers=admin_headers).json()["salary"]
+    assert requests.put(url, headers=admin_headers, json={"salary": salary + 1}).status_code == 200
+
+    detail = requests.get(url, headers={**admin_headers, "If-None-Match": detail_etag})
+    assert detail.status_code == 200 and detail.json()["salary"] == salary + 1
+    listing = requests.get(
+        f"{BASE_URL}/employees/", headers={**admin_headers, "If-None-Match": list_etag}, params={"limit": 5}
+    )
+    assert listing.status_code == 200 and listing.headers["ETag"] != list_etag
+
+    # Same list, different query: different ETag
+    other = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"limit": 6})
+    assert other.headers["ETag"] != listing.headers["ETag"]
+
+
+def test_validators_parsing():
+    changed = datetime(2025, 3, 4, 5, 6, 7, 890, tzinfo=timezone.utc)
+    validators = Validators.build("employee", 1, changed, True, last_modified=changed)
+    assert validators.headers()["Last-Modified"] == "Tue, 04 Mar 2025 05:06:07 GMT"
+    assert validators.etag != Validators.build("employee", 1, changed, False).etag
+
+    assert validators.not_modified({"if-none-match": f'"x", W/{validators.etag}'})
+    assert validators.not_modified({"if-none-match": "*"})
+    # If-None-Match takes precedence over a matching date
+    assert not validators.not_modified({"if-none-match": '"x"', "if-modified-since": "Tue, 04 Mar 2025 05:06:07 GMT"})
+    assert validators.not_modified({"if-modified-since": "Tue, 04 Mar 2025 05:06:07 GMT"})
+    assert not validators.not_modified({"if-modified-since": "Tue, 04 Mar 2025 05:06:06 GMT"})
+    assert not validators.not_modified({"if-modified-since": "yesterday"})
+    assert not validators.not_modified({})
+
+
+def test_naive_row_timestamps_are_utc():
+    """Drivers that return naive datetimes (no offset stored) compare and format as UTC"""
+    naive = Validators.build("employee", 1, last_modified=datetime(2025, 3, 4, 5, 6, 7, 890000))
+    assert naive.headers()["Last-Modified"] == "Tue, 04 Mar 2025 05:06:07 GMT"
+    assert naive.not_modified({"if-modified-since": "Tue, 04 Mar 2025 05:06:07 GMT"})
+    assert not naive.not_modified({"if-modified-since": "Tue, 04 Mar 2025 05:06:06 GMT"})
@@ -0,0 +1,35 @@
+import csv
+import io
+import json
+import requests
+
+from tests.conftest import BASE_URL
+
+
+def test_csv_export_matches_list(admin_headers):
+    """CSV export contains every employee with salary for admin"""
+    total = requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["total"]
+    response = requests.get(f"{BASE_URL}/employees/export", headers=admin_headers, params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == total
+    assert "salary" in rows[0]
+
+
+def test_ndjson_export_hides_salary_for_employee(employee_headers):
+    """Employee role gets the EmployeeResponseNoSalary fields only"""
+    response = requests.get(
+        f"{BASE_URL}/employees/export",
+        headers=employee_headers,
+        params={"format": "ndjson", "department": "Engineering"},
+    )
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert records
+    for record in records:
+        assert "salary" not in record
+        assert record["department"] == "Engineering"
+
+    detail = requests.get(f"{BASE_URL}/employees/{records[0]['id']}", headers=employee_headers).json()
+    assert set(detail) == set(records[0])
@@ -0,0 +1,75 @@
+import re
+
+import pytest
+import requests
+
+from tests.conftest import BASE_URL, login
+
+
+def scrape(headers):
+    response = requests.get(f"{BASE_URL}/metrics", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def sample(text, name, **labels):
+    """Value of the first sample of `name` whose labels include `labels` (0 if absent)"""
+    for line in text.splitlines():
+        match = re.match(rf"{name}\{{(.*)\}} (\S+)$", line)
+        if match and all(f'{key}="{value}"' in match.group(1) for key, value in labels.items()):
+            return float(match.group(2))
+    return 0.0
+
+
+def test_requests_are_labelled_by_route_template(admin_headers):
+    employee_id = requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["employees"][0]["id"]
+    before = scrape(admin_headers)
+
+    requests.get(f"{BASE_URL}/employees/{employee_id}", headers=admin_headers)
+    requests.get(f"{BASE_URL}/employees/999999999", headers=admin_headers)
+    after = scrape(admin_headers)
+
+    route = "/employees/{employee_id}"
+    for status in ("200", "404"):
+        labels = {"method": "GET", "route": route, "status": status}
+        assert sample(after, "http_requests_total", **labels) == sample(before, "http_requests_total", **labels) + 1
+    assert sample(after, "http_request_duration_seconds_count", method="GET", route=route) >= 2
+    assert f"/employees/{employee_id}" not in after
+
+
+def test_phase_times_are_recorded(admin_headers):
+    requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"limit": 5})
+    text = scrape(admin_headers)
+    for phase in ("auth", "db", "serialization"):
+        assert sample(text, "http_request_phase_seconds_count", route="/employees/", phase=phase) >= 1
+    assert sample(text, "db_pool_wait_seconds_count", pool="primary") >= 1
+
+
+def test_unknown_paths_share_one_series(admin_headers):
+    requests.get(f"{BASE_URL}/no-such-path-{id(object())}")
+    text = scrape(admin_headers)
+    assert sample(text, "http_requests_total", method="GET", route="unmatched", status="404") >= 1
+    assert "no-such-path" not in text
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/metrics/pool", "/metrics/cache"])
+def test_metrics_need_an_admin(path, admin_headers):
+    assert requests.get(f"{BASE_URL}{path}").status_code in (401, 403)
+    employee_headers = login("employee@example.com", "emp123")
+    assert requests.get(f"{BASE_URL}{path}", headers=employee_headers).status_code == 403
+    assert requests.get(f"{BASE_URL}{path}", headers=admin_headers).status_code == 200
+
+
+def test_metrics_token_lets_scrapers_in(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.config import settings
+    from app.main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-me"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-you"}).status_code == 401
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code in (401, 403)
@@ -0,0 +1,138 @@
+import pytest
+import requests
+import uuid
+
+from app.utils.pagination import encode_cursor
+from tests.conftest import BASE_URL, login
+
+
+def test_cursor_walk_returns_every_employee_once(admin_headers):
+    """Following next_cursor should visit every employee exactly once"""
+    total = requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["total"]
+
+    seen = []
+    params = {"pagination": "cursor", "limit": 3}
+    while True:
+        response = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert "page" not in data
+        seen.extend(emp["id"] for emp in data["employees"])
+        if data["next_cursor"] is None:
+            break
+        params = {"cursor": data["next_cursor"], "limit": 3}
+
+    assert len(seen) == total
+    assert len(set(seen)) == total
+
+
+def test_cursor_mode_respects_filters(admin_headers):
+    """Cursor pages apply the same filters as offset pages"""
+    response = requests.get(
+        f"{BASE_URL}/employees/",
+        headers=admin_headers,
+        params={"pagination": "cursor", "department": "Engineering", "limit": 100},
+    )
+    assert response.status_code == 200
+    assert all(emp["department"] == "Engineering" for emp in response.json()["employees"])
+
+
+def test_invalid_cursor_rejected(admin_headers):
+    """A tampered cursor returns 400 instead of a server error"""
+    response = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("values", [{"id": True}, {"id": "7"}, {"id": 1.5}, {"name": "x"}])
+def test_cursor_with_a_non_integer_id_rejected(admin_headers, values):
+    """Well-formed cursors whose id is not an integer (including JSON true) return 400"""
+    response = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"cursor": encode_cursor(values)})
+    assert response.status_code == 400
+
+
+def test_total_can_be_skipped(admin_headers):
+    """include_total=false skips the COUNT and returns null totals"""
+    response = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"include_total": "false"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert data["total_pages"] is None
+    assert len(data["employees"]) > 0
+
+
+def test_cached_total_tracks_writes(admin_headers):
+    """The cached exact total is invalidated by create and delete"""
+    before = requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["total"]
+
+    payload = {
+        "name": "Count Cache Check",
+        "email": f"count_{uuid.uuid4()}@example.com",
+        "password": "password123",
+        "department": "Engineering",
+        "job_role": "Engineer",
+        "salary": 50000,
+    }
+    created = requests.post(f"{BASE_URL}/employees/", headers=admin_headers, json=payload).json()
+    assert requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["total"] == before + 1
+
+    requests.delete(f"{BASE_URL}/employees/{created['id']}", headers=admin_headers)
+    assert requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["total"] == before
+
+
+def test_estimated_total(admin_headers):
+    """Estimated mode still returns a usable total"""
+    response = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params={"total_mode": "estimated"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] >= len(data["employees"])
+    assert isinstance(data["total_is_estimate"], bool)
+
+
+def test_estimated_total_is_exact_when_filtered(admin_headers):
+    """Filtered totals are never replaced by the unfiltered upper bound"""
+    params = {"department": "Engineering"}
+    exact = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params=params).json()
+    estimated = requests.get(
+        f"{BASE_URL}/employees/", headers=admin_headers, params={**params, "total_mode": "estimated"}
+    ).json()
+    if estimated["total_is_estimate"]:
+        pytest.skip("backend has planner statistics for filtered queries")
+    assert estimated["total"] == exact["total"]
+
+
+@pytest.mark.parametrize("sort, order", [("salary", "desc"), ("department", "asc"), ("created_at", "desc")])
+def test_sorted_offset_pages_cover_every_employee_once(admin_headers, sort, order):
+    """Sorted offset pages are ordered and, with the id tie-breaker, never overlap"""
+    total = requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["total"]
+    rows = []
+    for page in range(1, (total + 2) // 3 + 1):
+        params = {"sort": sort, "order": order, "page": page, "limit": 3}
+        rows.extend(requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params=params).json()["employees"])
+
+    assert sorted(row["id"] for row in rows) == sorted(set(row["id"] for row in rows))
+    assert len(rows) == total
+    keys = [(row[sort], row["name"] if sort == "department" else 0) for row in rows]
+    assert keys == sorted(keys, reverse=order == "desc")
+
+
+def test_sorted_cursor_walk(admin_headers):
+    """Cursors continue a descending salary sort and are tied to it"""
+    params = {"pagination": "cursor", "sort": "salary", "order": "desc", "limit": 2}
+    first = requests.get(f"{BASE_URL}/employees/", headers=admin_headers, params=params).json()
+    second = requests.get(
+        f"{BASE_URL}/employees/", headers=admin_headers, params={**params, "cursor": first["next_cursor"]}
+    ).json()
+    salaries = [emp["salary"] for emp in first["employees"] + second["employees"]]
+    assert salaries == sorted(salaries, reverse=True)
+
+    other_sort = requests.get(
+        f"{BASE_URL}/employees/", headers=admin_headers, params={**params, "order": "asc", "cursor": first["next_cursor"]}
+    )
+    assert other_sort.status_code == 400
+
+
+def test_employee_cannot_sort_by_salary():
+    """Salary order would reveal hidden salaries"""
+    headers = login("employee@example.com", "emp123")
+    assert requests.get(f"{BASE_URL}/employees/", headers=headers, params={"sort": "salary"}).status_code == 403
+    assert requests.get(f"{BASE_URL}/employees/", headers=headers, params={"sort": "name"}).status_code == 200
@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import time
+import uuid
+
+import pytest
+import requests
+from fastapi import HTTPException
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.database import engine
+from app.models.user_model import UserModel
+from app.utils.hash_executor import HashExecutor
+from app.utils import hashing
+from app.utils.hashing import calibrate, hash_password, needs_rehash, verify_password, verify_unknown_user
+from tests.conftest import BASE_URL, login
+
+# Cheap costs keep the unit tests fast
+FAST_COST = {
+    "bcrypt": {"rounds": 4},
+    "scrypt": {"log_n": 10},
+    "argon2": {"time_cost": 1, "memory_cost": 1024, "parallelism": 1},
+}
+
+
+def legacy_hash(password, salt="0123456789abcdef"):
+    return f"{salt}${hashlib.sha256(f'{salt}{password}'.encode()).hexdigest()}"
+
+
+@pytest.mark.parametrize("scheme", ["bcrypt", "scrypt", "argon2"])
+def test_scheme_round_trip(scheme):
+    hashed = hash_password("s3cret", scheme=scheme, **FAST_COST[scheme])
+    assert hashed.startswith("$")
+    assert verify_password("s3cret", hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_legacy_hash_still_verifies():
+    hashed = legacy_hash("admin123")
+    assert verify_password("admin123", hashed)
+    assert not verify_password("admin124", hashed)
+    assert needs_rehash(hashed)
+
+
+def test_malformed_hash_is_rejected():
+    assert not verify_password("anything", "not-a-hash")
+    assert not verify_password("anything", "$scrypt$garbage")
+
+
+def test_needs_rehash_tracks_scheme_and_cost(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "bcrypt")
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    assert not needs_rehash(hash_password("pw", scheme="bcrypt", rounds=4))
+    assert needs_rehash(hash_password("pw", scheme="bcrypt", rounds=5))
+    assert needs_rehash(hash_password("pw", scheme="scrypt", log_n=10))
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "scrypt")
+    monkeypatch.setattr(settings, "SCRYPT_LOG_N", 10)
+    assert not needs_rehash(hash_password("pw", scheme="scrypt", log_n=10))
+    assert needs_rehash(hash_password("pw", scheme="scrypt", log_n=11))
+
+
+@pytest.mark.parametrize("scheme, prefix", [("bcrypt", "$2b$04$"), ("scrypt", "$scrypt$ln=10,")])
+def test_unknown_user_verifies_against_the_configured_scheme(monkeypatch, scheme, prefix):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", scheme)
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    monkeypatch.setattr(settings, "SCRYPT_LOG_N", 10)
+    verified = []
+    real_verify = hashing.verify_password
+
+    def recording_verify(plain, hashed):
+        verified.append(hashed)
+        return real_verify(plain, hashed)
+
+    monkeypatch.setattr(hashing, "verify_password", recording_verify)
+
+    assert verify_unknown_user("admin123") is False
+    assert verify_unknown_user("admin123") is False
+    assert len(verified) == 2 and verified[0] == verified[1] and verified[0].startswith(prefix)
+
+
+def test_calibrate_reaches_target():
+    result = calibrate("scrypt", target_seconds=0.0)
+    assert result == {"SCRYPT_LOG_N": 10, "verify_seconds": result["verify_seconds"]}
+
+
+def test_login_upgrades_legacy_hash():
+    """A legacy salt$hash user can log in and is migrated to the configured scheme"""
+    headers = login("admin@example.com", "admin123")
+    email = f"legacy_{uuid.uuid4()}@example.com"
+    payload = {
+        "name": "Legacy User",
+        "email": email,
+        "password": "legacy123",
+        "department": "Engineering",
+        "job_role": "Engineer",
+        "salary": 50000,
+    }
+    assert requests.post(f"{BASE_URL}/employees/", headers=headers, json=payload).status_code == 201
+
+    with engine.begin() as conn:
+        conn.execute(update(UserModel).where(UserModel.email == email).values(password_hash=legacy_hash("legacy123")))
+
+    response = requests.post(f"{BASE_URL}/auth/login", json={"email": email, "password": "legacy123"})
+    assert response.status_code == 200
+
+    # The upgrade runs after the response is sent
+    for _ in range(50):
+        with engine.connect() as conn:
+            stored = conn.execute(select(UserModel.password_hash).where(UserModel.email == email)).scalar_one()
+        if stored.startswith("$"):
+            break
+        time.sleep(0.1)
+    assert stored.startswith("$") and not needs_rehash(stored)
+
+    response = requests.post(f"{BASE_URL}/auth/login", json={"email": email, "password": "legacy123"})
+    assert response.status_code == 200
+    response = requests.post(f"{BASE_URL}/auth/login", json={"email": email, "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_hash_executor_turns_async_callers_away_when_full():
+    executor = HashExecutor("thread", workers=1, queue_size=0, timeout=0.1)
+
+    async def scenario():
+        holder = asyncio.create_task(executor.run_async(time.sleep, 0.5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as busy:
+            await executor.run_async(time.sleep, 0)
+        assert busy.value.status_code == 503
+        assert busy.value.headers["Retry-After"] == "1"
+
+        # A waiter cancelled while queued must not leak its slot
+        waiter = asyncio.create_task(executor.map_async(time.sleep, [0], concurrency=1))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        await holder
+        assert await executor.run_async(pow, 2, 3) == 8
+        assert await executor.map_async(abs, [-2, 3], concurrency=2) == [2, 3]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+
+def test_hash_executor_turns_sync_callers_away_when_full():
+    executor = HashExecutor("thread", workers=1, queue_size=0, timeout=0.1)
+    assert executor._admission.acquire(0)
+    try:
+        with pytest.raises(HTTPException) as busy:
+            executor.run(time.sleep, 0)
+        assert busy.value.status_code == 503
+    finally:
+        executor._admission.release()
+    assert executor.run(pow, 2, 3) == 8
+    executor.shutdown()
+
+
+def test_hash_executor_counts_sync_and_async_callers_together():
+    executor = HashExecutor("thread", workers=1, queue_size=1, timeout=0.1)
+
+    async def scenario():
+        # One slot held from a thread, one from the loop: the pool is full for both
+        holder = asyncio.create_task(asyncio.to_thread(executor.run, time.sleep, 0.5))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.run_async(time.sleep, 0))
+        await asyncio.sleep(0.05)
+        assert executor._admission.in_use == 2
+        with pytest.raises(HTTPException):
+            await executor.run_async(time.sleep, 0)
+        with pytest.raises(HTTPException):
+            await asyncio.to_thread(executor.run, time.sleep, 0)
+        await asyncio.gather(holder, queued)
+        assert executor._admission.in_use == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
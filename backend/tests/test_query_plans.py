@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg2
+from sqlmodel import Session, create_engine, select
+
+from app.database import migrate_database
+from app.models.employee_model import EmployeeModel
+from app.seed_data import seed_synthetic_data
+from app.services.employee_service import EmployeeService
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    migrate_database(engine)
+    seed_synthetic_data(employees=3000, bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return engine
+
+
+def query_plans(engine, call):
+    """EXPLAIN QUERY PLAN of every SELECT that `call(session)` runs"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as session:
+            call(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append(" | ".join(row[-1] for row in rows))
+    return plans
+
+
+@pytest.mark.parametrize("filters, sort, order, index", [
+    ({}, "name", "asc", "ix_employees_name_id"),
+    ({}, "department", "asc", "ix_employees_department_name_id"),
+    ({}, "salary", "desc", "ix_employees_salary_id"),
+    ({}, "created_at", "desc", "ix_employees_created_at_id"),
+    ({"department": "Engineering"}, "name", "asc", "ix_employees_department_name_id"),
+    ({"department": "Engineering"}, "salary", "desc", "ix_employees_department_salary_id"),
+    ({"department": "Engineering", "job_role": "Software Engineer"}, "name", "asc",
+     "ix_employees_department_job_role_name_id"),
+    ({"job_role": "Software Engineer"}, "job_role", "desc", "ix_employees_job_role_name_id"),
+])
+def test_sorted_pages_read_an_index_in_order(engine, filters, sort, order, index):
+    (plan,) = query_plans(engine, lambda session: EmployeeService.get_all_employees(
+        session, page=3, limit=20, count_mode="none", sort=sort, order=order, **filters
+    ))
+    assert f"INDEX {index}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_default_order_is_the_primary_key(engine):
+    (plan,) = query_plans(engine, lambda session: EmployeeService.get_all_employees(
+        session, page=2, limit=20, count_mode="none"
+    ))
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_filtered_count_and_cursor_pages_use_indexes(engine):
+    def walk(session):
+        EmployeeService.count_employees(session, department="Engineering")
+        _, cursor = EmployeeService.get_employees_by_cursor(session, department="Engineering", limit=20)
+        EmployeeService.get_employees_by_cursor(session, department="Engineering", cursor=cursor, limit=20)
+
+    count_plan, first_page, next_page = query_plans(engine, walk)
+    assert "COVERING INDEX ix_employees_department" in count_plan, count_plan
+    for plan in (first_page, next_page):
+        assert "INDEX ix_employees_department_name_id" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_batch_fetch_is_one_primary_key_lookup(engine):
+    (plan,) = query_plans(engine, lambda session: EmployeeService.get_employees_by_ids(
+        session, ids=list(range(1, 400, 3))
+    ))
+    assert "INTEGER PRIMARY KEY" in plan, plan
+
+
+def test_postgres_estimate_binds_match_the_driver():
+    """EXPLAIN parameters are a tuple for asyncpg's $n placeholders and a dict for psycopg"""
+    statement = select(EmployeeModel.id).where(
+        EmployeeModel.job_role == "Engineer", EmployeeModel.department == "Sales"
+    )
+
+    sql, params = EmployeeService._explain_statement(statement, asyncpg.dialect())
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT") and "$1" in sql and "$2" in sql
+    assert sql.index("job_role") < sql.index("$1") < sql.index("department") < sql.index("$2")
+    assert params == ("Engineer", "Sales")
+
+    sql, params = EmployeeService._explain_statement(statement, psycopg2.dialect())
+    assert "%(job_role_1)s" in sql
+    assert params == {"job_role_1": "Engineer", "department_1": "Sales"}
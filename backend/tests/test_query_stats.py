@@ -0,0 +1,73 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+from app.middleware.timing import TimingMiddleware
+from app.services.jwt_service import create_access_token
+from app.utils.metrics import RequestMetrics
+from app.utils.query_stats import parameter_shape
+
+
+@pytest.fixture
+def client_and_metrics():
+    """A small app on the real engine: /loop runs one statement per requested row"""
+    app = FastAPI()
+    metrics = RequestMetrics()
+
+    @app.get("/loop/{times}")
+    def loop(times: int):
+        with engine.connect() as conn:
+            for i in range(times):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"ran": times}
+
+    app.add_middleware(TimingMiddleware, metrics=metrics, headers=True, n_plus_one_threshold=5)
+    return TestClient(app), metrics
+
+
+def test_query_count_and_server_timing_headers(client_and_metrics, monkeypatch):
+    client, metrics = client_and_metrics
+    admin = {"Authorization": f"Bearer {create_access_token(user_id=1, role='admin')}"}
+    response = client.get("/loop/3", headers=admin)
+    assert response.headers["X-DB-Query-Count"] == "3"
+    assert response.headers["Server-Timing"].startswith('db;dur=')
+    assert 'desc="3 queries"' in response.headers["Server-Timing"]
+    assert metrics.queries[("GET", "/loop/{times}")].sum == 3
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    assert "X-DB-Query-Count" in client.get("/loop/1", headers={"Authorization": "Bearer scrape-me"}).headers
+    employee = {"Authorization": f"Bearer {create_access_token(user_id=3, role='employee')}"}
+    for headers in ({}, employee, {"Authorization": "Bearer scrape-you"}):
+        response = client.get("/loop/1", headers=headers)
+        assert "X-DB-Query-Count" not in response.headers and "Server-Timing" not in response.headers
+
+
+def test_repeated_statement_is_flagged(client_and_metrics, caplog):
+    client, metrics = client_and_metrics
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        client.get("/loop/2")
+        assert not caplog.records
+        client.get("/loop/6")
+    assert "ran 6 times" in caplog.text and "SELECT ?" in caplog.text
+    assert metrics.repeated == {("GET", "/loop/{times}"): 1}
+
+
+def test_slow_query_log_shows_parameter_shapes_not_values(client_and_metrics, caplog, monkeypatch):
+    client, _ = client_and_metrics
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :email, :salary"), {"email": "secret@example.com", "salary": 123456.0})
+    assert "Slow query" in caplog.text
+    assert "(str[18], float)" in caplog.text
+    assert "secret@example.com" not in caplog.text and "123456" not in caplog.text
+
+
+def test_parameter_shape():
+    assert parameter_shape({"id": 1, "name": "abc", "note": None}) == "{id: int, name: str[3], note: None}"
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str[1])"
@@ -0,0 +1,83 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+
+import pytest
+import requests
+
+from tests.conftest import BACKEND, app_server, login
+
+STICKY_SECONDS = 1.0
+
+
+@pytest.fixture(scope="module", params=["sync", "async"])
+def server(request, tmp_path_factory):
+    """
+    App on a seeded primary with a frozen copy of it as the "replica"
+
+    The copy never receives later writes, i.e. a replica with unbounded lag,
+    so every read shows which database answered it.
+    """
+    directory = tmp_path_factory.mktemp(f"replica_{request.param}")
+    primary, replica = directory / "primary.db", directory / "replica.db"
+    env = {
+        "DATABASE_URL": f"sqlite:///{primary}",
+        "DATABASE_REPLICA_URL": f"sqlite:///{replica}",
+        "DATABASE_ASYNC": str(request.param == "async"),
+        "REPLICA_STICKY_SECONDS": str(STICKY_SECONDS),
+        "USER_CACHE_TTL": "0",
+    }
+    subprocess.run(
+        [sys.executable, "-m", "app.seed_data"], cwd=BACKEND, env={**os.environ, **env}, check=True, capture_output=True
+    )
+    shutil.copy(primary, replica)
+
+    with app_server(env) as base_url:
+        yield base_url
+
+
+def test_reads_use_replica_and_writers_read_their_writes(server):
+    admin = login("admin@example.com", "admin123", server)
+    hr = login("hr@example.com", "hr123", server)
+    email = f"replica_{uuid.uuid4().hex[:8]}@example.com"
+    payload = {"name": "Replica Lag Check", "email": email, "password": "password123",
+               "department": "Engineering", "job_role": "Engineer", "salary": 70000}
+
+    created = requests.post(f"{server}/employees/", headers=admin, json=payload)
+    assert created.status_code == 201
+    url = f"{server}/employees/{created.json()['id']}"
+
+    # The writer reads from the primary for a while...
+    assert requests.get(url, headers=admin).status_code == 200
+    listed = requests.get(f"{server}/employees/", headers=admin, params={"search": "Replica Lag"}).json()
+    assert listed["total"] == 1
+
+    # ...everyone else reads the replica, which has not seen the write
+    assert requests.get(url, headers=hr).status_code == 404
+    assert requests.get(f"{server}/employees/", headers=hr, params={"search": "Replica Lag"}).json()["total"] == 0
+
+    # Once the window has passed, the writer is back on the replica
+    time.sleep(STICKY_SECONDS + 0.3)
+    assert requests.get(url, headers=admin).status_code == 404
+
+
+def test_new_users_authenticate_before_the_replica_has_them(server):
+    admin = login("admin@example.com", "admin123", server)
+    email = f"fresh_{uuid.uuid4().hex[:8]}@example.com"
+    payload = {"name": "Fresh User", "email": email, "password": "password123",
+               "department": "Sales", "job_role": "Rep", "salary": 50000}
+    assert requests.post(f"{server}/employees/", headers=admin, json=payload).status_code == 201
+
+    fresh = login(email, "password123", server)
+    me = requests.get(f"{server}/me", headers=fresh)
+    assert me.status_code == 200 and me.json()["email"] == email
+
+
+def test_replica_pool_is_reported(server):
+    admin = login("admin@example.com", "admin123", server)
+    requests.get(f"{server}/employees/stats", headers=admin)
+    metrics = requests.get(f"{server}/metrics", headers=admin).text
+    assert 'db_pool_wait_seconds_count{pool="replica"}' in metrics or 'pool="async_replica"' in metrics
@@ -0,0 +1,37 @@
+import requests
+import uuid
+
+from tests.conftest import BASE_URL
+
+
+def search_ids(headers, term):
+    response = requests.get(f"{BASE_URL}/employees/", headers=headers, params={"search": term, "limit": 100})
+    assert response.status_code == 200
+    return {emp["id"] for emp in response.json()["employees"]}
+
+
+def test_search_is_case_insensitive_substring(admin_headers):
+    """Indexed search keeps the ILIKE '%term%' semantics"""
+    assert search_ids(admin_headers, "lice") == search_ids(admin_headers, "LICE")
+    assert search_ids(admin_headers, "al") >= search_ids(admin_headers, "alice")
+
+
+def test_search_index_follows_writes(admin_headers):
+    """Created, renamed and deleted employees are reflected in search results"""
+    token = uuid.uuid4().hex[:10]
+    payload = {
+        "name": f"Searchable {token}",
+        "email": f"search_{token}@example.com",
+        "password": "password123",
+        "department": "Engineering",
+        "job_role": "Engineer",
+        "salary": 50000,
+    }
+    created = requests.post(f"{BASE_URL}/employees/", headers=admin_headers, json=payload).json()
+    assert created["id"] in search_ids(admin_headers, token)
+
+    requests.put(f"{BASE_URL}/employees/{created['id']}", headers=admin_headers, json={"name": "Renamed Person"})
+    assert created["id"] not in search_ids(admin_headers, token)
+
+    requests.delete(f"{BASE_URL}/employees/{created['id']}", headers=admin_headers)
+    assert created["id"] not in search_ids(admin_headers, "Renamed Person")
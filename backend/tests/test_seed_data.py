@@ -0,0 +1,43 @@
+import random
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlmodel import SQLModel, create_engine
+
+from app.models.employee_model import EmployeeModel
+from app.models.user_model import UserModel
+from app.seed_data import JOB_ROLES, generate_employee_rows, seed_synthetic_data
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def test_same_seed_same_rows():
+    assert generate_employee_rows(random.Random(1), 50, NOW) == generate_employee_rows(random.Random(1), 50, NOW)
+    assert generate_employee_rows(random.Random(1), 50, NOW) != generate_employee_rows(random.Random(2), 50, NOW)
+
+
+def test_distribution_is_skewed_and_consistent():
+    rows = generate_employee_rows(random.Random(3), 20000, NOW)
+    departments = Counter(row["department"] for row in rows).most_common()
+    assert departments[0][0] == "Engineering"
+    assert departments[0][1] > 5 * departments[-1][1]
+    for row in rows[:1000]:
+        assert row["job_role"] in {role for role, _, _ in JOB_ROLES[row["department"]]}
+        assert row["created_at"] <= row["updated_at"] <= NOW
+        assert row["salary"] > 0
+
+
+def test_seed_synthetic_data_bulk_inserts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    SQLModel.metadata.create_all(engine)
+
+    stats = seed_synthetic_data(employees=2500, users=300, seed=5, chunk_size=1000, bind=engine)
+    assert stats["employees"] == 2500 and stats["users"] == 300
+    assert stats["rows_per_second"] > 0
+
+    # A second run continues the email numbering instead of colliding
+    seed_synthetic_data(employees=0, users=300, seed=5, chunk_size=1000, bind=engine)
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(EmployeeModel)).scalar_one() == 2500
+        assert conn.execute(select(func.count(func.distinct(UserModel.email)))).scalar_one() == 600
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models.employee_model import EmployeeModel
+from app.schemas.employee_schema import EmployeeResponse, EmployeeResponseNoSalary
+from app.services.employee_service import EmployeeService
+from app.utils import responses
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'serialization.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            EmployeeModel(name="Zoë Łukasik", department="Engineering", job_role="Engineer", salary=91000,
+                          created_at=datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+                          updated_at=datetime(2025, 1, 2, 3, 4, 5, 600, tzinfo=timezone.utc)),
+            EmployeeModel(name='Quote "Q" Back\\slash', department="HR", job_role="Recruiter", salary=0.1,
+                          created_at=datetime(2024, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc),
+                          updated_at=datetime(2024, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc)),
+        ])
+        session.commit()
+        yield session
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("schema", [EmployeeResponse, EmployeeResponseNoSalary])
+def test_rows_encode_exactly_like_response_models(session, schema, use_orjson, monkeypatch):
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    elif responses.orjson is None:
+        pytest.skip("orjson not installed")
+    include_salary = schema is EmployeeResponse
+
+    expected = TypeAdapter(list[schema]).dump_json(
+        [schema.model_validate(emp) for emp in session.exec(select(EmployeeModel)).all()]
+    )
+    rows, _, _ = EmployeeService.get_all_employees(session, include_salary=include_salary, count_mode="none")
+    assert responses.dumps(rows) == expected
+
+    first = EmployeeService.get_employee_by_id(session, employee_id=rows[0]["id"], include_salary=include_salary)
+    assert responses.dumps(first) == schema.model_validate(session.get(EmployeeModel, rows[0]["id"])).model_dump_json().encode()
+    assert EmployeeService.get_employee_by_id(session, employee_id=999, include_salary=include_salary) is None
+
+
+def test_utc_datetimes_match_pydantic(monkeypatch):
+    value = {"at": datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)}
+    expected = TypeAdapter(dict[str, datetime]).dump_json(value)
+    assert responses.dumps(value) == expected
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(value) == expected
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, inspect, text
+from sqlmodel import create_engine
+
+from app.config import settings
+from app.database import SCHEMA_VERSION, engine, get_schema_version, migrate_database
+from app.main import app, lifespan
+
+
+def test_migrate_database_runs_once(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    assert get_schema_version(bind) == 0
+
+    assert migrate_database(bind) is True
+    assert get_schema_version(bind) == SCHEMA_VERSION
+    assert {"users", "employees", "schema_version"} <= set(inspect(bind).get_table_names())
+
+    assert migrate_database(bind) is False
+
+
+def test_migrate_replaces_single_column_indexes(tmp_path):
+    """Older databases gain the composite list indexes and lose the ones they supersede"""
+    bind = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    migrate_database(bind)
+    with bind.begin() as conn:
+        conn.execute(text("DROP INDEX ix_employees_department_name_id"))
+        conn.execute(text("CREATE INDEX ix_employees_department ON employees (department)"))
+        conn.execute(text("UPDATE schema_version SET version = 2"))
+
+    assert migrate_database(bind) is True
+    indexes = {index["name"] for index in inspect(bind).get_indexes("employees")}
+    assert "ix_employees_department_name_id" in indexes
+    assert "ix_employees_department" not in indexes
+
+
+def test_startup_on_current_schema_does_not_write():
+    """The live test database is already migrated: startup is one read, no writes"""
+    assert get_schema_version() == SCHEMA_VERSION
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        async def start():
+            async with lifespan(app):
+                pass
+        asyncio.run(start())
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements and all(s.lstrip().upper().startswith("SELECT") for s in statements)
+
+
+def test_startup_refuses_outdated_schema_without_auto_migrate(tmp_path, monkeypatch):
+    import app.main as main
+
+    bind = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    monkeypatch.setattr(settings, "DATABASE_AUTO_MIGRATE", False)
+    monkeypatch.setattr(main, "get_schema_version", lambda: get_schema_version(bind))
+
+    async def start():
+        async with lifespan(app):
+            pass
+
+    with pytest.raises(RuntimeError, match="python -m app.seed_data"):
+        asyncio.run(start())
+
+
+def test_startup_warns_about_replica_with_per_worker_cache(monkeypatch, caplog):
+    import app.main as main
+
+    async def start():
+        async with lifespan(app):
+            pass
+
+    monkeypatch.setattr(main, "has_replica", lambda: True)
+    for backend, warned in [("memory", True), ("shared_memory", False)]:
+        monkeypatch.setattr(settings, "CACHE_BACKEND", backend)
+        caplog.clear()
+        with caplog.at_level("WARNING", logger="app.main"):
+            asyncio.run(start())
+        assert ("CACHE_BACKEND=memory" in caplog.text) is warned
@@ -0,0 +1,44 @@
+import requests
+import uuid
+
+from tests.conftest import BASE_URL
+
+
+def test_admin_stats_include_salary_aggregates(admin_headers):
+    """Admin sees headcount and salary aggregates that match the full list"""
+    response = requests.get(f"{BASE_URL}/employees/stats", headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+
+    total = requests.get(f"{BASE_URL}/employees/", headers=admin_headers).json()["total"]
+    assert data["total"] == total
+    assert sum(group["headcount"] for group in data["departments"]) == total
+    assert sum(group["headcount"] for group in data["job_roles"]) == total
+    for group in data["departments"]:
+        assert group["salary_min"] <= group["salary_avg"] <= group["salary_max"]
+
+
+def test_employee_stats_hide_salary(employee_headers):
+    """Employee role gets headcount only"""
+    response = requests.get(f"{BASE_URL}/employees/stats", headers=employee_headers)
+    assert response.status_code == 200
+    for group in response.json()["departments"]:
+        assert set(group) == {"name", "headcount"}
+
+
+def test_stats_refresh_after_write(admin_headers):
+    """Creating an employee is reflected in the cached aggregates"""
+    before = requests.get(f"{BASE_URL}/employees/stats", headers=admin_headers).json()["total"]
+    payload = {
+        "name": "Stats Check",
+        "email": f"stats_{uuid.uuid4()}@example.com",
+        "password": "password123",
+        "department": "Stats Dept",
+        "job_role": "Engineer",
+        "salary": 50000,
+    }
+    created = requests.post(f"{BASE_URL}/employees/", headers=admin_headers, json=payload).json()
+    data = requests.get(f"{BASE_URL}/employees/stats", headers=admin_headers).json()
+    assert data["total"] == before + 1
+    assert any(group["name"] == "Stats Dept" for group in data["departments"])
+    requests.delete(f"{BASE_URL}/employees/{created['id']}", headers=admin_headers)
@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from tests.conftest import app_server, login
+
+
+@pytest.fixture(scope="module", params=["sync", "async"])
+def server(request, tmp_path_factory):
+    """App in SQLite production mode, where every write takes the cross-worker write lock"""
+    env = {
+        "DATABASE_URL": f"sqlite:///{tmp_path_factory.mktemp(f'lock_{request.param}') / 'lock.db'}",
+        "DATABASE_ASYNC": str(request.param == "async"),
+        "SQLITE_TUNED": "True",
+    }
+    with app_server(env) as base_url:
+        yield base_url
+
+
+def test_concurrent_writes_queue_on_the_write_lock(server):
+    headers = login("admin@example.com", "admin123", server)
+
+    def update(salary):
+        return requests.put(f"{server}/employees/2", headers=headers, json={"salary": salary}, timeout=20).status_code
+
+    # Writers waiting for the lock must not stall the worker (async: the event loop)
+    with ThreadPoolExecutor(10) as executor:
+        assert list(executor.map(update, range(60000, 60010))) == [200] * 10
+    assert requests.get(server, timeout=5).status_code == 200
@@ -9,6 +9,11 @@ export const employeeAPI = {
     return apiClient.get('/employees/', { params });
   },
 
+  // Get headcount (and salary aggregates for admin/hr) per department and job role
+  getStats: () => {
+    return apiClient.get('/employees/stats');
+  },
+
   // Get single employee by ID
   getById: (id) => {
     return apiClient.get(`/employees/${id}`);
@@ -21,13 +21,12 @@ const Dashboard = () => {
 
   const fetchStats = async () => {
     try {
-      const response = await employeeAPI.getAll({ limit: 100 });
-      const employees = response.data.employees;
+      const response = await employeeAPI.getStats();
 
-      // Calculate stats
+      // Department headcounts are aggregated server-side
       const deptCount = {};
-      employees.forEach((emp) => {
-        deptCount[emp.department] = (deptCount[emp.department] || 0) + 1;
+      response.data.departments.forEach((dept) => {
+        deptCount[dept.name] = dept.headcount;
       });
 
       setStats({